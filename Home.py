@@ -15,7 +15,7 @@ Data is stored in CSV files for easy backup and sharing.
 import streamlit as st
 from utils.state_manager import StateManager
 from utils.auth_session import (
-    try_restore_session, make_session_cookie, do_logout,
+    try_restore_session, make_session_cookie, do_logout, mark_active, record_login,
     refresh_cookie_if_needed, COOKIE_NAME, INACTIVITY_TIMEOUT, COOKIE_MAX_AGE,
 )
 from streamlit_cookies_controller import CookieController
@@ -90,11 +90,15 @@ if not st.session_state.get("authenticated"):
                         username, user_data['role'], user_data['name'], news_views
                     ), max_age=COOKIE_MAX_AGE)
                     st.session_state['last_activity'] = time.time()
+                    record_login("success")
+                    mark_active()
                     st.success(f"Welcome {user_data['name']}!")
                     st.rerun()
                 else:
+                    record_login("bad_password")
                     st.error("Incorrect password")
             else:
+                record_login("unknown_user")
                 st.error("User not found")
 
     st.stop()
@@ -103,10 +107,11 @@ if not st.session_state.get("authenticated"):
 now = time.time()
 last = st.session_state.get("last_activity", now)
 if now - last > INACTIVITY_TIMEOUT:
-    do_logout(cm)
+    do_logout(cm, reason="timeout")
     st.session_state["_session_expired"] = True
     st.rerun()
 st.session_state["last_activity"] = now
+mark_active()
 refresh_cookie_if_needed(cm)
 
 # Initialize session state
@@ -166,6 +171,7 @@ with st.sidebar:
     - **Service Reminders**: Track upcoming services
     - **Service Reports**: Document completed services
     - **Fault Reports**: Log faults with photos and details
+    - **Search**: Full-text search across faults, reports, services and reminders
     - **Cross-Page Filters**: Seamless data viewing
     - **SQLite Storage**: Reliable single-file data storage
     """)
@@ -181,6 +187,7 @@ with st.sidebar:
     - **Service Reminders**: Track service reminders
     - **Service Reports**: View and add reports
     - **Fault Reports**: View and add fault reports
+    - **Search**: Find records by the words in them
     """)
     
     st.markdown("---")
@@ -227,6 +234,7 @@ The **Dashboard** provides an overview of all objects, services, faults, and ale
 ✅ **Reminder System** - Track upcoming and overdue services  
 ✅ **Reporting** - Document all service activities  
 ✅ **Fault Reporting** - Log faults with multiple photos and instant updates  
+✅ **Full-Text Search** - Ranked search across faults, reports, services and reminders  
 ✅ **Photo Management** - Attach and view images for faults and reports  
 ✅ **Cross-Page Filters** - Seamless navigation and filtering  
 ✅ **SQLite Data Storage** - Single-file database, easy to backup  
@@ -243,6 +251,7 @@ The **Dashboard** provides an overview of all objects, services, faults, and ale
 - [Track Reminders](Service%20Reminders) - View upcoming services
 - [View Reports](Service%20Reports) - See service history
 - [View Fault Reports](Fault%20Reports) - Log and review faults with photos
+- [Search](Search) - Find faults, reports, services and reminders by keyword
 
 ---
 
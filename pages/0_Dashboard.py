@@ -1,6 +1,7 @@
 import streamlit as st
-import pandas as pd
+from utils import date_column_config, page_timing
 from utils.data_handler import DataHandler
+from utils.export import bundle_zip, table_csv
 from utils.state_manager import StateManager
 from datetime import datetime, timedelta
 from streamlit_cookies_controller import CookieController
@@ -10,6 +11,7 @@ st.set_page_config(page_title="Dashboard", layout="wide")
 cm = CookieController(key="cookies")
 StateManager.init_session_state()
 StateManager.init_and_enforce(cm)
+timer = page_timing.start(__file__)
 handler = DataHandler()
 user_email = st.session_state.get('user_email')
 is_admin = st.session_state.get('user_role') == 'admin'
@@ -21,11 +23,31 @@ col1, col2, col3, col4 = st.columns(4)
 
 
 
-objects_df = handler.get_objects(user_email=user_email, is_admin=is_admin)
-services_df = handler.get_services(user_email=user_email, is_admin=is_admin)
-reminders_df = handler.get_reminders(user_email=user_email, is_admin=is_admin)
-reports_df = handler.get_reports(user_email=user_email, is_admin=is_admin)
-fault_reports_df = handler.get_fault_reports(user_email=user_email, is_admin=is_admin)
+# Everything is read in one snapshot so the counts, lists and alerts agree
+# even while other sessions are writing.
+with timer.section("Load summary"), handler.read_snapshot():
+    objects_df = handler.get_objects(user_email=user_email, is_admin=is_admin,
+                                     columns=("object_id", "object_type"))
+    counts = handler.count_records(user_email=user_email, is_admin=is_admin)
+    recent_faults_df = handler.get_fault_reports(
+        user_email=user_email, is_admin=is_admin, limit=10,
+        columns=("fault_id", "object_id", "object_type", "observation_date", "description",
+                 "photos", "created_date"),
+    )
+    total_services = counts["services"]
+    if total_services:
+        # days_until is computed and sorted in SQL on the next_service_date index
+        upcoming_df = handler.get_services_due(
+            user_email=user_email, is_admin=is_admin, limit=10,
+            columns=("service_id", "object_id", "service_name", "object_type",
+                     "next_service_date", "status"),
+        )
+        alert_services = handler.get_services_due(user_email=user_email, is_admin=is_admin,
+                                                  within_days=3,
+                                                  columns=("service_name", "object_id"))
+        overdue_reminders = handler.get_reminders_due(status="Pending", user_email=user_email,
+                                                      is_admin=is_admin, within_days=-1,
+                                                      columns=("service_id",))
 
 
 with col1:
@@ -33,15 +55,14 @@ with col1:
     st.metric("Total Objects", total_objects)
 
 with col2:
-    total_services = len(services_df)
     st.metric("Total Services", total_services)
 
 with col3:
-    pending_reminders = len(reminders_df[reminders_df["status"] == "Pending"])
+    pending_reminders = counts["pending_reminders"]
     st.metric("Pending Reminders", pending_reminders, delta=None, delta_color="inverse")
 
 with col4:
-    total_faults = len(fault_reports_df)
+    total_faults = counts["faults"]
     st.metric("Fault Reports", total_faults)
 
 equipment = len(objects_df[objects_df["object_type"] == "Vehicle"])
@@ -70,37 +91,30 @@ with col2:
 st.write("---")
 col_recent_services, col_recent_faults = st.columns(2)
 
-with col_recent_services:
+with col_recent_services, timer.section("Recent Services"):
     st.subheader("Recent Services")
-    if services_df.empty:
+    if total_services == 0:
         st.info("No services scheduled yet.")
     else:
-        services_df = services_df.copy()
-        services_df["days_until"] = pd.to_datetime(
-            services_df["next_service_date"]
-        ) - pd.Timestamp.now()
-        services_df["days_until"] = services_df["days_until"].dt.days
-        services_df = services_df.sort_values("days_until")
         display_cols = ["service_id", "object_id", "service_name", "object_type", 
                     "next_service_date", "days_until", "status"]
         st.dataframe(
-            services_df[display_cols].head(10),
+            upcoming_df[display_cols],
             use_container_width=True,
+            column_config=date_column_config(upcoming_df),
             hide_index=True
         )
 
-with col_recent_faults:
+with col_recent_faults, timer.section("Recent Fault Reports"):
     st.subheader("Recent Fault Reports")
-    if fault_reports_df.empty:
+    if recent_faults_df.empty:
         st.info("No fault reports yet.")
     else:
-        # Show most recent 10 fault reports, with photo count
-        fault_reports_df = fault_reports_df.copy()
-        fault_reports_df["photo_count"] = fault_reports_df["photo_paths"].apply(lambda x: len([p for p in str(x).split(';') if p and p.lower() != 'nan']))
-        display_cols = ["fault_id", "object_id", "object_type", "observation_date", "description", "photo_count", "created_date"]
+        # The 10 most recent fault reports (newest first, from SQL), with photo count
         st.dataframe(
-            fault_reports_df[display_cols].sort_values("created_date", ascending=False).head(10),
+            recent_faults_df,
             use_container_width=True,
+            column_config=date_column_config(recent_faults_df),
             hide_index=True
         )
 
@@ -108,42 +122,41 @@ with col_recent_faults:
 st.write("---")
 st.subheader("⚠️ Alerts")
 
-if services_df.empty:
-    st.info("No alerts.")
-else:
-    overdue_services = services_df[services_df["days_until"] < 0]
-    due_soon_services = services_df[(services_df["days_until"] >= 0) & (services_df["days_until"] <= 3)]
-    overdue_reminders = reminders_df[(pd.to_datetime(reminders_df["reminder_date"]) < pd.Timestamp.now()) & 
-                                     (reminders_df["status"] == "Pending")]
+with timer.section("Alerts"):
+    if total_services == 0:
+        st.info("No alerts.")
+    else:
+        overdue_services = alert_services[alert_services["overdue"]]
+        due_soon_services = alert_services[~alert_services["overdue"]]
     
-    col1, col2, col3 = st.columns(3)
+        col1, col2, col3 = st.columns(3)
     
-    with col1:
-        if len(overdue_services) > 0:
-            st.error(f"🔴 **{len(overdue_services)} Overdue Services**")
-            st.write("Services past their due date:")
-            for _, service in overdue_services.head(5).iterrows():
-                st.write(f"- {service['service_name']} ({service['object_id']})")
-        else:
-            st.success("✓ No overdue services")
+        with col1:
+            if len(overdue_services) > 0:
+                st.error(f"🔴 **{len(overdue_services)} Overdue Services**")
+                st.write("Services past their due date:")
+                for _, service in overdue_services.head(5).iterrows():
+                    st.write(f"- {service['service_name']} ({service['object_id']})")
+            else:
+                st.success("✓ No overdue services")
     
-    with col2:
-        if len(due_soon_services) > 0:
-            st.warning(f"🟡 **{len(due_soon_services)} Services Due Soon** (within 3 days)")
-            st.write("Services due within 3 days:")
-            for _, service in due_soon_services.head(5).iterrows():
-                st.write(f"- {service['service_name']} ({service['object_id']})")
-        else:
-            st.success("✓ No services due soon")
+        with col2:
+            if len(due_soon_services) > 0:
+                st.warning(f"🟡 **{len(due_soon_services)} Services Due Soon** (within 3 days)")
+                st.write("Services due within 3 days:")
+                for _, service in due_soon_services.head(5).iterrows():
+                    st.write(f"- {service['service_name']} ({service['object_id']})")
+            else:
+                st.success("✓ No services due soon")
     
-    with col3:
-        if len(overdue_reminders) > 0:
-            st.error(f"🔴 **{len(overdue_reminders)} Overdue Reminders**")
-            st.write("Reminders past their date:")
-            for _, reminder in overdue_reminders.head(5).iterrows():
-                st.write(f"- Service ID: {reminder['service_id']}")
-        else:
-            st.success("✓ No overdue reminders")
+        with col3:
+            if len(overdue_reminders) > 0:
+                st.error(f"🔴 **{len(overdue_reminders)} Overdue Reminders**")
+                st.write("Reminders past their date:")
+                for _, reminder in overdue_reminders.head(5).iterrows():
+                    st.write(f"- Service ID: {reminder['service_id']}")
+            else:
+                st.success("✓ No overdue reminders")
 
 # Quick actions
 st.write("---")
@@ -167,44 +180,31 @@ with col4:
     if st.button("📊 View Reports", use_container_width=True):
         st.switch_page("pages/6_Service_Reports.py")
 
-# Data export
+# Data export – generated only when a download is clicked, streamed from SQLite
 st.write("---")
 st.subheader("Data Export")
 
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    if st.download_button(
-        label="⬇️ Export Objects",
-        data=objects_df.to_csv(index=False),
-        file_name="objects.csv",
-        mime="text/csv"
-    ):
-        pass
-
-with col2:
-    if st.download_button(
-        label="⬇️ Export Services",
-        data=services_df.to_csv(index=False),
-        file_name="services.csv",
-        mime="text/csv"
-    ):
-        pass
-
-with col3:
-    if st.download_button(
-        label="⬇️ Export Reminders",
-        data=reminders_df.to_csv(index=False),
-        file_name="reminders.csv",
-        mime="text/csv"
-    ):
-        pass
+export_labels = {
+    "objects": "⬇️ Export Objects",
+    "services": "⬇️ Export Services",
+    "reminders": "⬇️ Export Reminders",
+    "reports": "⬇️ Export Reports",
+    "fault_reports": "⬇️ Export Fault Reports",
+}
+for col, (table, label) in zip(st.columns(len(export_labels)), export_labels.items()):
+    with col:
+        st.download_button(
+            label=label,
+            data=table_csv(handler, table, user_email=user_email, is_admin=is_admin),
+            file_name=f"{table}.csv",
+            mime="text/csv",
+            on_click="ignore",
+        )
 
-with col4:
-    if st.download_button(
-        label="⬇️ Export Reports",
-        data=reports_df.to_csv(index=False),
-        file_name="reports.csv",
-        mime="text/csv"
-    ):
-        pass
+st.download_button(
+    label="📦 Download Full Backup (all tables + photos, .zip)",
+    data=bundle_zip(handler, user_email=user_email, is_admin=is_admin),
+    file_name=f"mymaintlog_export_{datetime.now():%Y%m%d}.zip",
+    mime="application/zip",
+    on_click="ignore",
+)
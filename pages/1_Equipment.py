@@ -1,8 +1,9 @@
 import streamlit as st
 import pandas as pd
+from utils import date_column_config, page_timing
 from utils.data_handler import DataHandler
 from utils.state_manager import StateManager
-from utils import selectbox_label
+from utils.search_select import search_select
 from datetime import datetime
 from streamlit_cookies_controller import CookieController
 
@@ -11,6 +12,7 @@ st.set_page_config(page_title="Equipment", layout="wide")
 cm = CookieController(key="cookies")
 StateManager.init_session_state()
 StateManager.init_and_enforce(cm)
+timer = page_timing.start(__file__)
 handler = DataHandler()
 user_email = st.session_state.get('user_email')
 is_admin = st.session_state.get('user_role') == 'admin'
@@ -31,17 +33,34 @@ status_filter = st.sidebar.selectbox(
     key="equipment_status_filter"
 )
 
-# Get objects and apply filters
-vehicles_df = handler.get_objects(user_email=user_email, is_admin=is_admin)
-if object_type_filter != "All":
-    vehicles_df = vehicles_df[vehicles_df["object_type"] == object_type_filter]
-if status_filter != "All":
-    vehicles_df = vehicles_df[vehicles_df["status"] == status_filter]
+def load_equipment(object_type_filter, status_filter):
+    """Return the user's objects and their summary counts, with the sidebar filters applied."""
+    return handler.get_object_summary(
+        object_type=None if object_type_filter == "All" else object_type_filter,
+        status=None if status_filter == "All" else status_filter,
+        user_email=user_email, is_admin=is_admin,
+        columns=("object_type", "object_id", "name", "description", "status", "created_date",
+                 "services", "open_services", "next_due_date", "pending_reminders", "faults",
+                 "photos"),
+    )
 
-# Tabs for different views
-tab1, tab2, tab3 = st.tabs(["View Equipment", "Add Equipment", "Edit Equipment"])
 
-with tab1:
+def equipment_scope(object_type_filter, status_filter):
+    """Return search_objects filters matching the sidebar selection."""
+    return {
+        "object_type": None if object_type_filter == "All" else object_type_filter,
+        "status": None if status_filter == "All" else status_filter,
+        "user_email": user_email,
+        "is_admin": is_admin,
+    }
+
+
+# Each tab is a fragment: interacting with widgets inside one tab reruns only
+# that tab, so the other tabs' queries and tables are not rebuilt.
+@st.fragment
+@timer.timed("View Equipment")
+def view_equipment_tab(object_type_filter, status_filter):
+    vehicles_df = load_equipment(object_type_filter, status_filter)
     st.subheader("All Equipment")
     
     if vehicles_df.empty:
@@ -49,33 +68,38 @@ with tab1:
     else:
         # Display vehicles in a table
         col1, col2 = st.columns([4, 1])
-        with col1:
+        with col1, timer.section("Equipment table"):
             column_config = {
                 "object_type": st.column_config.TextColumn(width="small"),
                 "object_id": st.column_config.TextColumn(width="stretch"),
                 "name": st.column_config.TextColumn(width="stretch"),
                 "description": st.column_config.TextColumn(width="stretch"),
                 "status": st.column_config.TextColumn(width="stretch"),
-                "created_date": st.column_config.TextColumn(width="stretch"),
+                "created_date": st.column_config.DatetimeColumn(width="stretch"),
+                "open_services": st.column_config.NumberColumn("Open services", width="small"),
+                "next_due_date": st.column_config.DateColumn("Next due", width="small"),
+                "pending_reminders": st.column_config.NumberColumn("Reminders", width="small"),
+                "faults": st.column_config.NumberColumn("Faults", width="small"),
             }
             selected_vehicle = st.dataframe(
-                vehicles_df[["object_type", "object_id", "name", "description", "status", "created_date"]],
+                vehicles_df[["object_type", "object_id", "name", "description", "status", "created_date",
+                             "open_services", "next_due_date", "pending_reminders", "faults"]],
                 use_container_width=True,
                 column_config=column_config,
                 hide_index=True
             )
         
         # Click on row to view details
-        vehicle_ids = vehicles_df["object_id"].tolist()
-        selected_id = st.selectbox(
+        selected_id, vehicle = search_select(
             "Select equipment to view details:",
-            vehicle_ids,
-            format_func=lambda x: selectbox_label(x, vehicles_df, 'object_id', 'name', 'description')
+            handler.search_objects, 'object_id', 'name', 'description',
+            key="view_equipment_select",
+            empty_message="No equipment matches the filters.",
+            **equipment_scope(object_type_filter, status_filter)
         )
         
         if selected_id:
             StateManager.set_object_id(selected_id)
-            vehicle = vehicles_df[vehicles_df["object_id"] == selected_id].iloc[0]
             StateManager.set_object_type(vehicle['object_type'])
             st.write("---")
             st.subheader(f"Details: {vehicle['name']}")
@@ -90,10 +114,27 @@ with tab1:
                 st.write(f"**Created:** {vehicle['created_date']}")
                 st.write(f"**Last Updated:** {vehicle['last_updated']}")
             
+            # Counts from object_summary; tables below are only queried when non-empty
+            match = vehicles_df[vehicles_df["object_id"] == selected_id]
+            summary = match.iloc[0] if not match.empty else None
+            if summary is not None:
+                col1, col2, col3, col4 = st.columns(4)
+                col1.metric("Open Services", summary["open_services"])
+                col2.metric("Pending Reminders", summary["pending_reminders"])
+                col3.metric("Fault Reports", summary["faults"])
+                col4.metric("Photos", summary["photos"])
+            
             # Show services for this vehicle
             st.write("---")
             st.subheader("Services for this Equipment")
-            services_df = handler.get_services(object_id=selected_id, user_email=user_email, is_admin=is_admin)
+            if summary is not None and summary["services"] == 0:
+                services_df = pd.DataFrame()
+            else:
+                services_df = handler.get_services(
+                    object_id=selected_id, user_email=user_email, is_admin=is_admin,
+                    columns=("service_id", "service_name", "interval_days", "next_service_date",
+                             "status"),
+                )
             
             if services_df.empty:
                 st.info("No services scheduled for this equipment.")
@@ -101,23 +142,74 @@ with tab1:
                 st.dataframe(
                     services_df[["service_id", "service_name", "interval_days", 
                                  "next_service_date", "status"]],
-                    use_container_width=True
+                    use_container_width=True,
+                    column_config=date_column_config(services_df)
                 )
             
+            # Meter readings and usage rate
+            st.write("---")
+            st.subheader("Meter Readings")
+            readings_df = handler.get_meter_readings(
+                object_id=selected_id, user_email=user_email, is_admin=is_admin,
+                columns=("reading_date", "meter_unit", "reading"),
+            )
+            
+            if readings_df.empty:
+                st.info("No meter readings yet. They are taken from service and fault reports, or add one below.")
+            else:
+                usage_df = handler.get_usage_forecasts(object_id=selected_id, user_email=user_email, is_admin=is_admin)
+                cols = st.columns(max(len(usage_df), 1))
+                for col, (_, usage) in zip(cols, usage_df.iterrows()):
+                    with col:
+                        unit = usage["meter_unit"] or "units"
+                        rate = usage["rate_per_day"]
+                        st.metric(
+                            f"Usage ({unit}/day)",
+                            f"{rate:,.1f}" if pd.notna(rate) else "–",
+                            help=f"Estimated from {usage['readings']} reading(s); last {usage['last_reading']:,.0f} {unit}"
+                        )
+                st.line_chart(readings_df.pivot_table(
+                    index="reading_date", columns="meter_unit", values="reading",
+                    aggfunc="last", observed=True
+                ))
+            
+            with st.form("add_meter_reading_form", clear_on_submit=True):
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    reading = st.number_input("Meter Reading", min_value=0.0, step=1.0)
+                with col2:
+                    reading_date = st.date_input("Reading Date")
+                with col3:
+                    meter_unit = st.selectbox("Meter Unit", handler.get_meter_units())
+                if st.form_submit_button("Add Reading"):
+                    if reading > 0:
+                        handler.add_meter_reading(selected_id, reading, reading_date, meter_unit, user_email=user_email)
+                        st.success("✓ Meter reading added.")
+                        st.rerun()
+                    else:
+                        st.error("Please enter a reading above 0.")
+            
             # Show reminders
             st.write("---")
             st.subheader("Reminders for this Equipment")
-            reminders_df = handler.get_reminders(object_id=selected_id, user_email=user_email, is_admin=is_admin)
+            reminders_df = handler.get_reminders(
+                object_id=selected_id, user_email=user_email, is_admin=is_admin,
+                columns=("reminder_id", "service_id", "reminder_date", "status"),
+            )
             
             if reminders_df.empty:
                 st.info("No reminders for this equipment.")
             else:
                 st.dataframe(
                     reminders_df[["reminder_id", "service_id", "reminder_date", "status"]],
-                    use_container_width=True
+                    use_container_width=True,
+                    column_config=date_column_config(reminders_df)
                 )
 
-with tab2:
+
+@st.fragment
+@timer.timed("Add Equipment")
+def add_equipment_tab():
     st.subheader("Add New Equipment")
     
     with st.form("add_equipment_form"):
@@ -141,42 +233,55 @@ with tab2:
             else:
                 st.error("Please enter a name.")
 
-with tab3:
+
+@st.fragment
+@timer.timed("Edit Equipment")
+def edit_equipment_tab(object_type_filter, status_filter):
     st.subheader("Edit Equipment")
     
-    if vehicles_df.empty:
-        st.info("No equipment to edit.")
-    else:
-        selected_vehicle_id = st.selectbox(
-            "Select equipment to edit:",
-            vehicles_df["object_id"].tolist(),
-            format_func=lambda x: selectbox_label(x, vehicles_df, 'object_id', 'name', 'description'),
-            key="edit_equipment_select"
-        )
-        if selected_vehicle_id:
-            vehicle = vehicles_df[vehicles_df["object_id"] == selected_vehicle_id].iloc[0]
-            with st.form("edit_equipment_form"):
-                object_type_val = st.selectbox("Object Type", handler.OBJECT_TYPES, index=handler.OBJECT_TYPES.index(vehicle["object_type"]) if vehicle["object_type"] in handler.OBJECT_TYPES else 0)
-                name = st.text_input("Equipment Name", value=vehicle["name"])
-                description = st.text_area("Description", value=vehicle["description"], max_chars=500)
-                status = st.selectbox("Status", ["Active", "Inactive", "Maintenance"], 
-                                     index=["Active", "Inactive", "Maintenance"].index(vehicle["status"]))
-                col1, col2 = st.columns(2)
-                with col1:
-                    submitted = st.form_submit_button("Update Equipment")
-                with col2:
-                    delete_btn = st.form_submit_button("Delete Equipment", type="secondary")
-                if submitted:
-                    handler.update_object(
-                        selected_vehicle_id,
-                        object_type=object_type_val,
-                        name=name,
-                        description=description,
-                        status=status
-                    )
-                    st.success("✓ Equipment updated successfully!")
-                    st.rerun()
-                if delete_btn:
-                    handler.delete_object(selected_vehicle_id)
-                    st.success("✓ Equipment deleted successfully!")
-                    st.rerun()
+    selected_vehicle_id, vehicle = search_select(
+        "Select equipment to edit:",
+        handler.search_objects, 'object_id', 'name', 'description',
+        key="edit_equipment_select",
+        empty_message="No equipment to edit.",
+        **equipment_scope(object_type_filter, status_filter)
+    )
+    if selected_vehicle_id:
+        with st.form("edit_equipment_form"):
+            object_type_val = st.selectbox("Object Type", handler.OBJECT_TYPES, index=handler.OBJECT_TYPES.index(vehicle["object_type"]) if vehicle["object_type"] in handler.OBJECT_TYPES else 0)
+            name = st.text_input("Equipment Name", value=vehicle["name"])
+            description = st.text_area("Description", value=vehicle["description"], max_chars=500)
+            status = st.selectbox("Status", ["Active", "Inactive", "Maintenance"], 
+                                 index=["Active", "Inactive", "Maintenance"].index(vehicle["status"]))
+            col1, col2 = st.columns(2)
+            with col1:
+                submitted = st.form_submit_button("Update Equipment")
+            with col2:
+                delete_btn = st.form_submit_button("Delete Equipment", type="secondary")
+            if submitted:
+                handler.update_object(
+                    selected_vehicle_id,
+                    object_type=object_type_val,
+                    name=name,
+                    description=description,
+                    status=status
+                )
+                st.success("✓ Equipment updated successfully!")
+                st.rerun()
+            if delete_btn:
+                handler.delete_object(selected_vehicle_id)
+                st.success("✓ Equipment deleted successfully!")
+                st.rerun()
+
+
+# Tabs for different views
+tab1, tab2, tab3 = st.tabs(["View Equipment", "Add Equipment", "Edit Equipment"])
+
+with tab1:
+    view_equipment_tab(object_type_filter, status_filter)
+
+with tab2:
+    add_equipment_tab()
+
+with tab3:
+    edit_equipment_tab(object_type_filter, status_filter)
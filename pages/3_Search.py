@@ -0,0 +1,108 @@
+import math
+
+import pandas as pd
+import streamlit as st
+from utils import page_timing
+from utils.data_handler import DataHandler, SEARCH_PAGE_SIZE
+from utils.state_manager import StateManager
+from streamlit_cookies_controller import CookieController
+
+st.set_page_config(page_title="Search", layout="wide")
+
+cm = CookieController(key="cookies")
+StateManager.init_session_state()
+StateManager.init_and_enforce(cm)
+timer = page_timing.start(__file__)
+handler = DataHandler()
+user_email = st.session_state.get('user_email')
+is_admin = st.session_state.get('user_role') == 'admin'
+
+st.header("🔎 Search")
+
+# kind -> (label, page, selectbox key that preselects the record there)
+RESULT_KINDS = {
+    "fault": ("Fault Report", "pages/2_Fault_Reports.py", "view_fault_select"),
+    "report": ("Service Report", "pages/6_Service_Reports.py", "view_report_select"),
+    "service": ("Service", "pages/4_Service_Planning.py", "edit_service_select"),
+    "reminder": ("Reminder", "pages/5_Service_Reminders.py", "edit_reminder_select"),
+}
+
+# Sidebar filters
+st.sidebar.header("Filters")
+kinds = st.sidebar.multiselect(
+    "Search in",
+    list(RESULT_KINDS),
+    default=list(RESULT_KINDS),
+    format_func=lambda kind: RESULT_KINDS[kind][0] + "s",
+    key="search_kinds"
+)
+
+
+def reset_page():
+    st.session_state["search_page"] = 0
+    StateManager.set_text_filter(st.session_state["search_query"])
+
+
+if "search_query" not in st.session_state:
+    st.session_state["search_query"] = StateManager.get_text_filter()
+query = st.text_input(
+    "Search fault descriptions, reports, services and reminder notes",
+    key="search_query",
+    placeholder="e.g. hydraulic leak",
+    on_change=reset_page
+)
+
+if not query.strip():
+    st.info("Type one or more words. All words must match; the last one may be partial.")
+    st.stop()
+
+if not kinds:
+    st.warning("Select at least one record type in the sidebar.")
+    st.stop()
+
+kinds = tuple(kinds)
+with timer.section("Search"):
+    total = handler.count_search_matches(query, kinds=kinds, user_email=user_email, is_admin=is_admin)
+    if total == 0:
+        st.info("No matches found.")
+        st.stop()
+
+    pages = math.ceil(total / SEARCH_PAGE_SIZE)
+    page = min(st.session_state.get("search_page", 0), pages - 1)
+    results = handler.search_text(
+        query, kinds=kinds, user_email=user_email, is_admin=is_admin,
+        limit=SEARCH_PAGE_SIZE, offset=page * SEARCH_PAGE_SIZE
+    )
+
+st.caption(f"{total} match{'es' if total != 1 else ''} – best matches first.")
+
+with timer.section("Results"):
+    for _, result in results.iterrows():
+        label, target_page, select_key = RESULT_KINDS[result["kind"]]
+        with st.container(border=True):
+            col1, col2 = st.columns([5, 1])
+            with col1:
+                heading = f"**{label} {result['record_id']}**"
+                if result["title"]:
+                    heading += f" – {result['title']}"
+                st.markdown(heading)
+                equipment = result["object_name"] if pd.notna(result["object_name"]) else result["object_id"]
+                st.caption(f"{result['object_type']} · {equipment} ({result['object_id']})")
+                if result["snippet"].strip():
+                    st.markdown(result["snippet"])
+            with col2:
+                if st.button("Open", key=f"open_{result['kind']}_{result['record_id']}"):
+                    st.session_state[select_key] = result["record_id"]
+                    st.switch_page(target_page)
+
+col1, col2, col3 = st.columns([1, 2, 1])
+with col1:
+    if st.button("⬅️ Previous", disabled=page == 0):
+        st.session_state["search_page"] = page - 1
+        st.rerun()
+with col2:
+    st.write(f"Page {page + 1} of {pages}")
+with col3:
+    if st.button("Next ➡️", disabled=page >= pages - 1):
+        st.session_state["search_page"] = page + 1
+        st.rerun()
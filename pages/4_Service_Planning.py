@@ -1,8 +1,9 @@
 import streamlit as st
 import pandas as pd
+from utils import date_column_config, page_timing
 from utils.data_handler import DataHandler
 from utils.state_manager import StateManager
-from utils import selectbox_label
+from utils.search_select import search_select
 from datetime import datetime, timedelta
 from streamlit_cookies_controller import CookieController
 
@@ -11,6 +12,7 @@ st.set_page_config(page_title="Service Planning", layout="wide")
 cm = CookieController(key="cookies")
 StateManager.init_session_state()
 StateManager.init_and_enforce(cm)
+timer = page_timing.start(__file__)
 handler = DataHandler()
 user_email = st.session_state.get('user_email')
 is_admin = st.session_state.get('user_role') == 'admin'
@@ -37,7 +39,7 @@ with st.sidebar.expander("Manage Meter Units"):
                 deleted = handler.delete_meter_unit(u)
                 if deleted:
                     st.success(f"Deleted unit {u}")
-                    st.experimental_rerun()
+                    st.rerun()
                 else:
                     st.error("Could not delete unit")
 
@@ -46,49 +48,53 @@ with st.sidebar.expander("Manage Meter Units"):
         added = handler.add_meter_unit(new_unit)
         if added:
             st.success(f"Added unit {new_unit}")
-            st.experimental_rerun()
+            st.rerun()
         else:
             st.error("Could not add unit (may already exist or be empty)")
 
-# Tabs for different views
-tab1, tab2, tab3 = st.tabs(["View Services", "Schedule Service", "Edit Service"])
 
-with tab1:
+# Each tab is a fragment: interacting with widgets inside one tab reruns only
+# that tab, so the other tabs' queries and tables are not rebuilt.
+@st.fragment
+@timer.timed("View Services")
+def view_services_tab(object_type_filter):
     st.subheader("Service Schedule")
     
-    # Get services
-    if object_type_filter == "All":
-        services_df = handler.get_services(user_email=user_email, is_admin=is_admin)
-    else:
-        services_df = handler.get_services(object_type=object_type_filter, user_email=user_email, is_admin=is_admin)
+    # Get services, sorted by due date with days until service computed in SQL
+    services_df = handler.get_services_due(
+        object_type=None if object_type_filter == "All" else object_type_filter,
+        user_email=user_email, is_admin=is_admin,
+        columns=("service_id", "object_id", "object_type", "service_name", "interval_days",
+                 "next_service_date", "status", "expected_meter_reading", "meter_unit"),
+    ).rename(columns={"days_until": "days_until_service"})
+    # Projected date each service's expected meter reading is reached
+    forecasts_df = handler.get_service_forecasts(
+        object_type=None if object_type_filter == "All" else object_type_filter,
+        user_email=user_email, is_admin=is_admin, columns=("service_id",)
+    )
+    services_df = services_df.merge(
+        forecasts_df[["service_id", "meter_due_date"]], on="service_id", how="left"
+    )
     
     if services_df.empty:
         st.info("No services scheduled. Add one to get started!")
     else:
-        # Add a computed column for days until service
-        services_df = services_df.copy()
-        services_df["days_until_service"] = pd.to_datetime(
-            services_df["next_service_date"]
-        ) - pd.Timestamp.now()
-        services_df["days_until_service"] = services_df["days_until_service"].dt.days
-        
-        # Sort by days until service
-        services_df = services_df.sort_values("days_until_service")
         
         # Display table
         display_cols = ["service_id", "object_id", "object_type", "service_name", 
                        "interval_days", "next_service_date", "days_until_service", "status",
-                       "expected_meter_reading", "meter_unit"]
+                       "expected_meter_reading", "meter_unit", "meter_due_date"]
         st.dataframe(
             services_df[display_cols],
             use_container_width=True,
+            column_config=date_column_config(services_df),
             hide_index=True
         )
         
         # Statistics
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            overdue = len(services_df[services_df["days_until_service"] < 0])
+            overdue = int(services_df["overdue"].sum())
             st.metric("Overdue Services", overdue, delta=None, delta_color="inverse")
         with col2:
             due_soon = len(services_df[(services_df["days_until_service"] >= 0) & 
@@ -101,135 +107,139 @@ with tab1:
             completed = len(services_df[services_df["status"] == "Completed"])
             st.metric("Completed", completed)
 
-with tab2:
+
+@st.fragment
+@timer.timed("Schedule Service")
+def schedule_service_tab(object_type_filter):
     st.subheader("Schedule New Service")
     
-    # Get all objects
-    all_objects = handler.get_objects()
-    
-    if all_objects.empty:
-        st.warning("No equipment found. Please add equipment first.")
-    else:
-        # --- Robust, reactive object type/equipment selection ---
-        if "service_object_type" not in st.session_state:
-            st.session_state["service_object_type"] = object_type_filter if object_type_filter in handler.OBJECT_TYPES else handler.OBJECT_TYPES[0]
-        def set_service_object_type():
-            st.session_state["service_object_type"] = st.session_state["service_object_type_select"]
-
-        # Place Object Type selectbox OUTSIDE the form for reactivity
-        object_type_tab = st.selectbox(
-            "Object Type",
-            handler.OBJECT_TYPES,
-            index=handler.OBJECT_TYPES.index(st.session_state["service_object_type"]),
-            key="service_object_type_select",
-            on_change=set_service_object_type
-        )
-        filter_type = st.session_state["service_object_type"]
-        obj_list = all_objects[all_objects["object_type"] == filter_type]
-        with st.form("schedule_service_form"):
-            if obj_list.empty:
-                st.warning(f"No {filter_type.lower()} found. Please add one first.")
-                submitted = st.form_submit_button("Schedule Service", disabled=True)
-            else:
-                object_id = st.selectbox(
-                    "Select Equipment",
-                    obj_list["object_id"].tolist(),
-                    format_func=lambda x: selectbox_label(x, obj_list, 'object_id', 'name', 'description'),
-                    key="service_equipment_select"
+    # --- Robust, reactive object type/equipment selection ---
+    if "service_object_type" not in st.session_state:
+        st.session_state["service_object_type"] = object_type_filter if object_type_filter in handler.OBJECT_TYPES else handler.OBJECT_TYPES[0]
+    def set_service_object_type():
+        st.session_state["service_object_type"] = st.session_state["service_object_type_select"]
+
+    # Place Object Type selectbox and equipment search OUTSIDE the form for reactivity
+    object_type_tab = st.selectbox(
+        "Object Type",
+        handler.OBJECT_TYPES,
+        index=handler.OBJECT_TYPES.index(st.session_state["service_object_type"]),
+        key="service_object_type_select",
+        on_change=set_service_object_type
+    )
+    filter_type = st.session_state["service_object_type"]
+    object_id, _ = search_select(
+        "Select Equipment",
+        handler.search_objects, 'object_id', 'name', 'description',
+        key="service_equipment_select",
+        empty_message=f"No {filter_type.lower()} found. Please add one first.",
+        object_type=filter_type, user_email=user_email, is_admin=is_admin
+    )
+    with st.form("schedule_service_form"):
+        if object_id is None:
+            submitted = st.form_submit_button("Schedule Service", disabled=True)
+        else:
+            service_name = st.text_input("Service Name (e.g., Oil Change, Inspection)")
+            description = st.text_area("Description", max_chars=500)
+            interval_days = st.number_input("Service Interval (days)", min_value=1, value=30)
+            expected_meter_reading = st.number_input("Expected Meter Reading", min_value=0, value=0)
+            meter_unit = st.selectbox("Meter Unit", handler.get_meter_units())
+            status = st.selectbox("Status", ["Scheduled", "Pending", "In Progress", "Completed"])
+            notes = st.text_area("Notes", max_chars=500)
+            submitted = st.form_submit_button("Schedule Service")
+        
+        if submitted and object_id is not None:
+            if service_name:
+                service_id = handler.add_service(
+                    object_id=object_id,
+                    object_type=st.session_state["service_object_type"],
+                    service_name=service_name,
+                    interval_days=interval_days,
+                    expected_meter_reading=int(expected_meter_reading) if expected_meter_reading is not None else None,
+                    meter_unit=meter_unit,
+                    description=description,
+                    status=status,
+                    notes=notes,
+                    user_email=user_email
                 )
-                service_name = st.text_input("Service Name (e.g., Oil Change, Inspection)")
-                description = st.text_area("Description", max_chars=500)
-                interval_days = st.number_input("Service Interval (days)", min_value=1, value=30)
-                expected_meter_reading = st.number_input("Expected Meter Reading", min_value=0, value=0)
-                meter_unit = st.selectbox("Meter Unit", handler.get_meter_units())
-                status = st.selectbox("Status", ["Scheduled", "Pending", "In Progress", "Completed"])
-                notes = st.text_area("Notes", max_chars=500)
-                submitted = st.form_submit_button("Schedule Service")
-            
-            if submitted and not obj_list.empty:
-                if service_name:
-                    service_id = handler.add_service(
-                        object_id=object_id,
-                        object_type=st.session_state["service_object_type"],
-                        service_name=service_name,
-                        interval_days=interval_days,
-                        expected_meter_reading=int(expected_meter_reading) if expected_meter_reading is not None else None,
-                        meter_unit=meter_unit,
-                        description=description,
-                        status=status,
-                        notes=notes,
-                        user_email=user_email
-                    )
-                    st.success(f"✓ Service scheduled successfully! ID: {service_id}")
-                    st.rerun()
-                else:
-                    st.error("Please enter a service name.")
+                st.success(f"✓ Service scheduled successfully! ID: {service_id}")
+                st.rerun()
+            else:
+                st.error("Please enter a service name.")
 
-with tab3:
+
+@st.fragment
+@timer.timed("Edit Service")
+def edit_service_tab(object_type_filter):
     st.subheader("Edit Service")
     
-    # Get services filtered by object type
-    if object_type_filter == "All":
-        services_df = handler.get_services()
-    else:
-        services_df = handler.get_services(object_type=object_type_filter)
+    selected_service_id, service = search_select(
+        "Select service to edit:",
+        handler.search_services, 'service_id', 'service_name', 'description',
+        key="edit_service_select",
+        empty_message="No services to edit.",
+        object_type=None if object_type_filter == "All" else object_type_filter,
+        user_email=user_email, is_admin=is_admin
+    )
     
-    if services_df.empty:
-        st.info("No services to edit.")
-    else:
-        selected_service_id = st.selectbox(
-            "Select service to edit:",
-            services_df["service_id"].tolist(),
-            format_func=lambda x: selectbox_label(x, services_df, 'service_id', 'service_name', 'description')
-        )
+    if selected_service_id:
+        with st.form("edit_service_form"):
+            service_name = st.text_input("Service Name", value=service["service_name"])
+            description = st.text_area("Description", value=service["description"], max_chars=500)
+            interval_days = st.number_input("Service Interval (days)", value=int(service["interval_days"]))
+            expected_meter_reading = st.number_input("Expected Meter Reading", min_value=0, value=int(service.get("expected_meter_reading") if pd.notna(service.get("expected_meter_reading")) and service.get("expected_meter_reading") is not None else 0))
+            meter_unit = st.selectbox("Meter Unit", handler.get_meter_units(), index=handler.get_meter_units().index(service.get("meter_unit")) if service.get("meter_unit") in handler.get_meter_units() else 0)
+            last_service_date = st.date_input(
+                "Last Service Date",
+                value=pd.to_datetime(service["last_service_date"]) if pd.notna(service["last_service_date"]) else None
+            )
+            next_service_date = st.date_input(
+                "Next Service Date",
+                value=pd.to_datetime(service["next_service_date"])
+            )
+            status = st.selectbox(
+                "Status",
+                ["Scheduled", "Pending", "In Progress", "Completed"],
+                index=["Scheduled", "Pending", "In Progress", "Completed"].index(service["status"])
+            )
+            notes = st.text_area("Notes", value=service["notes"], max_chars=500)
         
-        if selected_service_id:
-            service = services_df[services_df["service_id"] == selected_service_id].iloc[0]
-            
-            with st.form("edit_service_form"):
-                service_name = st.text_input("Service Name", value=service["service_name"])
-                description = st.text_area("Description", value=service["description"], max_chars=500)
-                interval_days = st.number_input("Service Interval (days)", value=int(service["interval_days"]))
-                expected_meter_reading = st.number_input("Expected Meter Reading", min_value=0, value=int(service.get("expected_meter_reading") if pd.notna(service.get("expected_meter_reading")) and service.get("expected_meter_reading") is not None else 0))
-                meter_unit = st.selectbox("Meter Unit", handler.get_meter_units(), index=handler.get_meter_units().index(service.get("meter_unit")) if service.get("meter_unit") in handler.get_meter_units() else 0)
-                last_service_date = st.date_input(
-                    "Last Service Date",
-                    value=pd.to_datetime(service["last_service_date"]) if pd.notna(service["last_service_date"]) else None
-                )
-                next_service_date = st.date_input(
-                    "Next Service Date",
-                    value=pd.to_datetime(service["next_service_date"])
-                )
-                status = st.selectbox(
-                    "Status",
-                    ["Scheduled", "Pending", "In Progress", "Completed"],
-                    index=["Scheduled", "Pending", "In Progress", "Completed"].index(service["status"])
+            col1, col2 = st.columns(2)
+            with col1:
+                submitted = st.form_submit_button("Update Service")
+            with col2:
+                delete_btn = st.form_submit_button("Delete Service", type="secondary")
+        
+            if submitted:
+                handler.update_service(
+                    selected_service_id,
+                    service_name=service_name,
+                    description=description,
+                    interval_days=interval_days,
+                    expected_meter_reading=int(expected_meter_reading) if expected_meter_reading is not None else None,
+                    meter_unit=meter_unit,
+                    last_service_date=str(last_service_date) if last_service_date else None,
+                    next_service_date=str(next_service_date),
+                    status=status,
+                    notes=notes
                 )
-                notes = st.text_area("Notes", value=service["notes"], max_chars=500)
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    submitted = st.form_submit_button("Update Service")
-                with col2:
-                    delete_btn = st.form_submit_button("Delete Service", type="secondary")
-                
-                if submitted:
-                    handler.update_service(
-                        selected_service_id,
-                        service_name=service_name,
-                        description=description,
-                        interval_days=interval_days,
-                        expected_meter_reading=int(expected_meter_reading) if expected_meter_reading is not None else None,
-                        meter_unit=meter_unit,
-                        last_service_date=str(last_service_date) if last_service_date else None,
-                        next_service_date=str(next_service_date),
-                        status=status,
-                        notes=notes
-                    )
-                    st.success("✓ Service updated successfully!")
-                    st.rerun()
-                
-                if delete_btn:
-                    handler.delete_service(selected_service_id)
-                    st.success("✓ Service deleted successfully!")
-                    st.rerun()
+                st.success("✓ Service updated successfully!")
+                st.rerun()
+        
+            if delete_btn:
+                handler.delete_service(selected_service_id)
+                st.success("✓ Service deleted successfully!")
+                st.rerun()
+
+
+# Tabs for different views
+tab1, tab2, tab3 = st.tabs(["View Services", "Schedule Service", "Edit Service"])
+
+with tab1:
+    view_services_tab(object_type_filter)
+
+with tab2:
+    schedule_service_tab(object_type_filter)
+
+with tab3:
+    edit_service_tab(object_type_filter)
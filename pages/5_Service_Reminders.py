@@ -1,9 +1,11 @@
 import streamlit as st
 import pandas as pd
+from utils import date_column_config, page_timing
 from utils.data_handler import DataHandler
 from utils.state_manager import StateManager
 from utils.email_notifier import EmailNotifier
-from utils import selectbox_label
+from utils import reminder_scheduler
+from utils.search_select import search_select
 from datetime import datetime
 import yaml
 from streamlit_cookies_controller import CookieController
@@ -13,6 +15,7 @@ st.set_page_config(page_title="Service Reminders", layout="wide")
 cm = CookieController(key="cookies")
 StateManager.init_session_state()
 StateManager.init_and_enforce(cm)
+timer = page_timing.start(__file__)
 handler = DataHandler()
 user_email = st.session_state.get('user_email')
 is_admin = st.session_state.get('user_role') == 'admin'
@@ -46,35 +49,26 @@ status_filter = st.sidebar.selectbox(
     key="reminders_status"
 )
 
-# Tabs for different views
-tab1, tab2, tab3 = st.tabs(["View Reminders", "Add Reminder", "Edit Reminder"])
 
-with tab1:
+# Each tab is a fragment: interacting with widgets inside one tab reruns only
+# that tab, so the other tabs' queries and tables are not rebuilt.
+@st.fragment
+@timer.timed("View Reminders")
+def view_reminders_tab(object_type_filter, status_filter):
     st.subheader("All Reminders")
     
-    # Get reminders
-    reminders_df = handler.get_reminders(user_email=user_email, is_admin=is_admin)
-    
-    # Apply filters
-    if object_type_filter != "All":
-        reminders_df = reminders_df[reminders_df["object_type"] == object_type_filter]
-    
-    if status_filter != "All":
-        reminders_df = reminders_df[reminders_df["status"] == status_filter]
+    # Get reminders: filters, days until reminder and sorting all run in SQL
+    reminders_df = handler.get_reminders_due(
+        object_type=None if object_type_filter == "All" else object_type_filter,
+        status=None if status_filter == "All" else status_filter,
+        user_email=user_email, is_admin=is_admin,
+        columns=("reminder_id", "service_id", "object_id", "object_type", "reminder_date", "status",
+                 "email_notification", "notification_time", "notes"),
+    )
     
     if reminders_df.empty:
         st.info("No reminders found. Add one to get started!")
     else:
-        # Add computed columns
-        reminders_df = reminders_df.copy()
-        reminders_df["days_until"] = pd.to_datetime(
-            reminders_df["reminder_date"]
-        ) - pd.Timestamp.now()
-        reminders_df["days_until"] = reminders_df["days_until"].dt.days
-        
-        # Sort by days until reminder
-        reminders_df = reminders_df.sort_values("days_until")
-        
         # Add conditional notification_time display
         # Show notification_time only if email_notification is True, otherwise empty string
         reminders_df["notification_time_display"] = reminders_df.apply(
@@ -93,6 +87,7 @@ with tab1:
         st.dataframe(
             display_df,
             use_container_width=True,
+            column_config=date_column_config(display_df),
             hide_index=True
         )
         
@@ -114,157 +109,186 @@ with tab1:
             completed = len(reminders_df[reminders_df["status"] == "Completed"])
             st.metric("Completed", completed)
 
-with tab2:
+
+@st.fragment
+@timer.timed("Add Reminder")
+def add_reminder_tab():
     st.subheader("Add New Reminder")
     
-    # Get all services
-    services_df = handler.get_services()
+    # Service search sits outside the form so typing narrows the list
+    service_id, selected_service = search_select(
+        "Select Service",
+        handler.search_services, 'service_id', 'service_name', 'description',
+        key="add_reminder_service_select",
+        empty_message="No services found. Please schedule a service first.",
+        user_email=user_email, is_admin=is_admin
+    )
     
-    if services_df.empty:
-        st.warning("No services found. Please schedule a service first.")
-    else:
+    if service_id:
         with st.form("add_reminder_form"):
-            service_id = st.selectbox(
-                "Select Service",
-                services_df["service_id"].tolist(),
-                format_func=lambda x: selectbox_label(x, services_df, 'service_id', 'service_name', 'description')
-            )
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write(f"**Object Type:** {selected_service['object_type']}")
+                st.write(f"**Object ID:** {selected_service['object_id']}")
+            with col2:
+                st.write(f"**Service:** {selected_service['service_name']}")
+                st.write(f"**Interval:** {selected_service['interval_days']} days")
+            
+            reminder_date = st.date_input("Reminder Date")
+            st.write(f"**Expected Meter Reading:** {selected_service.get('expected_meter_reading', '')}")
+            st.write(f"**Meter Unit:** {selected_service.get('meter_unit', '')}")
+            notes = st.text_area("Notes", max_chars=500)
             
-            if service_id:
-                selected_service = services_df[services_df["service_id"] == service_id].iloc[0]
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.write(f"**Object Type:** {selected_service['object_type']}")
-                    st.write(f"**Object ID:** {selected_service['object_id']}")
-                with col2:
-                    st.write(f"**Service:** {selected_service['service_name']}")
-                    st.write(f"**Interval:** {selected_service['interval_days']} days")
-                
-                reminder_date = st.date_input("Reminder Date")
-                st.write(f"**Expected Meter Reading:** {selected_service.get('expected_meter_reading', '')}")
-                st.write(f"**Meter Unit:** {selected_service.get('meter_unit', '')}")
-                notes = st.text_area("Notes", max_chars=500)
-                
-                # Email notification options
-                st.markdown("---")
-                st.markdown("**📧 Email Notification**")
-                email_notification = st.checkbox("Send email reminder", value=False, 
-                                                 help="Send an email notification on the reminder date")
-                notification_time = st.time_input("Notification time", 
-                                                  value=datetime.strptime("09:00", "%H:%M").time(),
-                                                  help="Time to send the email notification")
-                
-                if not email_notifier.is_enabled():
-                    st.info("ℹ️ Email notifications are disabled. Configure email_config.yaml to enable.")
-                
-                submitted = st.form_submit_button("Add Reminder")
-                if submitted:
-                    reminder_id = handler.add_reminder(
-                        service_id=service_id,
-                        object_id=selected_service["object_id"],
-                        object_type=selected_service["object_type"],
-                        reminder_date=str(reminder_date),
-                        notes=notes,
-                        user_email=user_email,
-                        email_notification=email_notification,
-                        notification_time=notification_time.strftime("%H:%M")
-                    )
-                    st.success(f"✓ Reminder added successfully! ID: {reminder_id}")
-                    st.rerun()
+            # Email notification options
+            st.markdown("---")
+            st.markdown("**📧 Email Notification**")
+            email_notification = st.checkbox("Send email reminder", value=False, 
+                                             help="Send an email notification on the reminder date")
+            notification_time = st.time_input("Notification time", 
+                                              value=datetime.strptime("09:00", "%H:%M").time(),
+                                              help="Time to send the email notification")
+            
+            if not email_notifier.is_enabled():
+                st.info("ℹ️ Email notifications are disabled. Configure email_config.yaml to enable.")
+            
+            submitted = st.form_submit_button("Add Reminder")
+            if submitted:
+                reminder_id = handler.add_reminder(
+                    service_id=service_id,
+                    object_id=selected_service["object_id"],
+                    object_type=selected_service["object_type"],
+                    reminder_date=str(reminder_date),
+                    notes=notes,
+                    user_email=user_email,
+                    email_notification=email_notification,
+                    notification_time=notification_time.strftime("%H:%M")
+                )
+                st.success(f"✓ Reminder added successfully! ID: {reminder_id}")
+                st.rerun()
 
-with tab3:
+    st.markdown("---")
+    with st.expander("Generate from Service Schedules"):
+        st.caption("Create a reminder for every service due within the horizon, dated the lead "
+                   "time before its next service date. Services that already have a reminder "
+                   "for their current due date are skipped.")
+        with st.form("generate_reminders_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                lead_days = st.number_input("Lead time (days)", min_value=0, value=reminder_scheduler.DEFAULT_LEAD_DAYS)
+            with col2:
+                within_days = st.number_input("Services due within (days)", min_value=0,
+                                              value=reminder_scheduler.DEFAULT_WITHIN_DAYS)
+            email_notification = st.checkbox("Send email reminders", value=False)
+            if st.form_submit_button("Generate Reminders"):
+                created = handler.generate_reminders(
+                    lead_days=int(lead_days),
+                    within_days=int(within_days),
+                    email_notification=email_notification,
+                    user_email=user_email,
+                    is_admin=is_admin
+                )
+                st.success(f"✓ {created} reminder{'s' if created != 1 else ''} generated.")
+
+
+@st.fragment
+@timer.timed("Edit Reminder")
+def edit_reminder_tab(object_type_filter):
     st.subheader("Edit Reminder")
     
-    # Get reminders filtered by object type
-    if object_type_filter == "All":
-        reminders_df = handler.get_reminders()
-    else:
-        reminders_df = handler.get_reminders(object_type=object_type_filter)
+    selected_reminder_id, reminder = search_select(
+        "Select reminder to edit:",
+        handler.search_reminders, 'reminder_id', None, 'notes',
+        key="edit_reminder_select",
+        empty_message="No reminders to edit.",
+        object_type=None if object_type_filter == "All" else object_type_filter,
+        user_email=user_email, is_admin=is_admin
+    )
     
-    if reminders_df.empty:
-        st.info("No reminders to edit.")
-    else:
-        selected_reminder_id = st.selectbox(
-            "Select reminder to edit:",
-            reminders_df["reminder_id"].tolist(),
-            format_func=lambda x: selectbox_label(x, reminders_df, 'reminder_id', None, 'notes')
-        )
-        
-        if selected_reminder_id:
-            reminder = reminders_df[reminders_df["reminder_id"] == selected_reminder_id].iloc[0]
+    if selected_reminder_id:
+        with st.form("edit_reminder_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write(f"**Service ID:** {reminder['service_id']}")
+                st.write(f"**Object ID:** {reminder['object_id']}")
+            with col2:
+                st.write(f"**Object Type:** {reminder['object_type']}")
+            # Show associated expected meter info when available
+            st.write(f"**Expected Meter Reading:** {reminder.get('expected_meter_reading', '')}")
+            st.write(f"**Meter Unit:** {reminder.get('meter_unit', '')}")
             
-            with st.form("edit_reminder_form"):
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.write(f"**Service ID:** {reminder['service_id']}")
-                    st.write(f"**Object ID:** {reminder['object_id']}")
-                with col2:
-                    st.write(f"**Object Type:** {reminder['object_type']}")
-                # Show associated expected meter info when available
-                st.write(f"**Expected Meter Reading:** {reminder.get('expected_meter_reading', '')}")
-                st.write(f"**Meter Unit:** {reminder.get('meter_unit', '')}")
-                
-                reminder_date = st.date_input(
-                    "Reminder Date",
-                    value=pd.to_datetime(reminder["reminder_date"])
-                )
-                status = st.selectbox(
-                    "Status",
-                    ["Pending", "Completed"],
-                    index=0 if reminder["status"] == "Pending" else 1
-                )
-                notes = st.text_area("Notes", value=reminder["notes"], max_chars=500)
-                
-                # Email notification options
-                st.markdown("---")
-                st.markdown("**📧 Email Notification**")
-                email_notification = st.checkbox(
-                    "Send email reminder", 
-                    value=reminder.get('email_notification', False),
-                    help="Send an email notification on the reminder date"
-                )
-                
-                # Parse existing time or use default
-                existing_time = reminder.get('notification_time', '09:00')
-                try:
-                    time_obj = datetime.strptime(existing_time, "%H:%M").time()
-                except:
-                    time_obj = datetime.strptime("09:00", "%H:%M").time()
-                
-                notification_time = st.time_input(
-                    "Notification time", 
-                    value=time_obj,
-                    help="Time to send the email notification"
+            reminder_date = st.date_input(
+                "Reminder Date",
+                value=pd.to_datetime(reminder["reminder_date"])
+            )
+            status = st.selectbox(
+                "Status",
+                ["Pending", "Completed"],
+                index=0 if reminder["status"] == "Pending" else 1
+            )
+            notes = st.text_area("Notes", value=reminder["notes"], max_chars=500)
+            
+            # Email notification options
+            st.markdown("---")
+            st.markdown("**📧 Email Notification**")
+            email_notification = st.checkbox(
+                "Send email reminder", 
+                value=reminder.get('email_notification', False),
+                help="Send an email notification on the reminder date"
+            )
+            
+            # Parse existing time or use default
+            existing_time = reminder.get('notification_time', '09:00')
+            try:
+                time_obj = datetime.strptime(existing_time, "%H:%M").time()
+            except:
+                time_obj = datetime.strptime("09:00", "%H:%M").time()
+            
+            notification_time = st.time_input(
+                "Notification time", 
+                value=time_obj,
+                help="Time to send the email notification"
+            )
+            
+            if not email_notifier.is_enabled():
+                st.info("ℹ️ Email notifications are disabled. Configure email_config.yaml to enable.")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                submitted = st.form_submit_button("Update Reminder")
+            with col2:
+                delete_btn = st.form_submit_button("Delete Reminder", type="secondary")
+            
+            if submitted:
+                handler.update_reminder(
+                    selected_reminder_id,
+                    reminder_date=str(reminder_date),
+                    status=status,
+                    notes=notes,
+                    email_notification=email_notification,
+                    notification_time=notification_time.strftime("%H:%M"),
+                    email_sent=False  # Reset email_sent when updating
                 )
-                
-                if not email_notifier.is_enabled():
-                    st.info("ℹ️ Email notifications are disabled. Configure email_config.yaml to enable.")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    submitted = st.form_submit_button("Update Reminder")
-                with col2:
-                    delete_btn = st.form_submit_button("Delete Reminder", type="secondary")
-                
-                if submitted:
-                    handler.update_reminder(
-                        selected_reminder_id,
-                        reminder_date=str(reminder_date),
-                        status=status,
-                        notes=notes,
-                        email_notification=email_notification,
-                        notification_time=notification_time.strftime("%H:%M"),
-                        email_sent=False  # Reset email_sent when updating
-                    )
-                    st.success("✓ Reminder updated successfully!")
-                    st.rerun()
-                
-                if delete_btn:
-                    # Use handler's safe delete to avoid unguarded file writes
-                    deleted = handler.delete_reminder(selected_reminder_id)
-                    if deleted:
-                        st.success("✓ Reminder deleted successfully!")
-                    else:
-                        st.error("Could not delete reminder (it may have been removed already).")
-                    st.rerun()
+                st.success("✓ Reminder updated successfully!")
+                st.rerun()
+            
+            if delete_btn:
+                # Use handler's safe delete to avoid unguarded file writes
+                deleted = handler.delete_reminder(selected_reminder_id)
+                if deleted:
+                    st.success("✓ Reminder deleted successfully!")
+                else:
+                    st.error("Could not delete reminder (it may have been removed already).")
+                st.rerun()
+
+
+# Tabs for different views
+tab1, tab2, tab3 = st.tabs(["View Reminders", "Add Reminder", "Edit Reminder"])
+
+with tab1:
+    view_reminders_tab(object_type_filter, status_filter)
+
+with tab2:
+    add_reminder_tab()
+
+with tab3:
+    edit_reminder_tab(object_type_filter)
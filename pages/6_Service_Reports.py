@@ -1,8 +1,9 @@
 import streamlit as st
 import pandas as pd
+from utils import date_column_config, format_date, page_timing
 from utils.data_handler import DataHandler
 from utils.state_manager import StateManager
-from utils import selectbox_label
+from utils.search_select import search_select
 from datetime import datetime
 from streamlit_cookies_controller import CookieController
 
@@ -11,6 +12,7 @@ st.set_page_config(page_title="Service Reports", layout="wide")
 cm = CookieController(key="cookies")
 StateManager.init_session_state()
 StateManager.init_and_enforce(cm)
+timer = page_timing.start(__file__)
 handler = DataHandler()
 user_email = st.session_state.get('user_email')
 is_admin = st.session_state.get('user_role') == 'admin'
@@ -31,19 +33,23 @@ report_type_filter = st.sidebar.selectbox(
     key="reports_type"
 )
 
-# Tabs for different views
-tab1, tab2, tab3 = st.tabs(["View Reports", "Add Report", "Edit Report"])
 
-with tab1:
+# Each tab is a fragment: interacting with widgets inside one tab reruns only
+# that tab, so the other tabs' queries and tables are not rebuilt.
+@st.fragment
+@timer.timed("View Reports")
+def view_reports_tab(object_type_filter, report_type_filter):
     st.subheader("Service Reports")
     
     # Get reports
-    reports_df = handler.get_reports(user_email=user_email, is_admin=is_admin)
+    reports_df = handler.get_reports(
+        object_type=None if object_type_filter == "All" else object_type_filter,
+        user_email=user_email, is_admin=is_admin,
+        columns=("report_id", "object_id", "object_type", "report_type", "title", "completion_date",
+                 "notes", "actual_meter_reading", "meter_unit"),
+    )
     
     # Apply filters
-    if object_type_filter != "All":
-        reports_df = reports_df[reports_df["object_type"] == object_type_filter]
-    
     if report_type_filter != "All":
         reports_df = reports_df[reports_df["report_type"] == report_type_filter]
     
@@ -56,6 +62,7 @@ with tab1:
         st.dataframe(
             reports_df[display_cols],
             use_container_width=True,
+            column_config=date_column_config(reports_df),
             hide_index=True
         )
         
@@ -75,16 +82,16 @@ with tab1:
         st.write("---")
         st.subheader("Report Details")
         
-        selected_report_id = st.selectbox(
+        selected_report_id, report = search_select(
             "Select report to view details:",
-            reports_df["report_id"].tolist(),
-            format_func=lambda x: selectbox_label(x, reports_df, 'report_id', 'title', 'description'),
-            key="view_report_select"
+            handler.search_reports, 'report_id', 'title', 'description',
+            key="view_report_select",
+            object_type=None if object_type_filter == "All" else object_type_filter,
+            report_type=None if report_type_filter == "All" else report_type_filter,
+            user_email=user_email, is_admin=is_admin
         )
         
         if selected_report_id:
-            report = reports_df[reports_df["report_id"] == selected_report_id].iloc[0]
-            
             col1, col2 = st.columns(2)
             with col1:
                 st.write(f"**Report ID:** {report['report_id']}")
@@ -93,7 +100,7 @@ with tab1:
                 st.write(f"**Report Type:** {report['report_type']}")
             with col2:
                 st.write(f"**Title:** {report['title']}")
-                st.write(f"**Completion Date:** {report['completion_date']}")
+                st.write(f"**Completion Date:** {format_date(report['completion_date'])}")
                 st.write(f"**Created Date:** {report['created_date']}")
             
             st.write("**Description:**")
@@ -102,139 +109,166 @@ with tab1:
             st.write("**Notes:**")
             st.write(report['notes'])
 
-with tab2:
+
+def completes_service_select(services, current=None):
+    """Optional selectbox linking a report to the service it completes."""
+    options = [None] + services["service_id"].tolist()
+    names = dict(zip(services["service_id"], services["service_name"])) if not services.empty else {}
+    return st.selectbox(
+        "Completes Service",
+        options,
+        index=options.index(current) if current in options else 0,
+        format_func=lambda sid: "— None —" if sid is None else f"{sid} – {names[sid]}",
+        help="The service's last and next service dates are rolled forward from this report."
+    )
+
+
+@st.fragment
+@timer.timed("Add Report")
+def add_report_tab(object_type_filter):
     st.subheader("Add New Report")
     
-    # Get all objects
-    all_objects = handler.get_objects()
-    
-    if all_objects.empty:
-        st.warning("No equipment found. Please add equipment first.")
-    else:
-        # --- Robust, reactive object type/equipment selection ---
-        if "report_object_type" not in st.session_state:
-            st.session_state["report_object_type"] = object_type_filter if object_type_filter in handler.OBJECT_TYPES else handler.OBJECT_TYPES[0]
-        def set_report_object_type():
-            st.session_state["report_object_type"] = st.session_state["report_object_type_select"]
-
-        # Place Object Type selectbox OUTSIDE the form for reactivity
-        object_type_tab = st.selectbox(
-            "Object Type",
-            handler.OBJECT_TYPES,
-            index=handler.OBJECT_TYPES.index(st.session_state["report_object_type"]),
-            key="report_object_type_select",
-            on_change=set_report_object_type
-        )
-        filter_type = st.session_state["report_object_type"]
-        obj_list = all_objects[all_objects["object_type"] == filter_type]
-        with st.form("add_report_form"):
-            if obj_list.empty:
-                st.warning(f"No {filter_type.lower()} found. Please add one first.")
-                submitted = st.form_submit_button("Add Report", disabled=True)
-            else:
-                object_id = st.selectbox(
-                    "Select Equipment",
-                    obj_list["object_id"].tolist(),
-                    format_func=lambda x: selectbox_label(x, obj_list, 'object_id', 'name', 'description'),
-                    key="report_equipment_select"
-                )
-                report_type = st.selectbox(
-                    "Report Type",
-                    ["Maintenance", "Inspection", "Repair", "Preventive", "Other"]
+    # --- Robust, reactive object type/equipment selection ---
+    if "report_object_type" not in st.session_state:
+        st.session_state["report_object_type"] = object_type_filter if object_type_filter in handler.OBJECT_TYPES else handler.OBJECT_TYPES[0]
+    def set_report_object_type():
+        st.session_state["report_object_type"] = st.session_state["report_object_type_select"]
+
+    # Place Object Type selectbox and equipment search OUTSIDE the form for reactivity
+    object_type_tab = st.selectbox(
+        "Object Type",
+        handler.OBJECT_TYPES,
+        index=handler.OBJECT_TYPES.index(st.session_state["report_object_type"]),
+        key="report_object_type_select",
+        on_change=set_report_object_type
+    )
+    filter_type = st.session_state["report_object_type"]
+    object_id, _ = search_select(
+        "Select Equipment",
+        handler.search_objects, 'object_id', 'name', 'description',
+        key="report_equipment_select",
+        empty_message=f"No {filter_type.lower()} found. Please add one first.",
+        object_type=filter_type, user_email=user_email, is_admin=is_admin
+    )
+    services = handler.get_services(
+        object_id=object_id, user_email=user_email, is_admin=is_admin,
+        columns=("service_id", "service_name"),
+    ) if object_id else pd.DataFrame()
+    with st.form("add_report_form"):
+        if object_id is None:
+            submitted = st.form_submit_button("Add Report", disabled=True)
+        else:
+            report_type = st.selectbox(
+                "Report Type",
+                ["Maintenance", "Inspection", "Repair", "Preventive", "Other"]
+            )
+            actual_meter_reading = st.number_input("Actual Meter Reading", min_value=0, value=0)
+            meter_unit = st.selectbox("Meter Unit", handler.get_meter_units())
+            title = st.text_input("Report Title")
+            description = st.text_area("Description", max_chars=1000)
+            completion_date = st.date_input("Completion Date")
+            service_id = completes_service_select(services)
+            notes = st.text_area("Notes", max_chars=500)
+            submitted = st.form_submit_button("Add Report")
+        
+        if submitted and object_id is not None:
+            if title:
+                report_id = handler.add_report(
+                    object_id=object_id,
+                    object_type=st.session_state["report_object_type"],
+                    report_type=report_type,
+                    title=title,
+                    description=description,
+                    completion_date=str(completion_date),
+                    notes=notes,
+                    actual_meter_reading=int(actual_meter_reading) if actual_meter_reading is not None else None,
+                    meter_unit=meter_unit,
+                    user_email=user_email,
+                    service_id=service_id
                 )
-                actual_meter_reading = st.number_input("Actual Meter Reading", min_value=0, value=0)
-                meter_unit = st.selectbox("Meter Unit", handler.get_meter_units())
-                title = st.text_input("Report Title")
-                description = st.text_area("Description", max_chars=1000)
-                completion_date = st.date_input("Completion Date")
-                notes = st.text_area("Notes", max_chars=500)
-                submitted = st.form_submit_button("Add Report")
-            
-            if submitted and not obj_list.empty:
-                if title:
-                    report_id = handler.add_report(
-                        object_id=object_id,
-                        object_type=st.session_state["report_object_type"],
-                        report_type=report_type,
-                        title=title,
-                        description=description,
-                        completion_date=str(completion_date),
-                        notes=notes,
-                        actual_meter_reading=int(actual_meter_reading) if actual_meter_reading is not None else None,
-                        meter_unit=meter_unit,
-                        user_email=user_email
-                    )
-                    st.success(f"✓ Report added successfully! ID: {report_id}")
-                    st.rerun()
-                else:
-                    st.error("Please enter a report title.")
+                st.success(f"✓ Report added successfully! ID: {report_id}")
+                st.rerun()
+            else:
+                st.error("Please enter a report title.")
 
-with tab3:
+
+@st.fragment
+@timer.timed("Edit Report")
+def edit_report_tab(object_type_filter):
     st.subheader("Edit Report")
     
-    # Get reports filtered by object type
-    if object_type_filter == "All":
-        reports_df = handler.get_reports()
-    else:
-        reports_df = handler.get_reports(object_type=object_type_filter)
+    selected_report_id, report = search_select(
+        "Select report to edit:",
+        handler.search_reports, 'report_id', 'title', 'description',
+        key="edit_report_select",
+        empty_message="No reports to edit.",
+        object_type=None if object_type_filter == "All" else object_type_filter,
+        user_email=user_email, is_admin=is_admin
+    )
     
-    if reports_df.empty:
-        st.info("No reports to edit.")
-    else:
-        selected_report_id = st.selectbox(
-            "Select report to edit:",
-            reports_df["report_id"].tolist(),
-            format_func=lambda x: selectbox_label(x, reports_df, 'report_id', 'title', 'description'),
-            key="edit_report_select"
-        )
-        
-        if selected_report_id:
-            report = reports_df[reports_df["report_id"] == selected_report_id].iloc[0]
+    if selected_report_id:
+        with st.form("edit_report_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write(f"**Object ID:** {report['object_id']}")
+                st.write(f"**Object Type:** {report['object_type']}")
+            with col2:
+                st.write(f"**Report ID:** {report['report_id']}")
             
-            with st.form("edit_report_form"):
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.write(f"**Object ID:** {report['object_id']}")
-                    st.write(f"**Object Type:** {report['object_type']}")
-                with col2:
-                    st.write(f"**Report ID:** {report['report_id']}")
-                
-                report_type = st.selectbox(
-                    "Report Type",
-                    ["Maintenance", "Inspection", "Repair", "Preventive", "Other"],
-                    index=["Maintenance", "Inspection", "Repair", "Preventive", "Other"].index(report["report_type"])
-                )
-                title = st.text_input("Report Title", value=report["title"])
-                description = st.text_area("Description", value=report["description"], max_chars=1000)
-                actual_meter_reading = st.number_input("Actual Meter Reading", min_value=0, value=int(report.get("actual_meter_reading") if pd.notna(report.get("actual_meter_reading")) and report.get("actual_meter_reading") is not None else 0))
-                meter_unit = st.selectbox("Meter Unit", handler.get_meter_units(), index=handler.get_meter_units().index(report.get("meter_unit")) if report.get("meter_unit") in handler.get_meter_units() else 0)
-                completion_date = st.date_input(
-                    "Completion Date",
-                    value=pd.to_datetime(report["completion_date"])
+            report_type = st.selectbox(
+                "Report Type",
+                ["Maintenance", "Inspection", "Repair", "Preventive", "Other"],
+                index=["Maintenance", "Inspection", "Repair", "Preventive", "Other"].index(report["report_type"])
+            )
+            title = st.text_input("Report Title", value=report["title"])
+            description = st.text_area("Description", value=report["description"], max_chars=1000)
+            actual_meter_reading = st.number_input("Actual Meter Reading", min_value=0, value=int(report.get("actual_meter_reading") if pd.notna(report.get("actual_meter_reading")) and report.get("actual_meter_reading") is not None else 0))
+            meter_unit = st.selectbox("Meter Unit", handler.get_meter_units(), index=handler.get_meter_units().index(report.get("meter_unit")) if report.get("meter_unit") in handler.get_meter_units() else 0)
+            completion_date = st.date_input(
+                "Completion Date",
+                value=pd.to_datetime(report["completion_date"])
+            )
+            services = handler.get_services(object_id=report["object_id"], user_email=user_email,
+                                            is_admin=is_admin, columns=("service_id", "service_name"))
+            current_service = report.get("service_id") if pd.notna(report.get("service_id")) else None
+            service_id = completes_service_select(services, current_service)
+            notes = st.text_area("Notes", value=report["notes"], max_chars=500)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                submitted = st.form_submit_button("Update Report")
+            with col2:
+                delete_btn = st.form_submit_button("Delete Report", type="secondary")
+            
+            if submitted:
+                handler.update_report(
+                    selected_report_id,
+                    report_type=report_type,
+                    title=title,
+                    description=description,
+                    completion_date=str(completion_date),
+                    notes=notes,
+                    actual_meter_reading=int(actual_meter_reading) if actual_meter_reading is not None else None,
+                    meter_unit=meter_unit,
+                    service_id=service_id
                 )
-                notes = st.text_area("Notes", value=report["notes"], max_chars=500)
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    submitted = st.form_submit_button("Update Report")
-                with col2:
-                    delete_btn = st.form_submit_button("Delete Report", type="secondary")
-                
-                if submitted:
-                    handler.update_report(
-                        selected_report_id,
-                        report_type=report_type,
-                        title=title,
-                        description=description,
-                        completion_date=str(completion_date),
-                        notes=notes,
-                        actual_meter_reading=int(actual_meter_reading) if actual_meter_reading is not None else None,
-                        meter_unit=meter_unit
-                    )
-                    st.success("✓ Report updated successfully!")
-                    st.rerun()
-                
-                if delete_btn:
-                    handler.delete_report(selected_report_id)
-                    st.success("✓ Report deleted successfully!")
-                    st.rerun()
+                st.success("✓ Report updated successfully!")
+                st.rerun()
+            
+            if delete_btn:
+                handler.delete_report(selected_report_id)
+                st.success("✓ Report deleted successfully!")
+                st.rerun()
+
+
+# Tabs for different views
+tab1, tab2, tab3 = st.tabs(["View Reports", "Add Report", "Edit Report"])
+
+with tab1:
+    view_reports_tab(object_type_filter, report_type_filter)
+
+with tab2:
+    add_report_tab(object_type_filter)
+
+with tab3:
+    edit_report_tab(object_type_filter)
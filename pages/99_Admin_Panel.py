@@ -1,6 +1,7 @@
 import streamlit as st
 import yaml
 import bcrypt
+from utils import date_column_config, page_timing, query_profiler
 from utils.data_handler import DataHandler
 from utils.state_manager import StateManager
 from streamlit_cookies_controller import CookieController
@@ -10,6 +11,7 @@ st.set_page_config(page_title="Admin Panel", layout="wide")
 cm = CookieController(key="cookies")
 StateManager.init_session_state()
 StateManager.init_and_enforce(cm)
+timer = page_timing.start(__file__)
 
 st.title("👤 Admin Panel")
 st.markdown("**Administrator Control Panel** - Manage users and view all system data")
@@ -118,27 +120,97 @@ st.info("📊 View all data across the entire system. This includes data from al
 
 handler = DataHandler()
 
+col1, col2 = st.columns([3, 1])
+with col1:
+    st.caption("Last and next service dates follow the latest report linked to each service. "
+               "Recompute them for the whole fleet after bulk imports or direct database edits; "
+               "services without linked reports keep their manually entered dates.")
+with col2:
+    if st.button("Recompute Service Schedule"):
+        changed = handler.recompute_service_schedule()
+        st.success(f"✓ {changed} service{'s' if changed != 1 else ''} rescheduled.")
+
+# The five tables are independent: load them in parallel, as Arrow-backed
+# frames since they are only displayed.
+with timer.section("Load all data"):
+    objects_df, services_df, reminders_df, reports_df, fault_reports_df = handler.get_many([
+        (name, {"is_admin": True, "arrow": True})
+        for name in ("get_objects", "get_services", "get_reminders", "get_reports", "get_fault_reports")
+    ])
+
 st.subheader("All Equipment")
 st.caption("View all equipment (vehicles, facilities, and other items) across all users.")
-objects_df = handler.get_objects(is_admin=True)
-st.dataframe(objects_df, use_container_width=True, hide_index=True)
+st.dataframe(objects_df, use_container_width=True, column_config=date_column_config(objects_df), hide_index=True)
 
 st.subheader("All Services")
 st.caption("View all scheduled service plans across all users.")
-services_df = handler.get_services(is_admin=True)
-st.dataframe(services_df, use_container_width=True, hide_index=True)
+st.dataframe(services_df, use_container_width=True, column_config=date_column_config(services_df), hide_index=True)
 
 st.subheader("All Reminders")
 st.caption("View all service reminders across all users.")
-reminders_df = handler.get_reminders(is_admin=True)
-st.dataframe(reminders_df, use_container_width=True, hide_index=True)
+st.dataframe(reminders_df, use_container_width=True, column_config=date_column_config(reminders_df), hide_index=True)
 
 st.subheader("All Reports")
 st.caption("View all completed service reports across all users.")
-reports_df = handler.get_reports(is_admin=True)
-st.dataframe(reports_df, use_container_width=True, hide_index=True)
+st.dataframe(reports_df, use_container_width=True, column_config=date_column_config(reports_df), hide_index=True)
 
 st.subheader("All Fault Reports")
 st.caption("View all fault reports with photos across all users.")
-fault_reports_df = handler.get_fault_reports(is_admin=True)
-st.dataframe(fault_reports_df, use_container_width=True, hide_index=True)
+st.dataframe(fault_reports_df, use_container_width=True, column_config=date_column_config(fault_reports_df), hide_index=True)
+
+# --- Page Timing ---
+st.markdown("---")
+st.header("Page Timing")
+st.info("⏱️ Script runs per page and the time spent in each page's timed sections (tabs, tables, "
+        "photo viewers) since this server process started. SQL is the part of a section's time "
+        "spent in database statements; the rest is pandas and rendering.")
+col1, col2 = st.columns([3, 1])
+with col1:
+    if page_timing.TRACE_FILE:
+        st.caption(f"Every timed section is also traced to {page_timing.TRACE_FILE}.")
+    else:
+        st.caption("Set MYMAINTLOG_PAGE_TRACE to a file path to trace every timed section as JSON lines.")
+with col2:
+    if st.button("Clear Page Timing"):
+        page_timing.clear()
+        st.rerun()
+
+st.subheader("Reruns per Page")
+st.dataframe(page_timing.page_runs(), use_container_width=True, hide_index=True)
+
+st.subheader("Section Timings")
+st.dataframe(page_timing.summary(), use_container_width=True, hide_index=True)
+
+# --- Query Performance ---
+st.markdown("---")
+st.header("Query Performance")
+if not query_profiler.ENABLED:
+    st.info("The SQL profiler is off (MYMAINTLOG_SQL_PROFILE=0).")
+else:
+    st.info(f"⏱️ Timings of the last {query_profiler.RING_SIZE:,} SQL statements run by this server "
+            "process, grouped by statement with literal values replaced by ?. Statements taking "
+            f"{query_profiler.SLOW_QUERY_MS:g} ms or more are also written to the slow-query log.")
+    summary_df = query_profiler.summary()
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.caption(f"{int(summary_df['calls'].sum()):,} statements recorded, "
+                   f"{summary_df['total_ms'].sum():,.0f} ms in total.")
+    with col2:
+        if st.button("Clear Query Profile"):
+            query_profiler.clear()
+            st.rerun()
+
+    st.subheader("Top Queries by Total Time")
+    st.dataframe(summary_df.head(20), use_container_width=True, hide_index=True)
+
+    st.subheader("Top Queries by p95 Time")
+    st.dataframe(summary_df.sort_values("p95_ms", ascending=False).head(20),
+                 use_container_width=True, hide_index=True)
+
+    st.subheader("Slow Queries")
+    st.caption(f"Latest entries of {query_profiler.SLOW_QUERY_LOG}, newest first.")
+    slow_df = query_profiler.slow_queries()
+    if slow_df.empty:
+        st.info("No slow queries logged.")
+    else:
+        st.dataframe(slow_df, use_container_width=True, hide_index=True)
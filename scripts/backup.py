@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Take, list, prune and restore online backups of the mymaintlog database.
+
+Snapshots are made with SQLite's online backup API, so this is safe to run
+while the app is serving requests (see utils/backup.py for details).
+
+Usage:
+    python scripts/backup.py snapshot [--incremental] [--keep N]
+    python scripts/backup.py list
+    python scripts/backup.py prune --keep N
+    python scripts/backup.py restore SNAPSHOT_NAME [--no-safety-snapshot]
+
+MYMAINTLOG_DB_PATH and MYMAINTLOG_BACKUP_DIR select the database and the
+snapshot directory (default: data/backups).
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Allow running from the project root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import backup
+
+
+def _size(path):
+    return f"{Path(path).stat().st_size / 1024:,.0f} KB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="mymaintlog database backups")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    snap = sub.add_parser("snapshot", help="take a snapshot now")
+    snap.add_argument("--incremental", action="store_true",
+                      help="store only changes since the newest snapshot")
+    snap.add_argument("--keep", type=int, default=None,
+                      help="prune to the newest N snapshots afterwards")
+
+    sub.add_parser("list", help="list snapshots")
+
+    prune = sub.add_parser("prune", help="delete old snapshots")
+    prune.add_argument("--keep", type=int, default=backup.DEFAULT_KEEP)
+
+    rest = sub.add_parser("restore", help="restore the database from a snapshot")
+    rest.add_argument("name", help="snapshot name (as shown by 'list')")
+    rest.add_argument("--no-safety-snapshot", action="store_true",
+                      help="do not snapshot the current database first")
+
+    args = parser.parse_args()
+
+    if args.command == "snapshot":
+        manifest = backup.snapshot(incremental=args.incremental)
+        print(f"Created {manifest['kind']} snapshot {manifest['name']} ({_size(manifest['path'])}).")
+        print(f"  Copied: {', '.join(manifest['copied']) or 'nothing changed'}")
+        if args.keep is not None:
+            for name in backup.prune(keep=args.keep):
+                print(f"  Pruned {name}")
+    elif args.command == "list":
+        snapshots = backup.list_snapshots()
+        if not snapshots:
+            print(f"No snapshots in {backup.BACKUP_DIR}.")
+        for manifest in snapshots:
+            print(f"{manifest['name']}  {manifest['created']}  {_size(manifest['path'])}")
+    elif args.command == "prune":
+        deleted = backup.prune(keep=args.keep)
+        for name in deleted:
+            print(f"Pruned {name}")
+        print(f"{len(deleted)} snapshot(s) deleted.")
+    elif args.command == "restore":
+        try:
+            manifest = backup.restore(args.name, safety_snapshot=not args.no_safety_snapshot)
+        except ValueError as e:
+            print(f"Restore failed: {e}")
+            sys.exit(1)
+        print(f"Database restored from {manifest['name']}.")
+
+
+if __name__ == "__main__":
+    main()
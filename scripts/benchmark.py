@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for DataHandler across dataset scales.
+
+Each scale's dataset is built fresh with scripts/generate_fleet.py (same
+seed and anchor date every run, so runs are comparable), then every case
+below is timed: reads, writes, photo save/load, exports, the bulk jobs and
+delete_user_data.  Reads run on a non-memoising handler, so they measure
+SQLite and pandas rather than the per-rerun memo.
+
+Per case the runner records latency percentiles (p50/p95/p99), the peak
+Python memory of one extra call (tracemalloc, which also sees NumPy and
+pandas buffers) and rows per second at the median.  Every run is appended
+to a JSON history and compared with a committed baseline; a case whose
+median or peak memory grew by more than --threshold is reported as a
+regression and the script exits with status 1.
+
+Usage:
+    python scripts/benchmark.py [--scales S M] [--repeat N] [--threshold 0.3]
+                                [--history PATH] [--baseline PATH]
+                                [--update-baseline] [--only SUBSTRING]
+
+Baselines are machine-specific: refresh benchmarks/baseline.json with
+--update-baseline when the reference machine changes, and commit it.
+"""
+import argparse
+import json
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+
+# Allow running from the project root
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scripts import generate_fleet
+from utils.data_handler import DataHandler
+
+BENCH_DIR = ROOT / "benchmarks"
+HISTORY_PATH = BENCH_DIR / "history.json"
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+
+# Fixed dataset parameters, so every run measures the same data.
+SEED = 42
+ANCHOR = date(2026, 1, 1)
+
+# Regressions smaller than these absolute amounts are treated as noise.
+MIN_DELTA_MS = 0.5
+MIN_DELTA_KIB = 256
+
+PHOTO = generate_fleet._png(np.random.default_rng(SEED), 24)
+
+
+def _rows(result):
+    """Rows produced by a case: DataFrame/list length, an int count, or 1."""
+    if isinstance(result, (bool, str)) or result is None:
+        return 1
+    if isinstance(result, int):
+        return result
+    return len(result)
+
+
+def _drain(chunks):
+    return sum(chunk.count("\n") for chunk in chunks)
+
+
+# name -> (kind, fn(handler, ctx, i)).  Cases run in this order; writes come
+# after reads, and delete_user_data last, so earlier cases see the
+# generated data unchanged.
+CASES = {
+    "get_objects[all]": ("read", lambda h, c, i: h.get_objects(is_admin=True)),
+    "get_objects[user]": ("read", lambda h, c, i: h.get_objects(user_email=c["user"])),
+    "get_object_summary[all]": ("read", lambda h, c, i: h.get_object_summary(is_admin=True)),
+    "get_services[all]": ("read", lambda h, c, i: h.get_services(is_admin=True)),
+    "get_services[object]": ("read", lambda h, c, i: h.get_services(object_id=c["object_id"], is_admin=True)),
+    "get_services_due[30d]": ("read", lambda h, c, i: h.get_services_due(is_admin=True, within_days=30,
+                                                                         today=ANCHOR)),
+    "get_service_forecasts[all]": ("read", lambda h, c, i: h.get_service_forecasts(is_admin=True)),
+    "get_reminders[all]": ("read", lambda h, c, i: h.get_reminders(is_admin=True)),
+    "get_reminders_due[overdue]": ("read", lambda h, c, i: h.get_reminders_due(
+        status="Pending", is_admin=True, within_days=-1, today=ANCHOR)),
+    "get_reports[all]": ("read", lambda h, c, i: h.get_reports(is_admin=True)),
+    "get_reports[object]": ("read", lambda h, c, i: h.get_reports(object_id=c["object_id"], is_admin=True)),
+    "get_fault_reports[all]": ("read", lambda h, c, i: h.get_fault_reports(is_admin=True)),
+    "get_meter_readings[object]": ("read", lambda h, c, i: h.get_meter_readings(object_id=c["object_id"],
+                                                                               is_admin=True)),
+    "search_objects[prefix]": ("read", lambda h, c, i: h.search_objects("VEH-00", is_admin=True)),
+    "search_reports[text]": ("read", lambda h, c, i: h.search_reports("inspection", is_admin=True)),
+    "search_text[word]": ("read", lambda h, c, i: h.search_text("hydraulic", is_admin=True)),
+    "get_fault_photos": ("read", lambda h, c, i: h.get_fault_photos(c["fault_id"])),
+    "iter_csv[reports]": ("read", lambda h, c, i: _drain(h.iter_csv("reports", is_admin=True))),
+    "add_object": ("write", lambda h, c, i: h.add_object("Vehicle", f"Bench {i}", user_email=c["user"])),
+    "update_object": ("write", lambda h, c, i: h.update_object(c["object_id"], description=f"rev {i}")),
+    "add_service": ("write", lambda h, c, i: h.add_service(c["object_id"], c["object_type"], f"Bench {i}", 90,
+                                                            user_email=c["user"])),
+    "update_service": ("write", lambda h, c, i: h.update_service(c["service_id"], interval_days=60 + i % 2)),
+    "add_reminder": ("write", lambda h, c, i: h.add_reminder(c["service_id"], c["object_id"], c["object_type"],
+                                                             ANCHOR, user_email=c["user"])),
+    "update_reminder": ("write", lambda h, c, i: h.update_reminder(c["reminder_id"], notes=f"rev {i}")),
+    "add_report[completes service]": ("write", lambda h, c, i: h.add_report(
+        c["object_id"], c["object_type"], "Maintenance", f"Bench {i}", completion_date=ANCHOR,
+        actual_meter_reading=10 ** 6 + i, meter_unit="km", user_email=c["user"], service_id=c["service_id"])),
+    "update_report": ("write", lambda h, c, i: h.update_report(c["report_id"], notes=f"rev {i}")),
+    "add_fault_report": ("write", lambda h, c, i: h.add_fault_report(
+        c["object_id"], c["object_type"], ANCHOR, 10 ** 6 + i, "km", f"Bench fault {i}", user_email=c["user"])),
+    "save_fault_photo": ("write", lambda h, c, i: h.save_fault_photo(c["fault_id"], f"bench{i}.png",
+                                                                     "image/png", PHOTO)),
+    "generate_reminders": ("write", lambda h, c, i: h.generate_reminders(is_admin=True, today=ANCHOR)),
+    "recompute_service_schedule": ("write", lambda h, c, i: h.recompute_service_schedule()),
+    "refresh_usage_forecasts": ("write", lambda h, c, i: h.refresh_usage_forecasts()),
+    "delete_user_data": ("write", lambda h, c, i: h.delete_user_data(c["users"][i % len(c["users"])])),
+}
+
+
+def _context(db_path):
+    """Sample IDs the cases operate on: the busiest object and its records."""
+    conn = sqlite3.connect(db_path)
+    try:
+        object_id, object_type, user = conn.execute(
+            "SELECT o.object_id, o.object_type, o.user_email FROM object_summary s "
+            "JOIN objects o USING (object_id) ORDER BY s.services DESC, o.object_id LIMIT 1"
+        ).fetchone()
+
+        def first(sql):
+            row = conn.execute(sql, (object_id,)).fetchone()
+            return row[0] if row else None
+
+        return {
+            "object_id": object_id, "object_type": object_type, "user": user,
+            "service_id": first("SELECT service_id FROM services WHERE object_id = ? ORDER BY 1"),
+            "reminder_id": first("SELECT reminder_id FROM reminders WHERE object_id = ? ORDER BY 1"),
+            "report_id": first("SELECT report_id FROM reports WHERE object_id = ? ORDER BY 1"),
+            "fault_id": conn.execute(
+                "SELECT fault_id FROM fault_photos GROUP BY fault_id ORDER BY COUNT(*) DESC, 1 LIMIT 1"
+            ).fetchone()[0],
+            # Users other than the sample one, deleted one per delete_user_data call.
+            "users": [r[0] for r in conn.execute(
+                "SELECT DISTINCT user_email FROM objects WHERE user_email <> ? ORDER BY 1 DESC", (user,))],
+        }
+    finally:
+        conn.close()
+
+
+def _measure(fn, handler, ctx, repeat):
+    """Time *repeat* calls after one warm-up, then one traced call for memory."""
+    fn(handler, ctx, 0)
+    times, rows = [], 0
+    for i in range(1, repeat + 1):
+        started = time.perf_counter()
+        rows = _rows(fn(handler, ctx, i))
+        times.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        fn(handler, ctx, repeat + 1)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    ms = np.asarray(times) * 1000
+    p50 = float(np.percentile(ms, 50))
+    return {
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+        "rows": rows,
+        "rows_per_s": round(rows / (p50 / 1000), 1) if p50 > 0 else None,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_scale(scale, repeat, only=None):
+    """Build the *scale* dataset in a temporary directory and run every case."""
+    with tempfile.TemporaryDirectory(prefix="mymaintlog-bench-") as tmp:
+        db_path = Path(tmp) / f"bench-{scale}.db"
+        started = time.perf_counter()
+        generate_fleet.build(db_path, scale, SEED, ANCHOR)
+        print(f"[{scale}] dataset built in {time.perf_counter() - started:.1f}s")
+        ctx = _context(db_path)
+        handler = DataHandler(str(db_path), memoize=False)
+        results = {}
+        for name, (kind, fn) in CASES.items():
+            if only and only not in name:
+                continue
+            runs = repeat
+            if name == "delete_user_data":
+                # Each call needs a user with data left: warm-up, timed and traced calls.
+                runs = min(repeat, len(ctx["users"]) - 2)
+                if runs < 1:
+                    print(f"[{scale}] {name:<32} skipped: too few users at this scale")
+                    continue
+            results[name] = {"kind": kind, **_measure(fn, handler, ctx, runs)}
+            r = results[name]
+            print(f"[{scale}] {name:<32} p50 {r['p50_ms']:>9.2f} ms  p95 {r['p95_ms']:>9.2f} ms  "
+                  f"{r['rows']:>8} rows  {r['peak_kib']:>10,.0f} KiB")
+        return results
+
+
+def compare(current, baseline, threshold):
+    """Return regression messages for *current* against *baseline* results."""
+    regressions = []
+    for scale, cases in current.items():
+        for name, r in cases.items():
+            base = baseline.get(scale, {}).get(name)
+            if not base:
+                continue
+            if (r["p50_ms"] > base["p50_ms"] * (1 + threshold)
+                    and r["p50_ms"] - base["p50_ms"] > MIN_DELTA_MS):
+                regressions.append(f"[{scale}] {name}: p50 {base['p50_ms']:.2f} -> {r['p50_ms']:.2f} ms")
+            if (r["peak_kib"] > base["peak_kib"] * (1 + threshold)
+                    and r["peak_kib"] - base["peak_kib"] > MIN_DELTA_KIB):
+                regressions.append(f"[{scale}] {name}: peak {base['peak_kib']:,.0f} -> "
+                                   f"{r['peak_kib']:,.0f} KiB")
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DataHandler micro-benchmarks")
+    parser.add_argument("--scales", nargs="+", choices=list(generate_fleet.SCALES), default=["S", "M"])
+    parser.add_argument("--repeat", type=int, default=20, help="timed calls per case (default: %(default)s)")
+    parser.add_argument("--threshold", type=float, default=0.3,
+                        help="relative growth reported as a regression (default: %(default)s)")
+    parser.add_argument("--history", type=Path, default=HISTORY_PATH)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store this run as the new baseline instead of comparing")
+    parser.add_argument("--only", help="run only cases whose name contains this text")
+    args = parser.parse_args()
+
+    run = {
+        "run_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "machine": platform.platform(),
+        "repeat": args.repeat,
+        "results": {scale: run_scale(scale, args.repeat, args.only) for scale in args.scales},
+    }
+
+    args.history.parent.mkdir(parents=True, exist_ok=True)
+    history = json.loads(args.history.read_text()) if args.history.exists() else []
+    history.append(run)
+    args.history.write_text(json.dumps(history, indent=1) + "\n")
+    print(f"Appended run to {args.history}")
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(run, indent=1) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(run["results"], baseline["results"], args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) against baseline {baseline.get('commit')}:")
+        for message in regressions:
+            print(f"  {message}")
+        sys.exit(1)
+    print(f"No regressions against baseline {baseline.get('commit')} (threshold {args.threshold:.0%}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Query plan guard for DataHandler's read paths.
+
+Runs every filter combination of the get_* methods (plus the photo and
+search lookups) against a seeded database, captures each SQL statement
+DataHandler sends to SQLite and runs ``EXPLAIN QUERY PLAN`` on it.  A
+statement that scans a whole table where the call was narrowed by any
+filter – object type, object, status, date window or a non-admin user –
+fails the check: those are the hot paths the indexes exist for, and a
+changed WHERE clause that no longer matches one silently falls back to
+a full scan.  Unfiltered admin listings read whole tables by design and
+are only reported with --verbose; so are index walks cut short by a
+LIMIT, the usage_dirty work queue and the allowlisted substring fallbacks
+of the search_* selectors (SUBSTRING_SEARCHES).
+
+Usage:
+    python scripts/check_query_plans.py [--scale S|M|L|XL | --db PATH] [--verbose]
+
+Without --db a fresh dataset is built with scripts/generate_fleet.py in a
+temporary directory.  Exits with status 1 if any hot-path query scans.
+"""
+import argparse
+import itertools
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+# Allow running from the project root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+SEED = 42
+
+TYPES = (None, "Vehicle")
+OBJECT = (None, "{object_id}")
+
+# method -> {keyword: values}; every combination is run both as a regular
+# user and as an admin.  "{name}" values come from the sample records.
+CASES = {
+    "get_objects": {"object_type": TYPES},
+    "get_object_summary": {"object_type": TYPES, "status": (None, "Active")},
+    "count_records": {},
+    "get_services": {"object_type": TYPES, "object_id": OBJECT},
+    "get_services_due": {"object_type": TYPES, "within_days": (None, 30), "limit": (None, 10)},
+    "get_service_forecasts": {"object_type": TYPES, "object_id": OBJECT},
+    "get_reminders": {"object_type": TYPES, "object_id": OBJECT, "status": (None, "Pending")},
+    "get_reminders_due": {"object_type": TYPES, "status": (None, "Pending"),
+                          "within_days": (None, 30), "limit": (None, 10)},
+    "get_reports": {"object_type": TYPES, "object_id": OBJECT},
+    "get_fault_reports": {"object_type": TYPES, "object_id": OBJECT, "limit": (None, 10)},
+    "get_meter_readings": {"object_id": OBJECT},
+    "get_usage_forecasts": {"object_id": OBJECT},
+    "search_objects": {"query": ("", "{object_id}"), "object_type": TYPES},
+    "search_services": {"query": ("", "{service_id}"), "object_type": TYPES},
+    "search_reminders": {"query": ("", "{reminder_id}"), "object_type": TYPES},
+    "search_reports": {"query": ("", "{report_id}"), "object_type": TYPES},
+    "search_fault_reports": {"query": ("", "{fault_id}"), "object_type": TYPES},
+    "iter_fault_photos": {},
+}
+# Calls without a user scope.
+UNSCOPED = {
+    "get_fault_photos": {"fault_id": ("{fault_id}",)},
+}
+
+# "SCAN objects", "SCAN o USING INDEX ...", but not "SCAN CONSTANT ROW",
+# subqueries/CTEs or FTS virtual tables (which have their own index).
+_SCAN = re.compile(r"^SCAN (\w+)(?! VIRTUAL TABLE)")
+# Work queues that are drained whole (refresh_usage_forecasts).
+QUEUE_TABLES = {"usage_dirty"}
+# Methods whose LIKE '%query%' fallback may scan.  A substring match cannot
+# use a b-tree index; the fallback only runs when the ID-prefix range lookup
+# found fewer than SEARCH_LIMIT rows, and user-scoped calls read just the
+# user's rows through the user_email indexes.  Only an admin's unscoped
+# selector walks the whole table, which search-as-you-type accepts; the
+# indexed free-text path is the Search page's full-text index.
+SUBSTRING_SEARCHES = {"search_objects", "search_services", "search_reminders",
+                      "search_reports", "search_fault_reports"}
+
+
+def _full_scans(sql, plan):
+    """Plan lines that read a whole table.
+
+    A walk along an index in ORDER BY order is bounded when the statement
+    has a LIMIT and no LIKE predicate (the "soonest N" queries stop after N
+    rows).  With a LIKE the walk only stops after N matches, which can mean
+    the whole table when matches are rare.
+    """
+    bounded = (re.search(r"\bLIMIT\s+\d+\s*$", sql, re.IGNORECASE)
+               and not re.search(r"\bLIKE\b", sql, re.IGNORECASE))
+    return [
+        detail for detail in plan
+        if (m := _SCAN.match(detail)) and m.group(1) not in QUEUE_TABLES
+        and not (bounded and " USING " in detail)
+    ]
+
+
+def _recorder(db_path):
+    """A DataHandler that records every statement it executes."""
+    from utils.data_handler import DataHandler
+
+    class Recorder(DataHandler):
+        statements = []
+
+        def _read_conn(self):
+            conn = super()._read_conn()
+            # Called with the SQL as executed, parameters already bound.
+            conn.set_trace_callback(self.statements.append)
+            return conn
+
+    return Recorder(str(db_path), memoize=False)
+
+
+def _samples(conn):
+    """IDs of records owned by the user with the most objects."""
+    user = conn.execute(
+        "SELECT user_email FROM objects GROUP BY user_email ORDER BY COUNT(*) DESC, 1 LIMIT 1"
+    ).fetchone()[0]
+    samples = {"user_email": user}
+    for table, id_col in [("objects", "object_id"), ("services", "service_id"),
+                          ("reminders", "reminder_id"), ("reports", "report_id"),
+                          ("fault_reports", "fault_id")]:
+        row = conn.execute(f"SELECT {id_col} FROM {table} WHERE user_email = ? ORDER BY 1 LIMIT 1",
+                           (user,)).fetchone()
+        samples[id_col] = row[0] if row else ""
+    return samples
+
+
+def _calls(samples):
+    """Yield (label, method name, kwargs, filtered) for every case."""
+    for name, scoped in [*((n, True) for n in CASES), *((n, False) for n in UNSCOPED)]:
+        options = (CASES if scoped else UNSCOPED)[name]
+        scopes = ({"user_email": samples["user_email"]}, {"is_admin": True}) if scoped else ({},)
+        for values in itertools.product(*options.values()):
+            kwargs = {k: v.format(**samples) if isinstance(v, str) else v
+                      for k, v in zip(options, values)}
+            for scope in scopes:
+                call = {**kwargs, **scope}
+                filtered = any(v not in (None, "", True) for v in call.values())
+                args = ", ".join(f"{k}={v!r}" for k, v in call.items())
+                yield f"{name}({args})", name, call, filtered
+
+
+def _plan(conn, sql):
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def check(db_path, verbose=False):
+    """Return the hot-path statements whose plan scans a table."""
+    handler = _recorder(db_path)
+    conn = sqlite3.connect(db_path)
+    failures = []
+    try:
+        samples = _samples(conn)
+        for label, name, kwargs, filtered in _calls(samples):
+            handler.statements.clear()
+            result = getattr(handler, name)(**kwargs)
+            if name.startswith("iter_"):
+                list(result)
+            for sql in handler.statements:
+                if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+                    continue
+                plan = _plan(conn, sql)
+                scans = _full_scans(sql, plan)
+                allowed = name in SUBSTRING_SEARCHES and re.search(r"\bLIKE\b", sql)
+                if scans and filtered and not allowed:
+                    failures.append((label, sql, plan))
+                if verbose:
+                    status = "SCAN" if scans else "ok"
+                    note = ("" if not scans else " (substring fallback)" if allowed
+                            else "" if filtered else " (unfiltered listing)")
+                    print(f"{status:<5}{label}{note}")
+                    for detail in plan:
+                        print(f"       {detail}")
+    finally:
+        conn.close()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if a filtered DataHandler query scans a table")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--scale", default="S", help="dataset built for the check (default: %(default)s)")
+    source.add_argument("--db", type=Path, help="use an existing database instead")
+    parser.add_argument("--verbose", action="store_true", help="print every query plan")
+    args = parser.parse_args()
+
+    tmp = None
+    if args.db:
+        db_path = args.db
+    else:
+        tmp = tempfile.TemporaryDirectory(prefix="mymaintlog-plans-")
+        db_path = Path(tmp.name) / f"plans-{args.scale}.db"
+        os.environ.setdefault("MYMAINTLOG_DB_PATH", str(db_path))
+        from scripts import generate_fleet
+        generate_fleet.build(db_path, args.scale, SEED, date.today())
+
+    failures = check(db_path, args.verbose)
+    if tmp is not None:
+        tmp.cleanup()
+    for label, sql, plan in failures:
+        print(f"FULL SCAN in {label}\n  {sql}")
+        for detail in plan:
+            print(f"    {detail}")
+    print(f"{len(failures)} hot-path quer{'y' if len(failures) == 1 else 'ies'} with a full table scan")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""Generate a synthetic fleet database for scale testing.
+
+Populates a fresh mymaintlog database with objects, services, reminders,
+service reports, fault reports and photo BLOBs at one of the sizes below.
+The data is deterministic: the same --seed and --today always produce the
+same database.  Distributions are meant to look like a real fleet – mostly
+vehicles, a few busy objects with many services, meter readings that grow
+at a per-object rate, service dates that follow the interval with ~10 %
+overdue, and reports that line up with their services' history.
+
+Rows are written with executemany() in a single transaction while the
+schema's triggers are dropped; the derived tables (search index, meter
+readings, object summary) are then rebuilt in bulk by DataHandler when it
+reopens the database, so even XL builds in seconds rather than minutes.
+
+Usage:
+    python scripts/generate_fleet.py [--scale S|M|L|XL] [--seed N] [--db PATH]
+                                     [--today YYYY-MM-DD] [--photo-kb N] [--force]
+
+The database is written to data/fleet-<scale>.db unless --db is given; run
+the app against it with MYMAINTLOG_DB_PATH=<path>.  Objects belong to
+userNNNN@example.com accounts, so log in as an admin to see all of them.
+"""
+import argparse
+import struct
+import sys
+import time
+import zlib
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+# Allow running from the project root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.data_handler import DATA_DIR, DataHandler
+
+SCALES = {
+    "S": dict(objects=100, services=1_000, reminders=1_000, reports=2_000, faults=500, photos=500),
+    "M": dict(objects=1_000, services=10_000, reminders=10_000, reports=20_000, faults=5_000,
+              photos=5_000),
+    "L": dict(objects=5_000, services=50_000, reminders=50_000, reports=100_000, faults=25_000,
+              photos=25_000),
+    "XL": dict(objects=10_000, services=100_000, reminders=100_000, reports=200_000, faults=50_000,
+               photos=50_000),
+}
+
+# Days of history generated before --today.
+HISTORY_DAYS = 730
+
+# Objects per user account.
+OBJECTS_PER_USER = 50
+
+# Distinct photo BLOBs generated and reused across fault photos.
+PHOTO_POOL = 32
+
+OBJECT_TYPES = {
+    # type: (share, names, meter unit, median usage per day)
+    "Vehicle": (0.60, ["Volvo FH", "Scania R", "MAN TGX", "Mercedes Actros", "Ford Transit",
+                       "VW Crafter", "Toyota Hilux", "Caterpillar 320"], "km", 150.0),
+    "Facility": (0.25, ["Warehouse", "Workshop", "Office", "Depot", "Cold Store"], "kWh", 300.0),
+    "Other": (0.15, ["Generator", "Compressor", "Forklift", "Pressure Washer", "Trailer"], "km", 20.0),
+}
+OBJECT_STATUSES = (["Active", "Maintenance", "Inactive"], [0.80, 0.12, 0.08])
+SERVICE_NAMES = ["Oil change", "Brake inspection", "Tyre rotation", "Annual inspection",
+                 "Filter replacement", "HVAC service", "Fire safety check", "Battery check"]
+SERVICE_INTERVALS = ([30, 90, 180, 365], [0.20, 0.35, 0.25, 0.20])
+SERVICE_STATUSES = (["Scheduled", "Pending", "In Progress", "Completed"], [0.70, 0.10, 0.05, 0.15])
+REPORT_TYPES = (["Maintenance", "Inspection", "Repair", "Preventive", "Other"],
+                [0.40, 0.25, 0.15, 0.15, 0.05])
+FAULT_COMPONENTS = ["hydraulic pump", "brake pad", "coolant hose", "alternator", "door seal",
+                    "heating unit", "ventilation fan", "fuel injector", "battery", "roof drain"]
+FAULT_SYMPTOMS = ["leaking", "worn", "noisy", "cracked", "not starting", "overheating",
+                  "vibrating", "intermittent"]
+
+
+def _png(rng, kb):
+    """Return an RGB noise PNG of roughly *kb* KiB (noise does not compress)."""
+    side = max(8, int((kb * 1024 / 3) ** 0.5))
+    pixels = rng.integers(0, 256, size=(side, side * 3), dtype=np.uint8)
+    raw = b"".join(b"\x00" + row.tobytes() for row in pixels)
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", side, side, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 1))
+            + chunk(b"IEND", b""))
+
+
+def _iso(days):
+    """ISO dates for an array of day ordinals."""
+    return [date.fromordinal(int(d)).isoformat() for d in days]
+
+
+def _pick(rng, choices, n):
+    values, weights = choices
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=n, p=weights)]
+
+
+def generate(conn, counts, seed, today, photo_kb):
+    """Insert a synthetic fleet through *conn*.  Returns {table: rows}."""
+    rng = np.random.default_rng(seed)
+    t0 = today.toordinal()
+    start = t0 - HISTORY_DAYS
+    stamp = f"{today.isoformat()} 08:00:00"
+
+    # --- Objects ---------------------------------------------------------
+    n_obj = counts["objects"]
+    type_names = list(OBJECT_TYPES)
+    obj_type_idx = rng.choice(len(type_names), size=n_obj, p=[OBJECT_TYPES[t][0] for t in type_names])
+    obj_type = np.asarray(type_names, dtype=object)[obj_type_idx]
+    obj_ids, obj_names = [], []
+    per_type = {t: 0 for t in type_names}
+    for i, t in enumerate(obj_type):
+        per_type[t] += 1
+        obj_ids.append(f"{t[:3].upper()}-{per_type[t]:04d}")
+        names = OBJECT_TYPES[t][1]
+        obj_names.append(f"{names[i % len(names)]} #{per_type[t]}")
+    obj_ids = np.asarray(obj_ids, dtype=object)
+    obj_user = np.asarray([f"user{i // OBJECTS_PER_USER + 1:04d}@example.com" for i in range(n_obj)],
+                          dtype=object)
+    obj_status = _pick(rng, OBJECT_STATUSES, n_obj)
+    obj_unit = np.asarray([OBJECT_TYPES[t][2] for t in obj_type], dtype=object)
+    # Meter model: reading = base + rate * (day - start), rate log-normal per object.
+    obj_rate = np.asarray([OBJECT_TYPES[t][3] for t in obj_type]) * rng.lognormal(0.0, 0.5, n_obj)
+    obj_base = rng.uniform(0, 200_000, n_obj).round()
+    # Some objects are much busier than others.
+    obj_weight = rng.gamma(2.0, size=n_obj)
+    obj_weight /= obj_weight.sum()
+    created = _iso(start - rng.integers(0, 365, n_obj))
+
+    def reading(obj, day):
+        noise = rng.normal(1.0, 0.01, len(obj))
+        return (obj_base[obj] + obj_rate[obj] * (day - start) * noise).round().astype(np.int64)
+
+    conn.executemany(
+        "INSERT INTO objects (object_id, object_type, name, description, status, created_date, "
+        "last_updated, user_email) VALUES (?,?,?,?,?,?,?,?)",
+        zip(obj_ids, obj_type, obj_names,
+            [f"Synthetic {t.lower()} for scale testing" for t in obj_type],
+            obj_status, [f"{d} 08:00:00" for d in created], [stamp] * n_obj, obj_user),
+    )
+
+    # --- Services --------------------------------------------------------
+    n_svc = counts["services"]
+    svc_obj = rng.choice(n_obj, size=n_svc, p=obj_weight)
+    svc_interval = _pick(rng, SERVICE_INTERVALS, n_svc).astype(np.int64)
+    # Last service somewhere in the past interval, ~10 % of services overdue.
+    svc_last = t0 - (rng.uniform(0, 1.1, n_svc) * svc_interval).astype(np.int64)
+    svc_next = svc_last + svc_interval
+    svc_ids = np.asarray([f"SVC-{i + 1:05d}" for i in range(n_svc)], dtype=object)
+    svc_name = np.asarray(SERVICE_NAMES, dtype=object)[rng.integers(0, len(SERVICE_NAMES), n_svc)]
+    svc_expected = reading(svc_obj, svc_next).astype(float)
+    svc_expected = np.where(rng.random(n_svc) < 0.6, np.round(svc_expected, -3), np.nan)
+    conn.executemany(
+        "INSERT INTO services (service_id, object_id, object_type, service_name, description, "
+        "interval_days, last_service_date, next_service_date, status, notes, created_date, "
+        "expected_meter_reading, meter_unit, user_email) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+        zip(svc_ids, obj_ids[svc_obj], obj_type[svc_obj], svc_name,
+            [f"{name} every {days} days" for name, days in zip(svc_name, svc_interval)],
+            svc_interval.tolist(), _iso(svc_last), _iso(svc_next),
+            _pick(rng, SERVICE_STATUSES, n_svc), [""] * n_svc,
+            [f"{created[i]} 08:00:00" for i in svc_obj],
+            [None if np.isnan(v) else float(v) for v in svc_expected],
+            obj_unit[svc_obj], obj_user[svc_obj]),
+    )
+
+    # --- Reminders: at most one per service, dated a lead time before it --
+    n_rem = min(counts["reminders"], n_svc)
+    rem_svc = np.sort(rng.permutation(n_svc)[:n_rem])
+    rem_date = svc_next[rem_svc] - rng.choice([3, 7, 14], size=n_rem)
+    past = rem_date < t0
+    rem_status = np.where(past & (rng.random(n_rem) < 0.85), "Completed", "Pending")
+    rem_email = rng.random(n_rem) < 0.3
+    conn.executemany(
+        "INSERT INTO reminders (reminder_id, service_id, object_id, object_type, reminder_date, "
+        "status, notes, created_date, user_email, email_notification, notification_time, "
+        "email_sent, due_date) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)",
+        zip([f"REM-{i + 1:05d}" for i in range(n_rem)], svc_ids[rem_svc],
+            obj_ids[svc_obj[rem_svc]], obj_type[svc_obj[rem_svc]], _iso(rem_date),
+            rem_status.tolist(), [f"Reminder for {n}" for n in svc_name[rem_svc]], [stamp] * n_rem,
+            obj_user[svc_obj[rem_svc]], rem_email.astype(int).tolist(), ["09:00"] * n_rem,
+            (rem_email & past).astype(int).tolist(), _iso(svc_next[rem_svc])),
+    )
+
+    # --- Reports: 60 % complete a service, one interval apart backwards ---
+    n_rep = counts["reports"]
+    n_linked = int(n_rep * 0.6)
+    rep_svc = np.sort(rng.choice(n_svc, size=n_linked, p=obj_weight[svc_obj] / obj_weight[svc_obj].sum()))
+    nth = np.arange(n_linked) - np.searchsorted(rep_svc, rep_svc, side="left")
+    linked_day = svc_last[rep_svc] - nth * svc_interval[rep_svc]
+    in_history = linked_day >= start
+    rep_svc, linked_day = rep_svc[in_history], linked_day[in_history]
+    n_free = n_rep - len(rep_svc)
+    rep_obj = np.concatenate([svc_obj[rep_svc], rng.choice(n_obj, size=n_free, p=obj_weight)])
+    rep_day = np.concatenate([linked_day, rng.integers(start, t0 + 1, n_free)])
+    rep_service = list(svc_ids[rep_svc]) + [None] * n_free
+    rep_title = [f"{n} completed" for n in svc_name[rep_svc]] + \
+        [f"Work order {i + 1}" for i in range(n_free)]
+    rep_type = _pick(rng, REPORT_TYPES, n_rep)
+    conn.executemany(
+        "INSERT INTO reports (report_id, object_id, object_type, report_type, title, description, "
+        "completion_date, notes, created_date, actual_meter_reading, meter_unit, user_email, "
+        "service_id) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)",
+        zip([f"REP-{i + 1:05d}" for i in range(n_rep)], obj_ids[rep_obj], obj_type[rep_obj],
+            rep_type, rep_title, [f"{t} work carried out on site" for t in rep_type],
+            _iso(rep_day), [""] * n_rep, [f"{d} 16:00:00" for d in _iso(rep_day)],
+            reading(rep_obj, rep_day).tolist(), obj_unit[rep_obj], obj_user[rep_obj], rep_service),
+    )
+
+    # --- Fault reports and photos -----------------------------------------
+    n_flt = counts["faults"]
+    flt_obj = rng.choice(n_obj, size=n_flt, p=obj_weight)
+    flt_day = rng.integers(start, t0 + 1, n_flt)
+    flt_ids = np.asarray([f"FLT-{i + 1:05d}" for i in range(n_flt)], dtype=object)
+    component = np.asarray(FAULT_COMPONENTS, dtype=object)[rng.integers(0, len(FAULT_COMPONENTS), n_flt)]
+    symptom = np.asarray(FAULT_SYMPTOMS, dtype=object)[rng.integers(0, len(FAULT_SYMPTOMS), n_flt)]
+    conn.executemany(
+        "INSERT INTO fault_reports (fault_id, object_id, object_type, observation_date, "
+        "actual_meter_reading, meter_unit, description, photo_paths, created_date, user_email) "
+        "VALUES (?,?,?,?,?,?,?,?,?,?)",
+        zip(flt_ids, obj_ids[flt_obj], obj_type[flt_obj], _iso(flt_day),
+            reading(flt_obj, flt_day).tolist(), obj_unit[flt_obj],
+            [f"{c.capitalize()} {s}" for c, s in zip(component, symptom)], [""] * n_flt,
+            [f"{d} 12:00:00" for d in _iso(flt_day)], obj_user[flt_obj]),
+    )
+
+    n_pho = counts["photos"] if n_flt else 0
+    pool = [_png(rng, photo_kb) for _ in range(min(PHOTO_POOL, n_pho))]
+    pho_flt = np.sort(rng.choice(n_flt, size=n_pho)) if n_pho else np.empty(0, dtype=np.int64)
+    conn.executemany(
+        "INSERT INTO fault_photos (photo_id, fault_id, filename, mime_type, data) VALUES (?,?,?,?,?)",
+        ((f"PHO-{i + 1:05d}", flt_ids[f], f"IMG_{i + 1:05d}.png", "image/png", pool[i % len(pool)])
+         for i, f in enumerate(pho_flt)),
+    )
+
+    return {"objects": n_obj, "services": n_svc, "reminders": n_rem, "reports": n_rep,
+            "fault_reports": n_flt, "fault_photos": n_pho}
+
+
+def build(db_path, scale="S", seed=42, today=None, photo_kb=24):
+    """Create the fleet database at *db_path* (which must not exist yet).
+
+    Returns {table: rows inserted}.  Also used by scripts/benchmark.py.
+    """
+    handler = DataHandler(str(db_path), memoize=False)
+    conn = handler._get_conn()
+    conn.isolation_level = None
+    try:
+        conn.execute("BEGIN")
+        # Triggers maintain the derived tables and indexes are updated row
+        # by row; drop both for the bulk load.  DataHandler recreates every
+        # index and trigger, and rebuilds the derived tables in one pass
+        # each, when it reopens the database.
+        dropped = conn.execute(
+            "SELECT type, name FROM sqlite_master "
+            "WHERE type = 'trigger' OR (type = 'index' AND sql IS NOT NULL)"
+        ).fetchall()
+        for kind, name in dropped:
+            conn.execute(f'DROP {kind.upper()} "{name}"')
+        # Have the derived tables backfilled again on reopening.
+        conn.execute("PRAGMA user_version = 0")
+        rows = generate(conn, SCALES[scale], seed, today or date.today(), photo_kb)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+    DataHandler(str(db_path), memoize=False).refresh_usage_forecasts()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic mymaintlog fleet database")
+    parser.add_argument("--scale", choices=list(SCALES), default="S")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", help="database file (default: data/fleet-<scale>.db)")
+    parser.add_argument("--today", type=date.fromisoformat, default=date.today(),
+                        help="anchor date the history is generated around (default: today)")
+    parser.add_argument("--photo-kb", type=int, default=24, help="approximate size of each photo")
+    parser.add_argument("--force", action="store_true", help="overwrite an existing database")
+    args = parser.parse_args()
+
+    db_path = Path(args.db) if args.db else DATA_DIR / f"fleet-{args.scale.lower()}.db"
+    if db_path.exists():
+        if not args.force:
+            sys.exit(f"{db_path} already exists; pass --force to overwrite it.")
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    rows = build(db_path, args.scale, args.seed, args.today, args.photo_kb)
+    finished = time.perf_counter()
+
+    for table, count in rows.items():
+        print(f"  {table:<14} {count:>9,}")
+    print(f"Wrote {db_path} ({db_path.stat().st_size / 2**20:,.1f} MiB) in {finished - started:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
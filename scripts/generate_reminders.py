@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Generate reminders for all services coming due.
+
+Creates one reminder per service due within --within days, dated --lead
+days before the service.  Services that already have a reminder for their
+current due date are skipped, so the script can be run from cron as often
+as wanted (the app can also do this itself, see utils/reminder_scheduler.py).
+
+Usage:
+    python scripts/generate_reminders.py [--lead DAYS] [--within DAYS] [--email]
+
+MYMAINTLOG_DB_PATH selects the database.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Allow running from the project root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import reminder_scheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate mymaintlog service reminders")
+    parser.add_argument("--lead", type=int, default=reminder_scheduler.DEFAULT_LEAD_DAYS,
+                        help="days before the service date to remind (default: %(default)s)")
+    parser.add_argument("--within", type=int, default=reminder_scheduler.DEFAULT_WITHIN_DAYS,
+                        help="only services due within this many days (default: %(default)s)")
+    parser.add_argument("--email", action="store_true",
+                        help="flag the new reminders for email notification")
+    args = parser.parse_args()
+
+    created = reminder_scheduler.run_once(args.lead, args.within, args.email)
+    print(f"Created {created} reminder(s).")
+
+
+if __name__ == "__main__":
+    main()
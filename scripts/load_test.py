@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Page-level load test built on Streamlit's AppTest.
+
+Simulates several logged-in users hitting the app at once: each session
+authenticates like Home.py does (session state of a real user from the
+dataset, or an admin), then walks through the pages and drives a scripted
+set of interactions per page – filter changes, record selections, photo
+viewing, a form submit – timing every rerun.  AppTest keeps per-process
+script-run state and is not thread-safe, so every session runs in its own
+process; all of them share the one database.
+
+The report lists per page (and per step with --steps) the rerun latency
+distribution – p50/p95/p99/max – and error count, plus the sessions' peak
+RSS (largest single session and the sum across sessions).
+
+Usage:
+    python scripts/load_test.py [--scale S|M|L|XL | --db PATH] [--sessions N]
+                                [--admins N] [--iterations N] [--pages NAME ...]
+                                [--steps] [--json PATH]
+
+Without --db a fresh dataset is built with scripts/generate_fleet.py in a
+temporary directory.  Note that the form-submit steps write to the
+database (e.g. generating reminders), so point --db at a copy.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+# Allow running from the project root
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+SEED = 42
+
+
+def _click(label):
+    def step(at, ctx):
+        next(b for b in at.button if b.label == label).click()
+    return step
+
+
+def _select(key, value):
+    def step(at, ctx):
+        at.selectbox(key=key).select(value)
+    return step
+
+
+def _state(key, value):
+    """Set a session-state key before the rerun."""
+    def step(at, ctx):
+        at.session_state[key] = value
+    return step
+
+
+def _find(key, ctx_key):
+    """Type a record ID into a search_select box; ID-prefix matches come first."""
+    def step(at, ctx):
+        at.text_input(key=f"{key}_query").input(ctx[ctx_key])
+    return step
+
+
+def _rerun(at, ctx):
+    pass
+
+
+# page -> [(step name, action before at.run())].  The first step is the
+# initial page load; the rest reuse the same AppTest session.
+SCENARIOS = {
+    "0_Dashboard": [
+        ("load", _rerun),
+        ("rerun", _rerun),
+    ],
+    "1_Equipment": [
+        ("load", _rerun),
+        ("filter type", _select("equipment_object_type", "Vehicle")),
+        ("filter status", _select("equipment_status_filter", "Active")),
+        ("view equipment", _find("view_equipment_select", "object_id")),
+    ],
+    "2_Fault_Reports": [
+        ("load", _rerun),
+        ("filter type", _select("fault_object_type", "Vehicle")),
+        ("view fault", _find("view_fault_select", "fault_id")),
+        ("view photos", _state("show_photo_viewer", True)),
+    ],
+    "3_Search": [
+        ("load", _rerun),
+        ("query", lambda at, ctx: at.text_input(key="search_query").input("hydraulic leak")),
+        ("next page", _state("search_page", 1)),
+    ],
+    "4_Service_Planning": [
+        ("load", _rerun),
+        ("select service", _find("edit_service_select", "service_id")),
+    ],
+    "5_Service_Reminders": [
+        ("load", _rerun),
+        ("filter status", _select("reminders_status", "Pending")),
+        ("generate reminders", _click("Generate Reminders")),
+    ],
+    "6_Service_Reports": [
+        ("load", _rerun),
+        ("select report", _find("view_report_select", "report_id")),
+    ],
+    "99_Admin_Panel": [
+        ("load", _rerun),
+    ],
+}
+
+
+def _contexts(db_path, n_users, n_admins):
+    """Login identity and sample record IDs for each simulated session."""
+    conn = sqlite3.connect(db_path)
+    try:
+        users = [r[0] for r in conn.execute(
+            "SELECT user_email FROM objects GROUP BY user_email ORDER BY COUNT(*) DESC, 1 LIMIT ?",
+            (max(n_users, 1),))]
+
+        def sample(sql, email):
+            scope = "" if email is None else " AND user_email = ?"
+            row = conn.execute(sql.format(scope=scope), () if email is None else (email,)).fetchone()
+            return row[0] if row else None
+
+        contexts = []
+        for i in range(n_users + n_admins):
+            admin = i >= n_users
+            email = "admin@example.com" if admin else users[i % len(users)]
+            scope_email = None if admin else email
+            contexts.append({
+                "user_email": email,
+                "user_role": "admin" if admin else "user",
+                # Records matching the filters the scenarios select first.
+                "object_id": sample("SELECT object_id FROM object_summary JOIN objects USING (object_id) "
+                                    "WHERE object_type = 'Vehicle' AND status = 'Active'{scope} "
+                                    "ORDER BY services DESC LIMIT 1", scope_email),
+                "fault_id": sample("SELECT fault_id FROM fault_reports WHERE object_type = 'Vehicle'{scope} "
+                                   "ORDER BY (SELECT COUNT(*) FROM fault_photos p "
+                                   "WHERE p.fault_id = fault_reports.fault_id) DESC LIMIT 1", scope_email),
+                "service_id": sample("SELECT service_id FROM services WHERE 1{scope} ORDER BY 1 LIMIT 1",
+                                     scope_email),
+                "report_id": sample("SELECT report_id FROM reports WHERE 1{scope} ORDER BY 1 LIMIT 1",
+                                    scope_email),
+            })
+        return contexts
+    finally:
+        conn.close()
+
+
+def _session(ctx, pages, iterations, timeout, start_barrier, results):
+    """One simulated user: walk every page's scenario *iterations* times.
+
+    Runs in its own process; puts its timings and peak RSS on *results*.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    records = []
+    rss_before = _peak_rss_mib()
+    start_barrier.wait()
+    for _ in range(iterations):
+        for page in pages:
+            if page == "99_Admin_Panel" and ctx["user_role"] != "admin":
+                continue
+            at = AppTest.from_file(str(ROOT / "pages" / f"{page}.py"), default_timeout=timeout)
+            now = time.time()
+            for key, value in {
+                "authenticated": True, "user_email": ctx["user_email"],
+                "user_role": ctx["user_role"], "user_name": ctx["user_email"].split("@")[0],
+                "last_activity": now, "_mml_init_done": True, "_cookie_refreshed_at": now,
+            }.items():
+                at.session_state[key] = value
+            for step, action in SCENARIOS[page]:
+                try:
+                    action(at, ctx)
+                    started = time.perf_counter()
+                    at.run()
+                    elapsed = time.perf_counter() - started
+                    errors = [str(e.value) for e in at.exception]
+                except Exception as e:
+                    elapsed, errors = None, [f"{type(e).__name__}: {e}"]
+                records.append((page, step, elapsed, errors))
+                if errors:
+                    break
+    results.put({"records": records, "rss_before": rss_before, "rss_peak": _peak_rss_mib()})
+
+
+def _peak_rss_mib():
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2 ** 20 if sys.platform == "darwin" else 1024)
+
+
+def _stats(latencies):
+    ms = np.asarray(latencies) * 1000
+    if not ms.size:
+        return {"runs": 0}
+    return {
+        "runs": int(ms.size),
+        "p50_ms": round(float(np.percentile(ms, 50)), 1),
+        "p95_ms": round(float(np.percentile(ms, 95)), 1),
+        "p99_ms": round(float(np.percentile(ms, 99)), 1),
+        "max_ms": round(float(ms.max()), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent AppTest load test of the app's pages")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--scale", default="S", help="dataset built for the run (default: %(default)s)")
+    source.add_argument("--db", type=Path, help="use an existing database instead")
+    parser.add_argument("--sessions", type=int, default=4, help="concurrent user sessions")
+    parser.add_argument("--admins", type=int, default=1, help="additional admin sessions")
+    parser.add_argument("--iterations", type=int, default=3, help="passes over the pages per session")
+    parser.add_argument("--pages", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--timeout", type=float, default=120, help="per-rerun timeout in seconds")
+    parser.add_argument("--steps", action="store_true", help="also report every step separately")
+    parser.add_argument("--json", type=Path, help="write the report as JSON")
+    args = parser.parse_args()
+
+    tmp = None
+    if args.db:
+        db_path = args.db
+    else:
+        tmp = tempfile.TemporaryDirectory(prefix="mymaintlog-load-")
+        db_path = Path(tmp.name) / f"load-{args.scale}.db"
+    # The pages open DataHandler() on the default path, resolved at import.
+    os.environ["MYMAINTLOG_DB_PATH"] = str(db_path)
+    os.chdir(ROOT)
+
+    from scripts import generate_fleet
+    if tmp is not None:
+        started = time.perf_counter()
+        generate_fleet.build(db_path, args.scale, SEED, date.today())
+        print(f"Built {args.scale} dataset in {time.perf_counter() - started:.1f}s")
+
+    contexts = _contexts(db_path, args.sessions, args.admins)
+    mp = multiprocessing.get_context("spawn")
+    barrier, results = mp.Barrier(len(contexts)), mp.Queue()
+    processes = [
+        mp.Process(target=_session, name=f"session-{i}",
+                   args=(ctx, args.pages, args.iterations, args.timeout, barrier, results))
+        for i, ctx in enumerate(contexts)
+    ]
+    started = time.perf_counter()
+    for p in processes:
+        p.start()
+    sessions = [results.get() for _ in processes]
+    wall = time.perf_counter() - started
+    for p in processes:
+        p.join()
+
+    by_page, by_step, errors = defaultdict(list), defaultdict(list), defaultdict(list)
+    for session in sessions:
+        for page, step, elapsed, errs in session["records"]:
+            if elapsed is not None:
+                by_page[page].append(elapsed)
+                by_step[(page, step)].append(elapsed)
+            errors[page].extend(f"{step}: {e}" for e in errs)
+
+    report = {
+        "sessions": len(contexts), "iterations": args.iterations, "wall_s": round(wall, 1),
+        "session_rss_mib_before": round(max(s["rss_before"] for s in sessions), 1),
+        "session_peak_rss_mib": round(max(s["rss_peak"] for s in sessions), 1),
+        "total_peak_rss_mib": round(sum(s["rss_peak"] for s in sessions), 1),
+        "pages": {page: {**_stats(by_page[page]), "errors": len(errors[page])} for page in args.pages},
+    }
+    if args.steps:
+        report["steps"] = {f"{page} / {step}": _stats(lat) for (page, step), lat in by_step.items()}
+
+    print(f"{len(contexts)} sessions x {args.iterations} iterations in {wall:.1f}s")
+    print(f"{'page':<22}{'runs':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errors':>8}")
+    for page, s in report["pages"].items():
+        if s["runs"]:
+            print(f"{page:<22}{s['runs']:>6}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}"
+                  f"{s['p99_ms']:>10.1f}{s['max_ms']:>10.1f}{s['errors']:>8}")
+        else:
+            print(f"{page:<22}{0:>6}{'':>40}{s['errors']:>8}")
+    for name, s in report.get("steps", {}).items():
+        print(f"  {name:<40} p50 {s['p50_ms']:>8.1f} ms  p95 {s['p95_ms']:>8.1f} ms  ({s['runs']} runs)")
+    print(f"Peak RSS per session: {report['session_rss_mib_before']:,.0f} MiB after start-up, "
+          f"{report['session_peak_rss_mib']:,.0f} MiB at most; "
+          f"{report['total_peak_rss_mib']:,.0f} MiB across all sessions")
+    for page, errs in errors.items():
+        for message in sorted(set(errs))[:3]:
+            print(f"  error in {page}: {message}")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=1) + "\n")
+    if tmp is not None:
+        tmp.cleanup()
+    sys.exit(1 if any(errors.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Rewrite date columns in the mymaintlog database as canonical ISO dates.
+
+DataHandler validates and normalises dates to 'YYYY-MM-DD' on every write,
+and its due-date queries (get_services_due / get_reminders_due) rely on that
+format for SQLite date arithmetic and index range scans.  Run this script
+once to convert any free-form values written by older versions or imported
+from CSV.  Values that cannot be parsed are reported and left untouched.
+DataHandler runs the same migration once on start-up (PRAGMA user_version
+below 2) and prints a summary; this script lists every value it left.
+
+Usage:
+    python scripts/migrate_dates.py
+"""
+import sys
+from pathlib import Path
+
+# Allow running from the project root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.data_handler import DataHandler
+
+
+def main():
+    handler = DataHandler(memoize=False)
+    with handler._get_conn() as conn:
+        changes, unparsed = handler._migrate_dates(conn)
+    for table, column, key, raw in unparsed:
+        print(f"  {table}.{column} {key}: cannot parse {raw!r} – left unchanged.")
+    print(f"Migration complete. {changes} value(s) updated, {len(unparsed)} left unparsed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,20 +2,62 @@
 
 import pandas as pd
 
+from utils.data_handler import _DATE_COLUMNS
+
+
+def _build_labels(df, id_col, name_col=None, desc_col=None):
+    """Build the {id: label} mapping for *df* with vectorised string ops."""
+    df = df[~df[id_col].duplicated()]
+    ids = df[id_col]
+    id_text = ids.astype(str)
+    suffix = pd.Series("", index=df.index)
+    if desc_col and desc_col in df.columns:
+        desc = df[desc_col].fillna("").astype(str)
+        suffix = desc.str.split().str[:4].str.join(" ").fillna("")
+    if name_col and name_col in df.columns:
+        name = df[name_col].fillna("").astype(str).str.strip()
+        suffix = name.where(name != "", suffix)
+    labels = id_text.where(suffix == "", id_text + " - " + suffix)
+    return dict(zip(ids.tolist(), labels.tolist()))
+
+
+def selectbox_formatter(df, id_col, name_col=None, desc_col=None):
+    """Return a selectbox ``format_func`` doing O(1) label lookups in *df*."""
+    labels = _build_labels(df, id_col, name_col, desc_col)
+    return lambda record_id: labels.get(record_id, str(record_id))
+
 
 def selectbox_label(record_id, df, id_col, name_col=None, desc_col=None):
     """Return 'id - name' for selectboxes; fall back to first 4 words of description."""
-    rows = df[df[id_col] == record_id]
-    if rows.empty:
-        return str(record_id)
-    row = rows.iloc[0]
-    if name_col:
-        name = str(row.get(name_col, '') or '').strip()
-        if name:
-            return f"{record_id} - {name}"
-    if desc_col:
-        desc = str(row.get(desc_col, '') or '').strip()
-        words = ' '.join(desc.split()[:4])
-        if words:
-            return f"{record_id} - {words}"
-    return str(record_id)
+    return _build_labels(df, id_col, name_col, desc_col).get(record_id, str(record_id))
+
+
+# Columns holding calendar dates (no time of day).  DataHandler returns them as
+# datetime64, which Streamlit would otherwise render with a 00:00:00 suffix.
+_DATE_ONLY_COLUMNS = frozenset().union(
+    *_DATE_COLUMNS.values(), ["meter_due_date", "last_reading_date", "next_due_date", "last_report_date"]
+)
+
+
+def date_column_config(df, **column_config):
+    """Return an st.dataframe ``column_config`` showing date columns of *df* as dates.
+
+    Extra keyword arguments are merged in and take precedence.
+    """
+    import streamlit as st
+
+    config = {
+        col: st.column_config.DateColumn(format="YYYY-MM-DD")
+        for col in df.columns if col in _DATE_ONLY_COLUMNS
+    }
+    config.update(column_config)
+    return config
+
+
+def format_date(value):
+    """Return *value* (Timestamp, date, string or missing) as 'YYYY-MM-DD' text."""
+    if value is None or pd.isna(value):
+        return ""
+    if isinstance(value, str):
+        return value
+    return value.strftime("%Y-%m-%d")
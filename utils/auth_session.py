@@ -18,10 +18,14 @@ import hashlib
 import json
 import base64
 import os
+import threading
 import time
+import uuid
 
 import streamlit as st
 
+from utils import metrics
+
 COOKIE_NAME = "mml_session"
 INACTIVITY_TIMEOUT = 600       # 10 minutes in seconds
 _COOKIE_REFRESH_INTERVAL = 60  # refresh cookie's last_activity every 60 s
@@ -34,6 +38,11 @@ COOKIE_MAX_AGE = 7 * 24 * 3600  # 7 days in seconds
 # Override with the MYMAINTLOG_SECRET environment variable in production.
 _SECRET = os.environ.get("MYMAINTLOG_SECRET", "mymaintlog-dev-key-change-in-prod")
 
+# Last activity per logged-in session of this process, keyed by a random
+# per-session ID, for the active-sessions metric.
+_active = {}
+_active_lock = threading.Lock()
+
 
 # ---------------------------------------------------------------------------
 # Internal helpers
@@ -138,6 +147,8 @@ def try_restore_session(cm) -> bool:
         "last_activity": time.time(),
         "_cookie_refreshed_at": time.time(),
     })
+    metrics.SESSION_RESTORES.inc()
+    mark_active()
     # Refresh the cookie's last_activity so the 10-min window slides forward
     try:
         cm.set(COOKIE_NAME, _refresh_la(val), max_age=COOKIE_MAX_AGE)
@@ -164,12 +175,39 @@ def refresh_cookie_if_needed(cm):
         pass
 
 
-def do_logout(cm):
+def record_login(result):
+    """Count a login attempt: "success", "bad_password" or "unknown_user"."""
+    metrics.LOGINS.inc(result=result)
+
+
+def mark_active():
+    """Record activity of the current logged-in session for the metrics."""
+    session_id = st.session_state.setdefault("_mml_session_id", uuid.uuid4().hex)
+    with _active_lock:
+        _active[session_id] = time.time()
+
+
+def _active_sessions():
+    cutoff = time.time() - INACTIVITY_TIMEOUT
+    with _active_lock:
+        for session_id in [s for s, seen in _active.items() if seen < cutoff]:
+            del _active[session_id]
+        return len(_active)
+
+
+metrics.ACTIVE_SESSIONS.set_function(_active_sessions)
+
+
+def do_logout(cm, reason="user"):
     """
     Explicitly log out: delete cookie and clear all auth state.
     Sets _do_not_restore to prevent the cookie from being re-read on the
     next render before the browser deletion has propagated.
+    *reason* ("user" or "timeout") labels the logout metric.
     """
+    metrics.LOGOUTS.inc(reason=reason)
+    with _active_lock:
+        _active.pop(st.session_state.get("_mml_session_id"), None)
     st.session_state["_do_not_restore"] = True
     try:
         cm.remove(COOKIE_NAME)
@@ -0,0 +1,409 @@
+"""Online backups of the mymaintlog SQLite database.
+
+Copying ``mymaintlog.db`` while the app is running is unsafe (WAL pages may
+not be checkpointed yet) and copies every photo BLOB each time.  This module
+uses SQLite's online backup API instead, copied in small page steps so the
+app's writers are never blocked for long, and supports incremental
+snapshots that only store what changed since the previous one.
+
+Snapshots live in ``BACKUP_DIR`` as ``<name>.db`` plus a ``<name>.json``
+manifest:
+
+- **full** – a complete copy of the database made with
+  ``sqlite3.Connection.backup``.
+- **incremental** – a small database holding only the tables whose content
+  changed since the previous snapshot (its *base*) and only the fault photos
+  added since then.  Photos are immutable (saved or deleted, never edited),
+  so the manifest's list of photo IDs is enough to replay deletions.
+
+Restoring an incremental snapshot replays its chain back to the last full
+one.  Scheduled snapshots are opt-in via environment variables (see
+start_scheduler_from_env); ``scripts/backup.py`` is the command-line entry.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from utils.data_handler import DATA_DIR, DB_PATH
+
+BACKUP_DIR = Path(os.environ.get("MYMAINTLOG_BACKUP_DIR") or DATA_DIR / "backups")
+
+# Pages copied per backup step, and the pause between steps that lets
+# writers in.  256 pages of 4 KiB = 1 MiB per step.
+BACKUP_PAGES = 256
+BACKUP_SLEEP = 0.005
+
+# Retention and chain length defaults for prune() and the scheduler.
+DEFAULT_KEEP = 14
+DEFAULT_FULL_EVERY = 7
+
+# Photos are tracked by ID rather than by content fingerprint.
+_PHOTO_TABLE = "fault_photos"
+_PHOTO_KEY = "photo_id"
+
+# Tables maintained by triggers on the base tables.  Incremental snapshots
+# skip them: replaying the base tables on restore rebuilds them.
+_DERIVED_TABLES = frozenset(["search_docs", "usage_forecasts", "usage_dirty", "object_summary"])
+
+_scheduler_lock = threading.Lock()
+_scheduler_thread = None
+
+
+# ----------------------------------------------------------------------
+# Manifests
+# ----------------------------------------------------------------------
+
+def _manifest_path(db_file):
+    return Path(db_file).with_suffix(".json")
+
+
+def _write_manifest(db_file, manifest):
+    path = _manifest_path(db_file)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(manifest, indent=2))
+    tmp.replace(path)
+
+
+def list_snapshots(backup_dir=None):
+    """Return snapshot manifests in *backup_dir*, oldest first.
+
+    Each manifest dict carries its snapshot's ``path`` in addition to the
+    stored fields (name, kind, base, created, tables, copied, photo_ids).
+    """
+    backup_dir = Path(backup_dir or BACKUP_DIR)
+    if not backup_dir.is_dir():
+        return []
+    snapshots = []
+    for path in backup_dir.glob("*.json"):
+        db_file = path.with_suffix(".db")
+        if not db_file.exists():
+            continue
+        try:
+            manifest = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        manifest["path"] = db_file
+        snapshots.append(manifest)
+    return sorted(snapshots, key=lambda m: m["name"])
+
+
+def _chain(snapshot, by_name):
+    """Return the snapshots needed to restore *snapshot*, full one first."""
+    chain = [snapshot]
+    while chain[-1]["kind"] == "incremental":
+        base = by_name.get(chain[-1]["base"])
+        if base is None:
+            raise ValueError(f"Snapshot {chain[-1]['name']} is missing its base {chain[-1]['base']}")
+        chain.append(base)
+    return chain[::-1]
+
+
+# ----------------------------------------------------------------------
+# Fingerprints
+# ----------------------------------------------------------------------
+
+def _copyable_tables(conn, schema="main"):
+    """Return {table: CREATE sql} for ordinary tables in *schema*.
+
+    Virtual tables, their shadow tables and _DERIVED_TABLES are skipped;
+    they are rebuilt from the base tables by the schema's triggers.
+    """
+    rows = conn.execute(
+        f"SELECT name, sql FROM {schema}.sqlite_master "
+        "WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+    ).fetchall()
+    virtual = [name for name, sql in rows if sql.upper().startswith("CREATE VIRTUAL")]
+    return {
+        name: sql for name, sql in rows
+        if name not in virtual and name not in _DERIVED_TABLES
+        and not any(name.startswith(v + "_") for v in virtual)
+    }
+
+
+def _fingerprint(conn, table, schema="main"):
+    """Return a content hash of *table* (rows hashed in rowid order)."""
+    digest = hashlib.sha1()
+    for row in conn.execute(f'SELECT * FROM {schema}."{table}" ORDER BY rowid'):
+        digest.update(repr(row).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _fingerprints(conn, schema="main"):
+    """Return ({table: hash}, [photo_id, ...]) for the database *schema*."""
+    tables = {
+        table: _fingerprint(conn, table, schema)
+        for table in _copyable_tables(conn, schema) if table != _PHOTO_TABLE
+    }
+    photo_ids = [
+        r[0] for r in conn.execute(
+            f"SELECT {_PHOTO_KEY} FROM {schema}.{_PHOTO_TABLE} ORDER BY {_PHOTO_KEY}"
+        )
+    ]
+    return tables, photo_ids
+
+
+# ----------------------------------------------------------------------
+# Snapshots
+# ----------------------------------------------------------------------
+
+def _copy(src, dst, pages=BACKUP_PAGES, sleep=BACKUP_SLEEP):
+    """Copy database *src* into *dst* with the online backup API, in page steps."""
+    src.backup(dst, pages=pages, sleep=sleep)
+
+
+def snapshot(db_path=None, backup_dir=None, incremental=False, pages=BACKUP_PAGES,
+             sleep=BACKUP_SLEEP):
+    """Take a snapshot of the live database and return its manifest.
+
+    With *incremental* set, only tables changed since the newest snapshot
+    and photos added since then are stored; falls back to a full snapshot
+    when there is no previous one.
+    """
+    db_path = str(db_path or DB_PATH)
+    backup_dir = Path(backup_dir or BACKUP_DIR)
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    previous = list_snapshots(backup_dir)
+    base = previous[-1] if previous else None
+    kind = "incremental" if incremental and base else "full"
+
+    name = f"mymaintlog-{datetime.now():%Y%m%d-%H%M%S-%f}-{kind}"
+    target = backup_dir / f"{name}.db"
+    tmp = target.with_suffix(".db.tmp")
+    tmp.unlink(missing_ok=True)
+
+    if kind == "full":
+        src = sqlite3.connect(db_path, timeout=30)
+        dst = sqlite3.connect(tmp)
+        try:
+            _copy(src, dst, pages, sleep)
+            # Fingerprint the copy so the manifest matches it exactly.
+            tables, photo_ids = _fingerprints(dst)
+        finally:
+            src.close()
+            dst.close()
+        copied = sorted(tables) + [_PHOTO_TABLE]
+    else:
+        tables, photo_ids, copied = _incremental(db_path, tmp, base)
+
+    tmp.replace(target)
+    manifest = {
+        "name": name,
+        "kind": kind,
+        "base": base["name"] if kind == "incremental" else None,
+        "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "tables": tables,
+        "copied": copied,
+        "photo_ids": photo_ids,
+    }
+    _write_manifest(target, manifest)
+    manifest["path"] = target
+    return manifest
+
+
+def _incremental(db_path, tmp, base):
+    """Write changed tables and new photos since *base* into *tmp*.
+
+    The live database is attached read-only and read inside a single
+    transaction, so fingerprints and copied rows come from one consistent
+    state.  Returns (fingerprints, photo_ids, copied tables).
+    """
+    conn = sqlite3.connect(tmp, uri=True)
+    try:
+        src_uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        conn.execute("ATTACH DATABASE ? AS src", (src_uri,))
+        conn.execute("BEGIN")
+        tables, photo_ids = _fingerprints(conn, "src")
+        schemas = _copyable_tables(conn, "src")
+        copied = sorted(t for t, h in tables.items() if base["tables"].get(t) != h)
+        # Table names come from the database's own sqlite_master.
+        for table in copied:
+            conn.execute(schemas[table])
+            conn.execute(f'INSERT INTO main."{table}" SELECT * FROM src."{table}"')
+        conn.execute(schemas[_PHOTO_TABLE])
+        known = set(base["photo_ids"])
+        new_ids = [pid for pid in photo_ids if pid not in known]
+        for pid in new_ids:
+            conn.execute(
+                f"INSERT INTO main.{_PHOTO_TABLE} SELECT * FROM src.{_PHOTO_TABLE} "
+                f"WHERE {_PHOTO_KEY} = ?",
+                (pid,),
+            )
+        conn.commit()
+        conn.execute("DETACH DATABASE src")
+    finally:
+        conn.close()
+    if new_ids or set(photo_ids) != known:
+        copied.append(_PHOTO_TABLE)
+    return tables, photo_ids, copied
+
+
+# ----------------------------------------------------------------------
+# Restore
+# ----------------------------------------------------------------------
+
+def _apply_incremental(conn, manifest):
+    """Replay one incremental snapshot onto the open restore database *conn*."""
+    conn.execute("ATTACH DATABASE ? AS inc", (str(manifest["path"]),))
+    try:
+        with conn:
+            for table in manifest["copied"]:
+                if table == _PHOTO_TABLE:
+                    continue
+                cols = ", ".join(
+                    f'"{r[1]}"' for r in conn.execute(f'PRAGMA inc.table_info("{table}")')
+                )
+                conn.execute(f'DELETE FROM main."{table}"')
+                conn.execute(
+                    f'INSERT INTO main."{table}" ({cols}) SELECT {cols} FROM inc."{table}"'
+                )
+            conn.execute(
+                f"INSERT OR REPLACE INTO main.{_PHOTO_TABLE} SELECT * FROM inc.{_PHOTO_TABLE}"
+            )
+            conn.execute(f"CREATE TEMP TABLE keep_photos ({_PHOTO_KEY} TEXT PRIMARY KEY)")
+            conn.executemany(
+                "INSERT INTO keep_photos VALUES (?)", [(pid,) for pid in manifest["photo_ids"]]
+            )
+            conn.execute(
+                f"DELETE FROM main.{_PHOTO_TABLE} WHERE {_PHOTO_KEY} NOT IN "
+                f"(SELECT {_PHOTO_KEY} FROM keep_photos)"
+            )
+            conn.execute("DROP TABLE keep_photos")
+    finally:
+        conn.execute("DETACH DATABASE inc")
+
+
+def restore(name, db_path=None, backup_dir=None, safety_snapshot=True,
+            pages=BACKUP_PAGES, sleep=BACKUP_SLEEP):
+    """Restore the live database from snapshot *name* and return its manifest.
+
+    The snapshot chain is rebuilt in a scratch file next to the database and
+    integrity-checked, then copied over the live database with the backup
+    API so open connections keep working.  Unless *safety_snapshot* is
+    False, a full snapshot of the current state is taken first.
+    """
+    db_path = Path(db_path or DB_PATH)
+    backup_dir = Path(backup_dir or BACKUP_DIR)
+    by_name = {m["name"]: m for m in list_snapshots(backup_dir)}
+    name = Path(str(name)).stem
+    if name not in by_name:
+        raise ValueError(f"No snapshot named {name!r} in {backup_dir}")
+    chain = _chain(by_name[name], by_name)
+
+    if safety_snapshot and db_path.exists():
+        snapshot(db_path, backup_dir)
+
+    scratch = db_path.with_name(db_path.name + ".restore")
+    scratch.unlink(missing_ok=True)
+    conn = sqlite3.connect(scratch)
+    try:
+        src = sqlite3.connect(chain[0]["path"])
+        try:
+            _copy(src, conn, pages, sleep)
+        finally:
+            src.close()
+        # Incremental replays delete whole tables; keep ON DELETE CASCADE out of it.
+        conn.execute("PRAGMA foreign_keys = OFF")
+        for manifest in chain[1:]:
+            _apply_incremental(conn, manifest)
+        result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+        if result != "ok":
+            raise sqlite3.DatabaseError(f"Restored database failed integrity check: {result}")
+        live = sqlite3.connect(db_path, timeout=30)
+        try:
+            _copy(conn, live, pages, sleep)
+        finally:
+            live.close()
+    finally:
+        conn.close()
+        scratch.unlink(missing_ok=True)
+    return by_name[name]
+
+
+# ----------------------------------------------------------------------
+# Retention and scheduling
+# ----------------------------------------------------------------------
+
+def prune(backup_dir=None, keep=DEFAULT_KEEP):
+    """Delete all but the newest *keep* snapshots; return the deleted names.
+
+    Older snapshots that a kept incremental still depends on are retained.
+    """
+    snapshots = list_snapshots(backup_dir)
+    by_name = {m["name"]: m for m in snapshots}
+    needed = set()
+    for manifest in snapshots[-keep:] if keep > 0 else []:
+        needed.update(m["name"] for m in _chain(manifest, by_name))
+    deleted = []
+    for manifest in snapshots:
+        if manifest["name"] in needed:
+            continue
+        _manifest_path(manifest["path"]).unlink(missing_ok=True)
+        Path(manifest["path"]).unlink(missing_ok=True)
+        deleted.append(manifest["name"])
+    return deleted
+
+
+def run_scheduled(db_path=None, backup_dir=None, interval_hours=24, keep=DEFAULT_KEEP,
+                  full_every=DEFAULT_FULL_EVERY):
+    """Take a snapshot if the newest one is older than *interval_hours*.
+
+    Every *full_every*-th snapshot is full, the rest incremental.  Returns
+    the new manifest, or None when no snapshot was due.
+    """
+    snapshots = list_snapshots(backup_dir)
+    if snapshots:
+        newest = datetime.strptime(snapshots[-1]["created"], "%Y-%m-%d %H:%M:%S")
+        if (datetime.now() - newest).total_seconds() < interval_hours * 3600:
+            return None
+    since_full = 0
+    for manifest in reversed(snapshots):
+        if manifest["kind"] == "full":
+            break
+        since_full += 1
+    incremental = bool(snapshots) and since_full + 1 < full_every
+    manifest = snapshot(db_path, backup_dir, incremental=incremental)
+    prune(backup_dir, keep)
+    return manifest
+
+
+def start_scheduler(interval_hours, keep=DEFAULT_KEEP, full_every=DEFAULT_FULL_EVERY,
+                    db_path=None, backup_dir=None, poll_seconds=300):
+    """Start a daemon thread running run_scheduled() periodically (once per process)."""
+    global _scheduler_thread
+    with _scheduler_lock:
+        if _scheduler_thread is not None and _scheduler_thread.is_alive():
+            return _scheduler_thread
+
+        def loop():
+            while True:
+                try:
+                    run_scheduled(db_path, backup_dir, interval_hours, keep, full_every)
+                except Exception as e:
+                    print(f"Scheduled backup failed: {e}")
+                time.sleep(min(poll_seconds, interval_hours * 3600))
+
+        _scheduler_thread = threading.Thread(target=loop, name="mymaintlog-backup", daemon=True)
+        _scheduler_thread.start()
+        return _scheduler_thread
+
+
+def start_scheduler_from_env():
+    """Start the scheduler if MYMAINTLOG_BACKUP_INTERVAL_HOURS is set.
+
+    MYMAINTLOG_BACKUP_KEEP and MYMAINTLOG_BACKUP_FULL_EVERY override the
+    retention and chain-length defaults.  Safe to call on every rerun.
+    """
+    interval = os.environ.get("MYMAINTLOG_BACKUP_INTERVAL_HOURS")
+    if not interval:
+        return None
+    return start_scheduler(
+        float(interval),
+        keep=int(os.environ.get("MYMAINTLOG_BACKUP_KEEP", DEFAULT_KEEP)),
+        full_every=int(os.environ.get("MYMAINTLOG_BACKUP_FULL_EVERY", DEFAULT_FULL_EVERY)),
+    )
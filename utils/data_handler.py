@@ -7,12 +7,25 @@ previously accessed private CSV internals and now use dedicated methods:
   - delete_user_data()     (replaces the CSV loop in Admin Panel page)
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import sqlite3
+import functools
+import inspect
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, date
 import os
 
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from utils import forecast, metrics, query_profiler, write_queue
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 DATA_DIR.mkdir(exist_ok=True)
 
@@ -78,7 +91,8 @@ CREATE TABLE IF NOT EXISTS reminders (
     user_email         TEXT,
     email_notification INTEGER DEFAULT 0,
     notification_time  TEXT DEFAULT '09:00',
-    email_sent         INTEGER DEFAULT 0
+    email_sent         INTEGER DEFAULT 0,
+    due_date           TEXT
 );
 CREATE TABLE IF NOT EXISTS reports (
     report_id            TEXT PRIMARY KEY,
@@ -92,7 +106,8 @@ CREATE TABLE IF NOT EXISTS reports (
     created_date         TEXT,
     actual_meter_reading REAL,
     meter_unit           TEXT,
-    user_email           TEXT
+    user_email           TEXT,
+    service_id           TEXT
 );
 CREATE TABLE IF NOT EXISTS fault_reports (
     fault_id             TEXT PRIMARY KEY,
@@ -117,8 +132,412 @@ CREATE TABLE IF NOT EXISTS fault_photos (
 CREATE TABLE IF NOT EXISTS meter_units (
     unit TEXT PRIMARY KEY
 );
+CREATE INDEX IF NOT EXISTS idx_objects_user_type       ON objects (user_email, object_type);
+CREATE INDEX IF NOT EXISTS idx_objects_type            ON objects (object_type);
+CREATE INDEX IF NOT EXISTS idx_objects_status          ON objects (status);
+CREATE INDEX IF NOT EXISTS idx_services_object         ON services (object_id);
+CREATE INDEX IF NOT EXISTS idx_services_user_type      ON services (user_email, object_type);
+CREATE INDEX IF NOT EXISTS idx_services_type           ON services (object_type);
+CREATE INDEX IF NOT EXISTS idx_reminders_object        ON reminders (object_id);
+CREATE INDEX IF NOT EXISTS idx_reminders_service       ON reminders (service_id);
+CREATE INDEX IF NOT EXISTS idx_reminders_user_type     ON reminders (user_email, object_type);
+CREATE INDEX IF NOT EXISTS idx_reminders_type          ON reminders (object_type);
+CREATE INDEX IF NOT EXISTS idx_reports_object          ON reports (object_id);
+CREATE INDEX IF NOT EXISTS idx_reports_user_type       ON reports (user_email, object_type);
+CREATE INDEX IF NOT EXISTS idx_reports_type            ON reports (object_type);
+CREATE INDEX IF NOT EXISTS idx_fault_reports_object    ON fault_reports (object_id);
+CREATE INDEX IF NOT EXISTS idx_fault_reports_user_type ON fault_reports (user_email, object_type);
+CREATE INDEX IF NOT EXISTS idx_fault_reports_type      ON fault_reports (object_type);
+CREATE INDEX IF NOT EXISTS idx_fault_reports_created   ON fault_reports (created_date);
+CREATE INDEX IF NOT EXISTS idx_fault_reports_user_created ON fault_reports (user_email, created_date);
+CREATE INDEX IF NOT EXISTS idx_fault_photos_fault      ON fault_photos (fault_id);
+CREATE INDEX IF NOT EXISTS idx_services_next           ON services (next_service_date);
+CREATE INDEX IF NOT EXISTS idx_services_user_next      ON services (user_email, next_service_date);
+CREATE INDEX IF NOT EXISTS idx_reminders_date          ON reminders (reminder_date);
+CREATE INDEX IF NOT EXISTS idx_reminders_user_date     ON reminders (user_email, reminder_date);
+CREATE INDEX IF NOT EXISTS idx_reminders_status_date   ON reminders (status, reminder_date);
+"""
+
+# Service schedule engine.  One set-based UPDATE rolls services forward from
+# the reports that complete them: last_service_date becomes the latest
+# linked report's completion_date and next_service_date that date plus
+# interval_days.  Services without linked reports are scheduled by hand and
+# never touched.  {scope} narrows the services considered; rows already
+# correct are not rewritten.
+_RESCHEDULE_SQL = """
+UPDATE services
+SET last_service_date = r.last_date,
+    next_service_date = coalesce(date(r.last_date, '+' || services.interval_days || ' days'),
+                                 services.next_service_date)
+FROM (
+    SELECT s.service_id, MAX(rep.completion_date) AS last_date
+    FROM services s JOIN reports rep ON rep.service_id = s.service_id
+    {scope}
+    GROUP BY s.service_id
+) AS r
+WHERE services.service_id = r.service_id
+  AND r.last_date IS NOT NULL
+  AND (services.last_service_date IS NOT r.last_date
+       OR services.next_service_date IS NOT coalesce(
+           date(r.last_date, '+' || services.interval_days || ' days'),
+           services.next_service_date))
+"""
+
+# Materialises one reminder per service coming due, reminder_date being
+# *lead* days before next_service_date (never before today).  due_date records
+# the next_service_date a reminder was generated for; together with the
+# unique idx_reminders_service_due it makes generation idempotent, and a
+# service rescheduled to a new date gets a new reminder.  IDs continue the
+# REM-nnnnn sequence, numbered in due order by ROW_NUMBER().
+_GENERATE_REMINDERS_SQL = """
+INSERT INTO reminders (reminder_id, service_id, object_id, object_type, reminder_date,
+                       status, notes, created_date, user_email, email_notification,
+                       notification_time, email_sent, due_date)
+SELECT printf('REM-%05d', (SELECT coalesce(MAX(CAST(SUBSTR(reminder_id, 5) AS INTEGER)), 0)
+                           FROM reminders)
+                          + ROW_NUMBER() OVER (ORDER BY s.next_service_date, s.service_id)),
+       s.service_id, s.object_id, s.object_type,
+       max(date(s.next_service_date, ?), ?),
+       'Pending', ?, ?, s.user_email, ?, ?, 0, s.next_service_date
+FROM services s
+WHERE s.next_service_date IS NOT NULL
+  AND s.next_service_date <= date(?, ?)
+  AND coalesce(s.status, '') <> 'Completed'
+  AND NOT EXISTS (SELECT 1 FROM reminders r
+                  WHERE r.service_id = s.service_id AND r.due_date = s.next_service_date)
+  {scope}
+"""
+
+# Full-text search.  search_index is an FTS5 table whose rowid is the doc_id
+# of a search_docs row; search_docs maps it back to the source record and
+# holds the columns results are scoped by.  Triggers on the source tables
+# keep both in sync, so the index never has to be rebuilt on write.
+# kind -> (table, key column, indexed title, indexed body, columns whose
+# change re-indexes the row).
+_SEARCH_SOURCES = {
+    "fault": ("fault_reports", "fault_id", "''", "coalesce({r}.description, '')",
+              "description"),
+    "report": ("reports", "report_id", "coalesce({r}.title, '')",
+               "coalesce({r}.description, '') || ' ' || coalesce({r}.notes, '')",
+               "title, description, notes"),
+    "service": ("services", "service_id", "coalesce({r}.service_name, '')",
+                "coalesce({r}.description, '') || ' ' || coalesce({r}.notes, '')",
+                "service_name, description, notes"),
+    "reminder": ("reminders", "reminder_id", "''", "coalesce({r}.notes, '')", "notes"),
+}
+
+_SEARCH_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} BEGIN
+    INSERT INTO search_docs (kind, record_id, object_id, object_type, user_email)
+    VALUES ('{kind}', new.{key}, new.object_id, new.object_type, new.user_email);
+    INSERT INTO search_index (rowid, title, body)
+    VALUES (last_insert_rowid(), {title_new}, {body_new});
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table} BEGIN
+    DELETE FROM search_index WHERE rowid =
+        (SELECT doc_id FROM search_docs WHERE kind = '{kind}' AND record_id = old.{key});
+    DELETE FROM search_docs WHERE kind = '{kind}' AND record_id = old.{key};
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_search_update
+AFTER UPDATE OF {key}, object_id, object_type, user_email, {watched} ON {table} BEGIN
+    DELETE FROM search_index WHERE rowid =
+        (SELECT doc_id FROM search_docs WHERE kind = '{kind}' AND record_id = old.{key});
+    DELETE FROM search_docs WHERE kind = '{kind}' AND record_id = old.{key};
+    INSERT INTO search_docs (kind, record_id, object_id, object_type, user_email)
+    VALUES ('{kind}', new.{key}, new.object_id, new.object_type, new.user_email);
+    INSERT INTO search_index (rowid, title, body)
+    VALUES (last_insert_rowid(), {title_new}, {body_new});
+END;
+"""
+
+_SEARCH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_docs (
+    doc_id      INTEGER PRIMARY KEY,
+    kind        TEXT NOT NULL,
+    record_id   TEXT NOT NULL,
+    object_id   TEXT,
+    object_type TEXT,
+    user_email  TEXT,
+    UNIQUE (kind, record_id)
+);
+CREATE INDEX IF NOT EXISTS idx_search_docs_user ON search_docs (user_email);
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+    title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+""" + "".join(
+    _SEARCH_TRIGGERS.format(
+        table=table, kind=kind, key=key, watched=watched,
+        title_new=title.format(r="new"), body_new=body.format(r="new"),
+    )
+    for kind, (table, key, title, body, watched) in _SEARCH_SOURCES.items()
+)
+
+# Meter readings.  One row per reading and object, taken from service and
+# fault reports by triggers (source/source_id point back at the report) or
+# entered directly (source 'manual').  A zero reading is the forms' default
+# for "not entered" and is not recorded.  usage_forecasts caches each
+# object's usage rate per meter unit; usage_dirty lists objects whose
+# readings changed since it was last computed (see refresh_usage_forecasts).
+# source -> (table, key column, date column of the reading)
+_METER_SOURCES = {
+    "report": ("reports", "report_id", "completion_date"),
+    "fault": ("fault_reports", "fault_id", "observation_date"),
+}
+
+_METER_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS {table}_meter_insert AFTER INSERT ON {table}
+WHEN new.actual_meter_reading > 0 BEGIN
+    INSERT OR REPLACE INTO meter_readings
+        (object_id, reading_date, reading, meter_unit, source, source_id, user_email)
+    VALUES (new.object_id, coalesce(new.{date_col}, date(new.created_date)), new.actual_meter_reading,
+            coalesce(new.meter_unit, ''), '{source}', new.{key}, new.user_email);
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_meter_delete AFTER DELETE ON {table} BEGIN
+    DELETE FROM meter_readings WHERE source = '{source}' AND source_id = old.{key};
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_meter_update
+AFTER UPDATE OF {key}, object_id, {date_col}, actual_meter_reading, meter_unit, user_email
+ON {table} BEGIN
+    DELETE FROM meter_readings WHERE source = '{source}' AND source_id = old.{key};
+    INSERT INTO meter_readings
+        (object_id, reading_date, reading, meter_unit, source, source_id, user_email)
+    SELECT new.object_id, coalesce(new.{date_col}, date(new.created_date)), new.actual_meter_reading,
+           coalesce(new.meter_unit, ''), '{source}', new.{key}, new.user_email
+    WHERE new.actual_meter_reading > 0;
+END;
+"""
+
+_METER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meter_readings (
+    reading_id   INTEGER PRIMARY KEY,
+    object_id    TEXT NOT NULL,
+    reading_date TEXT NOT NULL,
+    reading      REAL NOT NULL,
+    meter_unit   TEXT NOT NULL DEFAULT '',
+    source       TEXT NOT NULL,
+    source_id    TEXT,
+    user_email   TEXT,
+    UNIQUE (source, source_id)
+);
+CREATE INDEX IF NOT EXISTS idx_meter_readings_object_date ON meter_readings (object_id, reading_date);
+CREATE INDEX IF NOT EXISTS idx_meter_readings_user        ON meter_readings (user_email);
+CREATE TABLE IF NOT EXISTS usage_forecasts (
+    object_id         TEXT NOT NULL,
+    meter_unit        TEXT NOT NULL,
+    rate_per_day      REAL,
+    readings          INTEGER,
+    last_reading      REAL,
+    last_reading_date TEXT,
+    computed_at       TEXT,
+    PRIMARY KEY (object_id, meter_unit)
+);
+CREATE TABLE IF NOT EXISTS usage_dirty (
+    object_id TEXT PRIMARY KEY
+);
+CREATE TRIGGER IF NOT EXISTS meter_readings_dirty_insert AFTER INSERT ON meter_readings BEGIN
+    INSERT OR IGNORE INTO usage_dirty (object_id) VALUES (new.object_id);
+END;
+CREATE TRIGGER IF NOT EXISTS meter_readings_dirty_delete AFTER DELETE ON meter_readings BEGIN
+    INSERT OR IGNORE INTO usage_dirty (object_id) VALUES (old.object_id);
+END;
+CREATE TRIGGER IF NOT EXISTS meter_readings_dirty_update AFTER UPDATE ON meter_readings BEGIN
+    INSERT OR IGNORE INTO usage_dirty (object_id) VALUES (old.object_id);
+    INSERT OR IGNORE INTO usage_dirty (object_id) VALUES (new.object_id);
+END;
+""" + "".join(
+    _METER_TRIGGERS.format(table=table, source=source, key=key, date_col=date_col)
+    for source, (table, key, date_col) in _METER_SOURCES.items()
+)
+
+# Per-object summary for fleet overviews.  Every write to a table below
+# re-derives the summary row of the affected object(s) with indexed
+# subqueries, so reading the overview is one join on object_id instead of
+# loading and counting every table.  Rows are recomputed rather than
+# adjusted by deltas, which keeps status changes, reassignments and
+# cascaded deletes trivially correct.
+_SUMMARY_REFRESH = """
+    INSERT OR REPLACE INTO object_summary
+    SELECT o.object_id,
+           (SELECT COUNT(*) FROM services s WHERE s.object_id = o.object_id),
+           (SELECT COUNT(*) FROM services s
+            WHERE s.object_id = o.object_id AND coalesce(s.status, '') <> 'Completed'),
+           (SELECT MIN(s.next_service_date) FROM services s
+            WHERE s.object_id = o.object_id AND coalesce(s.status, '') <> 'Completed'),
+           (SELECT COUNT(*) FROM reminders r WHERE r.object_id = o.object_id AND r.status = 'Pending'),
+           (SELECT COUNT(*) FROM reports r WHERE r.object_id = o.object_id),
+           (SELECT MAX(r.completion_date) FROM reports r WHERE r.object_id = o.object_id),
+           (SELECT COUNT(*) FROM fault_reports f WHERE f.object_id = o.object_id),
+           (SELECT COUNT(*) FROM fault_photos p JOIN fault_reports f ON f.fault_id = p.fault_id
+            WHERE f.object_id = o.object_id),
+           m.reading, m.reading_date, m.meter_unit
+    FROM objects o
+    LEFT JOIN meter_readings m ON m.reading_id = (
+        SELECT reading_id FROM meter_readings WHERE object_id = o.object_id
+        ORDER BY reading_date DESC, reading_id DESC LIMIT 1)
+    WHERE {scope};
+"""
+
+# table -> columns whose change can alter the summary of the row's object.
+_SUMMARY_SOURCES = {
+    "services": "object_id, status, next_service_date",
+    "reminders": "object_id, status",
+    "reports": "object_id, completion_date",
+    "fault_reports": "object_id",
+    "meter_readings": "object_id, reading_date, reading, meter_unit",
+}
+
+_SUMMARY_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS {table}_summary_insert AFTER INSERT ON {table} BEGIN{new}END;
+CREATE TRIGGER IF NOT EXISTS {table}_summary_delete AFTER DELETE ON {table} BEGIN{old}END;
+CREATE TRIGGER IF NOT EXISTS {table}_summary_update AFTER UPDATE OF {columns} ON {table} BEGIN{old}{new}END;
 """
 
+_SUMMARY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS object_summary (
+    object_id         TEXT PRIMARY KEY,
+    services          INTEGER NOT NULL DEFAULT 0,
+    open_services     INTEGER NOT NULL DEFAULT 0,
+    next_due_date     TEXT,
+    pending_reminders INTEGER NOT NULL DEFAULT 0,
+    reports           INTEGER NOT NULL DEFAULT 0,
+    last_report_date  TEXT,
+    faults            INTEGER NOT NULL DEFAULT 0,
+    photos            INTEGER NOT NULL DEFAULT 0,
+    last_reading      REAL,
+    last_reading_date TEXT,
+    meter_unit        TEXT
+);
+CREATE TRIGGER IF NOT EXISTS objects_summary_insert AFTER INSERT ON objects BEGIN{objects_new}END;
+CREATE TRIGGER IF NOT EXISTS objects_summary_delete AFTER DELETE ON objects BEGIN
+    DELETE FROM object_summary WHERE object_id = old.object_id;
+END;
+CREATE TRIGGER IF NOT EXISTS objects_summary_update AFTER UPDATE OF object_id ON objects BEGIN
+    DELETE FROM object_summary WHERE object_id = old.object_id;{objects_new}END;
+CREATE TRIGGER IF NOT EXISTS fault_photos_summary_insert AFTER INSERT ON fault_photos BEGIN{photo_new}END;
+CREATE TRIGGER IF NOT EXISTS fault_photos_summary_delete AFTER DELETE ON fault_photos BEGIN{photo_old}END;
+""".format(
+    objects_new=_SUMMARY_REFRESH.format(scope="o.object_id = new.object_id"),
+    photo_new=_SUMMARY_REFRESH.format(
+        scope="o.object_id = (SELECT object_id FROM fault_reports WHERE fault_id = new.fault_id)"),
+    photo_old=_SUMMARY_REFRESH.format(
+        scope="o.object_id = (SELECT object_id FROM fault_reports WHERE fault_id = old.fault_id)"),
+) + "".join(
+    _SUMMARY_TRIGGERS.format(
+        table=table, columns=columns,
+        new=_SUMMARY_REFRESH.format(scope="o.object_id = new.object_id"),
+        old=_SUMMARY_REFRESH.format(scope="o.object_id = old.object_id"),
+    )
+    for table, columns in _SUMMARY_SOURCES.items()
+)
+
+# Results per page on the Search page.
+SEARCH_PAGE_SIZE = 20
+
+# Declared pandas dtypes applied to every DataFrame read from a table:
+# categoricals for low-cardinality text, nullable ints/floats/booleans for
+# numeric and flag columns, datetime64 for dates and timestamps.  Keeps
+# per-session copies small and comparisons on the pages vectorised.
+_TABLE_DTYPES = {
+    "objects": {
+        "object_type": "category", "status": "category", "user_email": "category",
+        "created_date": "datetime64[ns]", "last_updated": "datetime64[ns]",
+    },
+    "services": {
+        "object_type": "category", "status": "category", "meter_unit": "category",
+        "user_email": "category", "interval_days": "Int64",
+        "expected_meter_reading": "Float64",
+        "last_service_date": "datetime64[ns]", "next_service_date": "datetime64[ns]",
+        "created_date": "datetime64[ns]",
+    },
+    "reminders": {
+        "object_type": "category", "status": "category", "user_email": "category",
+        "notification_time": "category",
+        "email_notification": "boolean", "email_sent": "boolean",
+        "reminder_date": "datetime64[ns]", "created_date": "datetime64[ns]",
+        "due_date": "datetime64[ns]",
+    },
+    "reports": {
+        "object_type": "category", "report_type": "category", "meter_unit": "category",
+        "user_email": "category", "actual_meter_reading": "Float64",
+        "completion_date": "datetime64[ns]", "created_date": "datetime64[ns]",
+    },
+    "fault_reports": {
+        "object_type": "category", "meter_unit": "category", "user_email": "category",
+        "actual_meter_reading": "Float64",
+        "observation_date": "datetime64[ns]", "created_date": "datetime64[ns]",
+    },
+    "meter_readings": {
+        "reading": "Float64", "meter_unit": "category", "source": "category",
+        "user_email": "category", "reading_date": "datetime64[ns]",
+    },
+    "object_summary": {
+        "object_type": "category", "status": "category", "user_email": "category",
+        "created_date": "datetime64[ns]", "last_updated": "datetime64[ns]",
+        "services": "Int64", "open_services": "Int64", "pending_reminders": "Int64",
+        "reports": "Int64", "faults": "Int64", "photos": "Int64",
+        "next_due_date": "datetime64[ns]", "last_report_date": "datetime64[ns]",
+        "last_reading": "Float64", "last_reading_date": "datetime64[ns]",
+        "meter_unit": "category",
+    },
+    "usage_forecasts": {
+        "meter_unit": "category", "rate_per_day": "Float64", "readings": "Int64",
+        "last_reading": "Float64", "last_reading_date": "datetime64[ns]",
+        "computed_at": "datetime64[ns]",
+    },
+}
+
+# Dtypes of columns computed by the get_*_due, forecast and fault report methods.
+_COMPUTED_DTYPES = {
+    "days_until": "Int64", "overdue": "boolean", "photos": "Int64",
+    "rate_per_day": "Float64", "last_reading": "Float64",
+    "last_reading_date": "datetime64[ns]", "meter_due_date": "datetime64[ns]",
+}
+
+# Arrow types of the declared dtypes, for results read with arrow=True.
+_ARROW_TYPES = {
+    "category": pa.dictionary(pa.int32(), pa.string()),
+    "Int64": pa.int64(), "Float64": pa.float64(), "boolean": pa.bool_(),
+    "datetime64[ns]": pa.timestamp("ns"),
+}
+
+# Date-only columns.  They are stored as canonical ISO 'YYYY-MM-DD' text
+# (validated on write) so SQLite's date functions, plain string comparison
+# and the indexes above all order them correctly.
+_DATE_COLUMNS = {
+    "services": frozenset(["last_service_date", "next_service_date"]),
+    "reminders": frozenset(["reminder_date", "due_date"]),
+    "reports": frozenset(["completion_date"]),
+    "fault_reports": frozenset(["observation_date"]),
+    "meter_readings": frozenset(["reading_date"]),
+}
+# Primary key of each table with date columns, to report unparsable dates.
+_DATE_TABLE_KEYS = {
+    "services": "service_id", "reminders": "reminder_id", "reports": "report_id",
+    "fault_reports": "fault_id", "meter_readings": "reading_id",
+}
+
+# PRAGMA user_version: the one-time data migrations _initialize_db has
+# applied to a database.  1: derived tables (search index, meter readings,
+# object summary) backfilled; 2: date columns rewritten as ISO dates.  Set a
+# database back to 0 to have both run again.
+_DATA_VERSION = 2
+
+# Default number of rows returned by the search_* methods (search-as-you-type
+# selectors only ever render this many options).
+SEARCH_LIMIT = 25
+
+# Rows fetched per chunk by the iter_* export methods.
+EXPORT_CHUNK_ROWS = 5000
+
+# Worker threads of get_many(), each reading on its own read-only connection.
+READ_THREADS = int(os.environ.get("MYMAINTLOG_READ_THREADS", 4))
+_read_pool = None
+_read_pool_lock = threading.Lock()
+
+# Tables exported per user (all of them carry a user_email column).
+EXPORT_TABLES = ("objects", "services", "reminders", "reports", "fault_reports",
+                 "meter_readings")
+
 # Valid columns per table – used to silently ignore unknown kwargs in
 # update_* methods (same protection the original code had via `if key in df.columns`).
 _TABLE_COLUMNS = {
@@ -136,19 +555,222 @@ _TABLE_COLUMNS = {
         "reminder_id", "service_id", "object_id", "object_type",
         "reminder_date", "status", "notes", "created_date",
         "user_email", "email_notification", "notification_time", "email_sent",
+        "due_date",
     ]),
     "reports": frozenset([
         "report_id", "object_id", "object_type", "report_type",
         "title", "description", "completion_date", "notes",
         "created_date", "actual_meter_reading", "meter_unit", "user_email",
+        "service_id",
     ]),
     "fault_reports": frozenset([
         "fault_id", "object_id", "object_type", "observation_date",
         "actual_meter_reading", "meter_unit", "description",
         "photo_paths", "created_date", "user_email",
     ]),
+    "meter_readings": frozenset([
+        "reading_id", "object_id", "reading_date", "reading", "meter_unit",
+        "source", "source_id", "user_email",
+    ]),
 }
 
+# object_summary columns get_object_summary() adds to the object's own.
+_SUMMARY_COLUMNS = (
+    "services", "open_services", "next_due_date", "pending_reminders", "reports",
+    "last_report_date", "faults", "photos", "last_reading", "last_reading_date", "meter_unit",
+)
+# The counts among them, 0 rather than NULL for an object without a summary row.
+_SUMMARY_COUNTS = frozenset(
+    ["services", "open_services", "pending_reminders", "reports", "faults", "photos"])
+
+
+def _select_list(table, columns, alias=None, extra=None):
+    """The SELECT list for *columns* of *table*, or all of them if None.
+
+    Names are checked against _TABLE_COLUMNS (and *extra*, a dict of further
+    selectable columns to their SQL) before being interpolated into SQL; an
+    unknown one raises ValueError.
+    """
+    prefix = f"{alias}." if alias else ""
+    if columns is None:
+        return f"{prefix}*"
+    extra = extra or {}
+    if not columns:
+        raise ValueError(f"No {table} columns selected")
+    unknown = [c for c in columns if c not in _TABLE_COLUMNS[table] and c not in extra]
+    if unknown:
+        raise ValueError(f"Unknown {table} columns: {unknown!r}")
+    return ", ".join(extra.get(c, f"{prefix}{c}") for c in dict.fromkeys(columns))
+
+
+def _copy_result(value):
+    """Return a copy of a memoised result so callers can't mutate the memo."""
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, list):
+        return [dict(v) if isinstance(v, dict) else v for v in value]
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def _held(base):
+    """Connection class for a connection lent to several method calls.
+
+    commit(), close() and leaving ``with conn:`` are no-ops, so the methods
+    cannot end the transaction of a single-writer batch or a read_snapshot();
+    its owner ends the transaction and calls release().
+    """
+
+    class HeldConnection(base):
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def commit(self):
+            pass
+
+        def close(self):
+            pass
+
+        def release(self):
+            super().close()
+
+    return HeldConnection
+
+
+def _connect(db_path, read_only=False, held=False, **kwargs):
+    """Open a connection to *db_path* with the pragmas every DataHandler connection uses.
+
+    Read-only connections open the file with ``mode=ro`` and set
+    ``query_only``: they never take the write lock, and a stray write fails
+    instead of waiting for it.  *held* connections are _held() ones.
+    """
+    factory = query_profiler.connection_factory()
+    if held:
+        factory = _held(factory)
+    if read_only:
+        conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True, timeout=30,
+                               check_same_thread=False, factory=factory, **kwargs)
+        # The database is already in WAL mode (set by the read-write connections).
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+    conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False, factory=factory, **kwargs)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous  = NORMAL")
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
+def _arrow_array(values, arrow_type=None):
+    """One result column as an Arrow array of *arrow_type* (inferred if None).
+
+    Converts like DataHandler._frame(): unparseable dates become null and
+    NULL flags False.  A column SQLite returned with mixed types is read as
+    strings.
+    """
+    try:
+        array = pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        array = pa.array([None if v is None else str(v) for v in values], pa.string())
+    if arrow_type is None:
+        # All NULL (or no rows): SQLite's undeclared columns are TEXT.
+        return array.cast(pa.string()) if pa.types.is_null(array.type) else array
+    if pa.types.is_timestamp(arrow_type):
+        try:
+            # ISO dates and "YYYY-MM-DD HH:MM:SS" date-times.
+            return pc.cast(array, arrow_type)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            return pa.array(pd.to_datetime(pd.Series(values, dtype=object), format="ISO8601",
+                                           errors="coerce"), arrow_type)
+    if pa.types.is_dictionary(arrow_type):
+        return pc.dictionary_encode(pc.cast(array, pa.string()))
+    if pa.types.is_boolean(arrow_type):
+        return pc.fill_null(pc.cast(array, arrow_type), False)
+    return pc.cast(array, arrow_type)
+
+
+def _reader_pool():
+    """The process's get_many() thread pool, created on first use."""
+    global _read_pool
+    with _read_pool_lock:
+        if _read_pool is None:
+            _read_pool = ThreadPoolExecutor(READ_THREADS, thread_name_prefix="mymaintlog-read")
+        return _read_pool
+
+
+def _script_run():
+    """Identity of the current Streamlit script run, or None outside one.
+
+    Streamlit gives every run a new ``cursors`` dict (ScriptRunContext.reset(),
+    and each fragment of a fragment rerun its own copy), so the dict itself
+    identifies the run.  That is internal: it was verified against Streamlit
+    1.52 to 1.66, the range requirements.txt allows.  Should the attribute
+    go away, every read gets a new identity, i.e. the memo is never reused.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return None
+    cursors = getattr(ctx, "cursors", None)
+    return cursors if cursors is not None else object()
+
+
+def _memoized(method):
+    """Memoise a read method on the DataHandler instance.
+
+    The memo lives exactly as long as one script run: each distinct query
+    (method + bound arguments) hits SQLite once per run.  Pages construct a
+    fresh DataHandler at the top of every run, but fragments keep the one
+    they closed over, so the memo is also cleared when a read happens in a
+    later run (a fragment rerun) than the one that filled it.  Any write
+    through the same handler clears the memo.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self._memoize:
+            return method(self, *args, **kwargs)
+        self._sync_memo_run()
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__, tuple(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in tuple(bound.arguments.items())[1:]
+        ))
+        try:
+            hit = key in self._memo
+        except TypeError:
+            # Unhashable argument – bypass the memo rather than fail.
+            return method(self, *args, **kwargs)
+        metrics.CACHE_REQUESTS.inc(result="hit" if hit else "miss")
+        if not hit:
+            self._memo[key] = method(self, *args, **kwargs)
+        return _copy_result(self._memo[key])
+
+    return wrapper
+
+
+def _invalidates(method):
+    """Clear the per-rerun read memo after a write method runs.
+
+    With the single writer enabled the method itself runs on the writer
+    thread (see utils.write_queue) and the caller waits for its result.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            if self._writer is not None and not write_queue.on_writer_thread():
+                return self._writer.submit(functools.partial(method, self, *args, **kwargs)).result()
+            return method(self, *args, **kwargs)
+        finally:
+            self._memo.clear()
+
+    wrapper._writes = True
+    return wrapper
+
 
 class DataHandler:
     """Handle SQLite data storage and retrieval for service management."""
@@ -167,39 +789,211 @@ class DataHandler:
         "equipment": "Other",
     }
 
-    def __init__(self, db_path=None):
+    def __init__(self, db_path=None, memoize=True, single_writer=None):
         self._db_path = db_path or str(DB_PATH)
+        # Per-instance read memo (see _memoized).  Long-lived handlers, e.g.
+        # in background jobs, should pass memoize=False to always see fresh data.
+        self._memoize = memoize
+        self._memo = {}
+        # The script run the memo was filled in (see _script_run).
+        self._memo_run = None
+        # The current thread's read_snapshot() connection, if any.
+        self._snapshot = threading.local()
         self._initialize_db()
+        # Route writes through the process's writer thread; defaults to
+        # MYMAINTLOG_SINGLE_WRITER (see utils.write_queue).
+        if write_queue.ENABLED if single_writer is None else single_writer:
+            self._writer = write_queue.writer_for(self._db_path,
+                                                  functools.partial(_connect, self._db_path, held=True))
+        else:
+            self._writer = None
+        metrics.mark_ready()
+
+    def submit_write(self, method, *args, **kwargs):
+        """Queue the write method named *method* and return a Future of its result.
+
+        Lets a caller issue many writes (e.g. a bulk import) without waiting
+        for each one, so the single writer commits them in groups.  Without
+        the single writer the write runs right away and the Future is done.
+        """
+        func = getattr(type(self), method, None)
+        if not getattr(func, "_writes", False):
+            raise ValueError(f"Not a DataHandler write method: {method!r}")
+        if self._writer is None:
+            future = Future()
+            try:
+                future.set_result(func(self, *args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        future = self._writer.submit(functools.partial(func.__wrapped__, self, *args, **kwargs))
+        future.add_done_callback(lambda _f: self._memo.clear())
+        return future
+
+    def get_many(self, calls):
+        """Run several independent read methods in parallel; returns their results in order.
+
+        *calls* is a list of method names or (name, kwargs) pairs, e.g.
+        ``[("get_objects", {"is_admin": True}), "get_meter_units"]``.  Each
+        call runs on a small shared thread pool with its own read-only
+        connection; SQLite releases the GIL while it executes, so loading
+        several tables takes about as long as the slowest of them.  Inside a
+        read_snapshot() the calls run one after another on the snapshot,
+        whose transaction a second connection cannot join.
+        """
+        jobs = []
+        for call in calls:
+            name, kwargs = (call, {}) if isinstance(call, str) else call
+            func = getattr(type(self), name, None)
+            if not name.startswith(("get_", "search_", "count_")) or func is None or \
+                    getattr(func, "_writes", False):
+                raise ValueError(f"Not a DataHandler read method: {name!r}")
+            jobs.append(functools.partial(func, self, **kwargs))
+        if len(jobs) < 2 or getattr(self._snapshot, "conn", None) is not None:
+            return [job() for job in jobs]
+        # The pool threads run outside the script run, so the memo is
+        # checked against it here.
+        if self._memoize:
+            self._sync_memo_run()
+        # Credit the workers' statements to the calling page and its timer.
+        caller = query_profiler.caller()
+        futures = [_reader_pool().submit(query_profiler.run_for, caller, job) for job in jobs]
+        return [future.result() for future in futures]
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
     def _get_conn(self):
-        """Open a connection with WAL mode for safe concurrent access.
+        """Open a read-write connection with WAL mode for safe concurrent access.
 
         check_same_thread=False is required because Streamlit may call
         DataHandler methods from a different thread than the one that
         constructed the object.  Each method call creates its own
         connection (opened and closed via the context manager), so no
         single Connection object is ever shared between threads.
+        Statements are timed by utils.query_profiler unless it is disabled.
+        Inside a single-writer job the writer's connection is returned
+        instead; its transaction is committed by the writer.
         """
-        conn = sqlite3.connect(self._db_path, timeout=30, check_same_thread=False)
-        conn.execute("PRAGMA journal_mode = WAL")
-        conn.execute("PRAGMA synchronous  = NORMAL")
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
+        return write_queue.current_connection(self._db_path) or _connect(self._db_path)
+
+    def _read_conn(self):
+        """Open a read-only connection for a read method.
+
+        Inside a read_snapshot() block the snapshot's connection is returned,
+        inside a single-writer job the writer's (to see the job's own writes).
+        """
+        return (write_queue.current_connection(self._db_path)
+                or getattr(self._snapshot, "conn", None)
+                or _connect(self._db_path, read_only=True))
+
+    @contextmanager
+    def read_snapshot(self):
+        """Run the reads made in the block by this thread in one read transaction.
+
+        They share one read-only connection and, thanks to WAL, all see the
+        database as it was when the block started, however many writes
+        commit meanwhile – so counts and lists read from different tables
+        agree.  Writes in the block still go through their own connections
+        and are not visible to its reads.  Nested blocks join the outer one.
+        """
+        if getattr(self._snapshot, "conn", None) is not None:
+            yield
+            return
+        conn = _connect(self._db_path, read_only=True, held=True)
+        try:
+            conn.execute("BEGIN")
+            # The snapshot is taken at the first read, not at BEGIN.
+            conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+            self._snapshot.conn = conn
+            yield
+        finally:
+            self._snapshot.conn = None
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            conn.release()
 
     def _initialize_db(self):
         """Create tables and seed meter_units on first run."""
         with self._get_conn() as conn:
             conn.executescript(_SCHEMA)
+            conn.executescript(_SEARCH_SCHEMA)
+            conn.executescript(_METER_SCHEMA)
+            report_cols = [r[1] for r in conn.execute("PRAGMA table_info(reports)")]
+            if "service_id" not in report_cols:
+                # Databases created before reports could complete a service.
+                conn.execute("ALTER TABLE reports ADD COLUMN service_id TEXT")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_reports_service_date "
+                "ON reports (service_id, completion_date)"
+            )
+            reminder_cols = [r[1] for r in conn.execute("PRAGMA table_info(reminders)")]
+            if "due_date" not in reminder_cols:
+                # Databases created before reminders were generated from services.
+                conn.execute("ALTER TABLE reminders ADD COLUMN due_date TEXT")
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_reminders_service_due "
+                "ON reminders (service_id, due_date) WHERE due_date IS NOT NULL"
+            )
+            # One-time migrations, recorded in user_version so they are not
+            # re-checked on every construction (every rerun).
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 2:
+                # Before the backfills, which read the dates.
+                self._migrate_dates(conn, warn=True)
+            backfill = version < 1
+            if backfill and not conn.execute("SELECT 1 FROM search_docs LIMIT 1").fetchone():
+                # New index on an existing database: index what is already there.
+                self._index_all(conn)
+            if backfill and not conn.execute("SELECT 1 FROM meter_readings LIMIT 1").fetchone():
+                # Backfill readings recorded on reports before the table existed.
+                self._backfill_meter_readings(conn)
+            # After the meter backfill, whose readings the summary includes.
+            conn.executescript(_SUMMARY_SCHEMA)
+            if backfill and not conn.execute("SELECT 1 FROM object_summary LIMIT 1").fetchone():
+                conn.execute(_SUMMARY_REFRESH.format(scope="1"))
+            if version < _DATA_VERSION:
+                conn.execute(f"PRAGMA user_version = {_DATA_VERSION}")
             if not conn.execute("SELECT 1 FROM meter_units LIMIT 1").fetchone():
                 conn.executemany(
                     "INSERT OR IGNORE INTO meter_units (unit) VALUES (?)",
                     [("km",), ("kWh",)],
                 )
 
+    def _migrate_dates(self, conn, warn=False):
+        """Rewrite date column values that are not 'YYYY-MM-DD' as ISO dates.
+
+        Older versions and CSV imports stored free-form dates, which break
+        days_until and date ordering.  Values that cannot be parsed are left
+        unchanged (and printed with *warn*).  Returns (values rewritten,
+        [(table, column, key, value)] left unparsed).
+        """
+        updated, unparsed = 0, []
+        # Table and column names come from the hardcoded maps above.
+        for table, columns in _DATE_COLUMNS.items():
+            pk = _DATE_TABLE_KEYS[table]
+            for column in sorted(columns):
+                rows = conn.execute(
+                    f"SELECT {pk}, {column} FROM {table} "
+                    f"WHERE {column} NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'"
+                ).fetchall()
+                for key, raw in rows:
+                    try:
+                        canonical = self.to_iso_date(raw)
+                        conn.execute(f"UPDATE {table} SET {column} = ? WHERE {pk} = ?",
+                                     (canonical, key))
+                    except (ValueError, sqlite3.IntegrityError):
+                        # Not a date, or empty in a NOT NULL column.
+                        unparsed.append((table, column, key, raw))
+                        continue
+                    updated += 1
+        if warn and (updated or unparsed):
+            print(f"Rewrote {updated} date value(s) as ISO dates; "
+                  f"{len(unparsed)} could not be parsed and were left unchanged "
+                  f"(see scripts/migrate_dates.py).")
+        return updated, unparsed
+
     @staticmethod
     def _where(clauses):
         return ("WHERE " + " AND ".join(clauses)) if clauses else ""
@@ -211,6 +1005,120 @@ class DataHandler:
             df["object_type"] = df["object_type"].apply(self.normalize_object_type)
         return df
 
+    def _search(self, table, id_col, text_cols, query, clauses, params, limit, include_id):
+        """Return up to *limit* rows of *table* matching *query* as a DataFrame.
+
+        IDs starting with the (upper-cased) query come first, found with a
+        range scan on the primary key; the remaining slots are filled with
+        case-insensitive substring matches on the ID and *text_cols*.  No
+        index serves a substring match: that fallback reads the rows left by
+        *clauses* (all of them for an unscoped admin search) until *limit*
+        matches are found.
+        *clauses*/*params* scope every lookup in SQL (object type, user, ...).
+        *include_id*, if given, is always returned first so a selector keeps
+        its current value while the user types.
+        """
+        # Column and table names come from the hardcoded search_* callers.
+        query = (query or "").strip()
+
+        def select(conn, extra, extra_params, n):
+            sql = (f"SELECT * FROM {table} {self._where(clauses + extra)} "
+                   f"ORDER BY {id_col} LIMIT ?")
+            return pd.read_sql_query(sql, conn, params=params + extra_params + [n])
+
+        frames = []
+        with self._read_conn() as conn:
+            if include_id:
+                frames.append(select(conn, [f"{id_col} = ?"], [include_id], 1))
+            if not query:
+                frames.append(select(conn, [], [], limit))
+            else:
+                prefix = query.upper()
+                found = select(conn, [f"{id_col} >= ?", f"{id_col} < ?"],
+                               [prefix, prefix + "\uffff"], limit)
+                frames.append(found)
+                if len(found) < limit:
+                    like = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                    match = " OR ".join(f"{c} LIKE ? ESCAPE '\\'" for c in (id_col, *text_cols))
+                    extra, extra_params = [f"({match})"], [like] * (len(text_cols) + 1)
+                    seen = found[id_col].tolist()
+                    if seen:
+                        extra.append(f"{id_col} NOT IN ({', '.join('?' for _ in seen)})")
+                        extra_params += seen
+                    frames.append(select(conn, extra, extra_params, limit - len(found)))
+        frames = [f for f in frames if not f.empty] or frames[-1:]
+        df = pd.concat(frames, ignore_index=True).drop_duplicates(id_col)
+        return self._frame(df.reset_index(drop=True), table)
+
+    def _frame(self, df, table):
+        """Return *df* read from *table* with object_type normalised and declared dtypes applied."""
+        df = self._norm_df(df)
+        dtypes = {**_TABLE_DTYPES[table], **_COMPUTED_DTYPES}
+        dtypes = {col: dtype for col, dtype in dtypes.items() if col in df.columns}
+        for col, dtype in dtypes.items():
+            if dtype.startswith("datetime64"):
+                df[col] = pd.to_datetime(df[col], format="ISO8601", errors="coerce")
+            elif dtype == "boolean":
+                # INTEGER 0/1 flags; NULL counts as unset.
+                df[col] = df[col].astype("boolean").fillna(False)
+            else:
+                df[col] = df[col].astype(dtype)
+        return df
+
+    def _read_frame(self, sql, params, table, arrow=False):
+        """Run the read *sql* and return its rows from *table* as a _frame() DataFrame.
+
+        With *arrow* the frame is built straight from the cursor as Arrow
+        arrays and returned with Arrow-backed dtypes (``pd.ArrowDtype``):
+        no intermediate object-dtype copy, and st.dataframe can hand the
+        columns to the browser without converting them again.  Meant for
+        pages that only display the result; the categories become Arrow
+        dictionaries, flags and counts Arrow booleans and integers.
+        """
+        with self._read_conn() as conn:
+            if not arrow:
+                df = pd.read_sql_query(sql, conn, params=params)
+                return self._frame(df, table)
+            cur = conn.execute(sql, params)
+            names = [d[0] for d in cur.description]
+            rows = cur.fetchall()
+        dtypes = {**_TABLE_DTYPES[table], **_COMPUTED_DTYPES}
+        arrays = []
+        for name, values in zip(names, zip(*rows) if rows else [()] * len(names)):
+            if name == "object_type":
+                canon = {v: self.normalize_object_type(v) for v in set(values)}
+                values = [canon[v] for v in values]
+            arrays.append(_arrow_array(values, _ARROW_TYPES.get(dtypes.get(name))))
+        return pa.Table.from_arrays(arrays, names=names).to_pandas(types_mapper=pd.ArrowDtype)
+
+    def clear_memo(self):
+        """Drop all memoised read results held by this handler."""
+        self._memo.clear()
+
+    def _sync_memo_run(self):
+        """Drop the memo if it was filled in an earlier script run (see _memoized)."""
+        run = _script_run()
+        if run is not None and run is not self._memo_run:
+            self._memo.clear()
+            self._memo_run = run
+
+    @staticmethod
+    def to_iso_date(value):
+        """Return *value* as an ISO 'YYYY-MM-DD' string, or None if empty.
+
+        Accepts date/datetime objects and any string pandas can parse.
+        Raises ValueError for values that are not dates.
+        """
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return None
+        try:
+            ts = pd.Timestamp(value)
+        except (ValueError, TypeError) as exc:
+            raise ValueError(f"Invalid date: {value!r}") from exc
+        if pd.isna(ts):
+            return None
+        return ts.strftime("%Y-%m-%d")
+
     def normalize_object_type(self, value):
         """Normalise a raw object_type value to its canonical form."""
         if value is None:
@@ -222,7 +1130,9 @@ class DataHandler:
     # Objects
     # ------------------------------------------------------------------
 
-    def get_objects(self, object_type=None, user_email=None, is_admin=False):
+    @_memoized
+    def get_objects(self, object_type=None, user_email=None, is_admin=False, columns=None,
+                    arrow=False):
         """Get all objects or filtered by type and user."""
         clauses, params = [], []
         if object_type:
@@ -231,11 +1141,81 @@ class DataHandler:
         if user_email and not is_admin:
             clauses.append("user_email = ?")
             params.append(user_email)
-        sql = f"SELECT * FROM objects {self._where(clauses)}"
-        with self._get_conn() as conn:
-            df = pd.read_sql_query(sql, conn, params=params)
-        return self._norm_df(df)
+        sql = f"SELECT {_select_list('objects', columns)} FROM objects {self._where(clauses)}"
+        return self._read_frame(sql, params, "objects", arrow)
 
+    @_memoized
+    def get_object_summary(self, object_type=None, status=None, user_email=None, is_admin=False,
+                           columns=None, arrow=False):
+        """Get objects with their object_summary counts and dates in one read.
+
+        Adds services, open_services, next_due_date, pending_reminders,
+        reports, last_report_date, faults, photos and the latest meter
+        reading (last_reading, last_reading_date, meter_unit) to each object.
+        The counts are 0, never missing, for an object without a summary row.
+        """
+        clauses, params = [], []
+        if object_type:
+            clauses.append("o.object_type = ?")
+            params.append(self.normalize_object_type(object_type))
+        if status:
+            clauses.append("o.status = ?")
+            params.append(status)
+        if user_email and not is_admin:
+            clauses.append("o.user_email = ?")
+            params.append(user_email)
+        summary = {c: f"coalesce(s.{c}, 0) AS {c}" if c in _SUMMARY_COUNTS else f"s.{c}"
+                   for c in _SUMMARY_COLUMNS}
+        if columns is None:
+            select = "o.*, " + ", ".join(summary.values())
+        else:
+            select = _select_list("objects", columns, "o", summary)
+        sql = (
+            f"SELECT {select} "
+            f"FROM objects o LEFT JOIN object_summary s ON s.object_id = o.object_id "
+            f"{self._where(clauses)}"
+        )
+        return self._read_frame(sql, params, "object_summary", arrow)
+
+    @_memoized
+    def count_records(self, user_email=None, is_admin=False):
+        """Count services, pending reminders and fault reports for the Dashboard.
+
+        Counted from the tables themselves and scoped by each record's
+        user_email, so records of deleted objects are included.  Returns a
+        dict with keys services, pending_reminders and faults.
+        """
+        tables = {"services": ("services", []),
+                  "pending_reminders": ("reminders", ["status = 'Pending'"]),
+                  "faults": ("fault_reports", [])}
+        selects, params = [], []
+        for table, clauses in tables.values():
+            if user_email and not is_admin:
+                clauses = [*clauses, "user_email = ?"]
+                params.append(user_email)
+            selects.append(f"SELECT COUNT(*) FROM {table} {self._where(clauses)}")
+        with self._read_conn() as conn:
+            rows = conn.execute(" UNION ALL ".join(selects), params).fetchall()
+        return {key: row[0] for key, row in zip(tables, rows)}
+
+    @_memoized
+    def search_objects(self, query="", object_type=None, status=None, user_email=None,
+                       is_admin=False, limit=SEARCH_LIMIT, include_id=None):
+        """Search objects by ID prefix or name/description substring."""
+        clauses, params = [], []
+        if object_type:
+            clauses.append("object_type = ?")
+            params.append(self.normalize_object_type(object_type))
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if user_email and not is_admin:
+            clauses.append("user_email = ?")
+            params.append(user_email)
+        return self._search("objects", "object_id", ("name", "description"), query,
+                            clauses, params, limit, include_id)
+
+    @_invalidates
     def add_object(self, object_type, name, description="", status="Active", user_email=None):
         """Add a new object."""
         object_type = self.normalize_object_type(object_type)
@@ -254,6 +1234,7 @@ class DataHandler:
             )
         return object_id
 
+    @_invalidates
     def update_object(self, object_id, **kwargs):
         """Update an object."""
         # Column names are validated against the known-column frozenset before
@@ -278,6 +1259,7 @@ class DataHandler:
             )
         return cur.rowcount > 0
 
+    @_invalidates
     def delete_object(self, object_id):
         """Delete an object."""
         with self._get_conn() as conn:
@@ -287,7 +1269,9 @@ class DataHandler:
     # Services
     # ------------------------------------------------------------------
 
-    def get_services(self, object_type=None, object_id=None, user_email=None, is_admin=False):
+    @_memoized
+    def get_services(self, object_type=None, object_id=None, user_email=None, is_admin=False,
+                     columns=None, arrow=False):
         """Get services filtered by type, object, and user."""
         clauses, params = [], []
         if object_type:
@@ -299,11 +1283,57 @@ class DataHandler:
         if user_email and not is_admin:
             clauses.append("user_email = ?")
             params.append(user_email)
-        sql = f"SELECT * FROM services {self._where(clauses)}"
-        with self._get_conn() as conn:
-            df = pd.read_sql_query(sql, conn, params=params)
-        return self._norm_df(df)
+        sql = f"SELECT {_select_list('services', columns)} FROM services {self._where(clauses)}"
+        return self._read_frame(sql, params, "services", arrow)
+
+    @_memoized
+    def search_services(self, query="", object_type=None, user_email=None,
+                        is_admin=False, limit=SEARCH_LIMIT, include_id=None):
+        """Search services by ID prefix or name/description/object substring."""
+        clauses, params = [], []
+        if object_type:
+            clauses.append("object_type = ?")
+            params.append(self.normalize_object_type(object_type))
+        if user_email and not is_admin:
+            clauses.append("user_email = ?")
+            params.append(user_email)
+        return self._search("services", "service_id", ("service_name", "description", "object_id"), query,
+                            clauses, params, limit, include_id)
+
+    @_memoized
+    def get_services_due(self, object_type=None, user_email=None, is_admin=False,
+                         within_days=None, limit=None, today=None, columns=None):
+        """Get services with SQL-computed ``days_until``/``overdue``, soonest first.
+
+        *within_days* keeps only services due at most that many days after
+        *today* (overdue ones included) and *limit* caps the row count; both
+        are served by the next_service_date index.  days_until and overdue
+        are returned whatever *columns* selects.
+        """
+        today = self.to_iso_date(today) or date.today().isoformat()
+        clauses, params = [], []
+        if object_type:
+            clauses.append("object_type = ?")
+            params.append(self.normalize_object_type(object_type))
+        if user_email and not is_admin:
+            clauses.append("user_email = ?")
+            params.append(user_email)
+        if within_days is not None:
+            clauses.append("next_service_date <= date(?, ?)")
+            params += [today, f"{int(within_days):+d} days"]
+        sql = (
+            f"SELECT {_select_list('services', columns)}, "
+            "CAST(julianday(next_service_date) - julianday(?) AS INTEGER) AS days_until, "
+            "next_service_date < ? AS overdue "
+            f"FROM services {self._where(clauses)} ORDER BY next_service_date NULLS LAST"
+        )
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._read_conn() as conn:
+            df = pd.read_sql_query(sql, conn, params=[today, today] + params)
+        return self._frame(df, "services")
 
+    @_invalidates
     def add_service(self, object_id, object_type, service_name, interval_days,
                     description="", status="Scheduled", notes="",
                     expected_meter_reading=None, meter_unit=None, user_email=None):
@@ -324,41 +1354,104 @@ class DataHandler:
             )
         return service_id
 
+    @_invalidates
     def update_service(self, service_id, **kwargs):
         """Update a service."""
         valid = _TABLE_COLUMNS["services"]
-        sets, params = [], []
+        sets, params, dates = [], [], {}
         for key, value in kwargs.items():
             if key not in valid:
                 continue
             if key == "object_type":
                 value = self.normalize_object_type(value)
+            elif key in _DATE_COLUMNS["services"]:
+                value = dates[key] = self.to_iso_date(value)
             sets.append(f"{key} = ?")
             params.append(value)
         if not sets:
             return False
         params.append(service_id)
         with self._get_conn() as conn:
+            old = conn.execute(
+                "SELECT interval_days, last_service_date, next_service_date "
+                "FROM services WHERE service_id = ?", (service_id,)
+            ).fetchone()
             cur = conn.execute(
                 f"UPDATE services SET {', '.join(sets)} WHERE service_id = ?", params
             )
+            if old and "interval_days" in kwargs and kwargs["interval_days"] != old[0]:
+                # A new interval moves the next date of a service completed by
+                # reports – unless the same edit typed in a date of its own.
+                typed = any(dates[key] != stored for key, stored in
+                            zip(("last_service_date", "next_service_date"), old[1:])
+                            if key in dates)
+                if not typed:
+                    self._reschedule(conn, [service_id])
         return cur.rowcount > 0
 
+    @_invalidates
     def delete_service(self, service_id):
         """Delete a service."""
         with self._get_conn() as conn:
             conn.execute("DELETE FROM services WHERE service_id = ?", (service_id,))
 
+    @staticmethod
+    def _reschedule(conn, service_ids=None):
+        """Roll last/next service dates forward from linked reports.
+
+        Runs _RESCHEDULE_SQL once for *service_ids* (all services when None)
+        on the caller's connection.  Returns the number of services changed.
+        """
+        if service_ids is None:
+            return conn.execute(_RESCHEDULE_SQL.format(scope="")).rowcount
+        ids = json.dumps([str(sid) for sid in service_ids])
+        return conn.execute(
+            _RESCHEDULE_SQL.format(scope="WHERE s.service_id IN (SELECT value FROM json_each(?))"),
+            (ids,),
+        ).rowcount
+
+    @staticmethod
+    def _unschedule(conn, service_id, completion_date):
+        """Roll a service's dates back after its report of *completion_date* went away.
+
+        Only undoes what the report set: if last_service_date is that report's
+        date it moves back to the latest remaining report.  Without one the
+        dates are kept, as the date before the first report is not stored.
+        """
+        conn.execute(
+            "UPDATE services "
+            "SET last_service_date = r.last_date, "
+            "    next_service_date = coalesce(date(r.last_date, '+' || services.interval_days || ' days'), "
+            "                                 services.next_service_date) "
+            "FROM (SELECT MAX(completion_date) AS last_date FROM reports WHERE service_id = ?) AS r "
+            "WHERE services.service_id = ? AND r.last_date IS NOT NULL "
+            "  AND services.last_service_date = ?",
+            (service_id, service_id, completion_date),
+        )
+
+    @_invalidates
+    def recompute_service_schedule(self):
+        """Recompute last/next service dates for the whole fleet in one UPDATE.
+
+        Only services with linked reports are rescheduled; the dates of the
+        others were entered by hand and are kept.  Returns the number of
+        services whose dates changed.
+        """
+        with self._get_conn() as conn:
+            return self._reschedule(conn)
+
     # ------------------------------------------------------------------
     # Meter units
     # ------------------------------------------------------------------
 
+    @_memoized
     def get_meter_units(self):
         """Return list of configured meter units."""
-        with self._get_conn() as conn:
+        with self._read_conn() as conn:
             rows = conn.execute("SELECT unit FROM meter_units ORDER BY unit").fetchall()
         return [r[0] for r in rows]
 
+    @_invalidates
     def add_meter_unit(self, unit):
         """Add a new meter unit if not present."""
         unit = str(unit).strip()
@@ -371,6 +1464,7 @@ class DataHandler:
         except sqlite3.IntegrityError:
             return False
 
+    @_invalidates
     def delete_meter_unit(self, unit):
         """Delete a meter unit if it exists."""
         with self._get_conn() as conn:
@@ -381,8 +1475,9 @@ class DataHandler:
     # Reminders
     # ------------------------------------------------------------------
 
+    @_memoized
     def get_reminders(self, object_type=None, object_id=None, status=None,
-                      user_email=None, is_admin=False):
+                      user_email=None, is_admin=False, columns=None, arrow=False):
         """Get reminders filtered by criteria and user."""
         clauses, params = [], []
         if object_type:
@@ -397,15 +1492,76 @@ class DataHandler:
         if user_email and not is_admin:
             clauses.append("user_email = ?")
             params.append(user_email)
-        sql = f"SELECT * FROM reminders {self._where(clauses)}"
-        with self._get_conn() as conn:
-            df = pd.read_sql_query(sql, conn, params=params)
-        return self._norm_df(df)
+        sql = f"SELECT {_select_list('reminders', columns)} FROM reminders {self._where(clauses)}"
+        return self._read_frame(sql, params, "reminders", arrow)
+
+    @_memoized
+    def search_reminders(self, query="", object_type=None, status=None, user_email=None,
+                         is_admin=False, limit=SEARCH_LIMIT, include_id=None):
+        """Search reminders by ID prefix or notes/service/object substring."""
+        clauses, params = [], []
+        if object_type:
+            clauses.append("object_type = ?")
+            params.append(self.normalize_object_type(object_type))
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if user_email and not is_admin:
+            clauses.append("user_email = ?")
+            params.append(user_email)
+        return self._search("reminders", "reminder_id", ("notes", "service_id", "object_id"), query,
+                            clauses, params, limit, include_id)
+
+    @_memoized
+    def get_reminders_due(self, object_type=None, status=None, user_email=None,
+                          is_admin=False, within_days=None, limit=None, today=None, columns=None):
+        """Get reminders with SQL-computed ``days_until``/``overdue``, soonest first.
+
+        Filtering and ordering follow get_services_due, on reminder_date.
+        """
+        today = self.to_iso_date(today) or date.today().isoformat()
+        clauses, params = [], []
+        if object_type:
+            clauses.append("object_type = ?")
+            params.append(self.normalize_object_type(object_type))
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if user_email and not is_admin:
+            clauses.append("user_email = ?")
+            params.append(user_email)
+        if within_days is not None:
+            clauses.append("reminder_date <= date(?, ?)")
+            params += [today, f"{int(within_days):+d} days"]
+        sql = (
+            f"SELECT {_select_list('reminders', columns)}, "
+            "CAST(julianday(reminder_date) - julianday(?) AS INTEGER) AS days_until, "
+            "reminder_date < ? AS overdue "
+            f"FROM reminders {self._where(clauses)} ORDER BY reminder_date NULLS LAST"
+        )
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._read_conn() as conn:
+            df = pd.read_sql_query(sql, conn, params=[today, today] + params)
+        return self._frame(df, "reminders")
 
+    @_memoized
+    def count_email_queue(self, today=None):
+        """Count pending reminders due by *today* whose notification email is unsent."""
+        today = self.to_iso_date(today) or date.today().isoformat()
+        with self._read_conn() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM reminders WHERE status = 'Pending' AND reminder_date <= ? "
+                "AND email_notification = 1 AND email_sent = 0",
+                (today,),
+            ).fetchone()[0]
+
+    @_invalidates
     def add_reminder(self, service_id, object_id, object_type, reminder_date, notes="",
                      user_email=None, email_notification=False, notification_time="09:00"):
         """Add a new reminder."""
         object_type = self.normalize_object_type(object_type)
+        reminder_date = self.to_iso_date(reminder_date)
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         with self._get_conn() as conn:
             row = conn.execute(
@@ -413,13 +1569,44 @@ class DataHandler:
             ).fetchone()
             reminder_id = f"REM-{(row[0] or 0) + 1:05d}"
             conn.execute(
-                "INSERT INTO reminders VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
+                "INSERT INTO reminders VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)",
                 (reminder_id, service_id, object_id, object_type, reminder_date,
                  "Pending", notes, now, user_email,
-                 1 if email_notification else 0, notification_time, 0),
+                 1 if email_notification else 0, notification_time, 0, None),
             )
         return reminder_id
 
+    @_invalidates
+    def generate_reminders(self, lead_days=7, within_days=30, email_notification=False,
+                           notification_time="09:00", notes="Generated from service schedule",
+                           object_type=None, user_email=None, is_admin=False, today=None):
+        """Create reminders for every service due within *within_days* of *today*.
+
+        Each reminder is dated *lead_days* before the service's
+        next_service_date (or today, if that is already past).  Services
+        that already have a reminder for their current due date are
+        skipped, so the job can run as often as wanted.  All reminders are
+        written by one INSERT ... SELECT.  Returns the number created.
+        """
+        today = self.to_iso_date(today) or date.today().isoformat()
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        clauses, params = [], []
+        if object_type:
+            clauses.append("AND s.object_type = ?")
+            params.append(self.normalize_object_type(object_type))
+        if user_email and not is_admin:
+            clauses.append("AND s.user_email = ?")
+            params.append(user_email)
+        sql = _GENERATE_REMINDERS_SQL.format(scope=" ".join(clauses))
+        with self._get_conn() as conn:
+            cur = conn.execute(sql, [
+                f"{-int(lead_days):+d} days", today, notes, now,
+                1 if email_notification else 0, notification_time,
+                today, f"{int(within_days):+d} days", *params,
+            ])
+        return cur.rowcount
+
+    @_invalidates
     def update_reminder(self, reminder_id, **kwargs):
         """Update a reminder."""
         valid = _TABLE_COLUMNS["reminders"]
@@ -429,6 +1616,8 @@ class DataHandler:
                 continue
             if key == "object_type":
                 value = self.normalize_object_type(value)
+            elif key in _DATE_COLUMNS["reminders"]:
+                value = self.to_iso_date(value)
             sets.append(f"{key} = ?")
             params.append(value)
         if not sets:
@@ -440,6 +1629,7 @@ class DataHandler:
             )
         return cur.rowcount > 0
 
+    @_invalidates
     def delete_reminder(self, reminder_id):
         """Delete a reminder."""
         with self._get_conn() as conn:
@@ -452,7 +1642,9 @@ class DataHandler:
     # Reports
     # ------------------------------------------------------------------
 
-    def get_reports(self, object_type=None, object_id=None, user_email=None, is_admin=False):
+    @_memoized
+    def get_reports(self, object_type=None, object_id=None, user_email=None, is_admin=False,
+                    columns=None, arrow=False):
         """Get reports filtered by criteria and user."""
         clauses, params = [], []
         if object_type:
@@ -464,16 +1656,38 @@ class DataHandler:
         if user_email and not is_admin:
             clauses.append("user_email = ?")
             params.append(user_email)
-        sql = f"SELECT * FROM reports {self._where(clauses)}"
-        with self._get_conn() as conn:
-            df = pd.read_sql_query(sql, conn, params=params)
-        return self._norm_df(df)
+        sql = f"SELECT {_select_list('reports', columns)} FROM reports {self._where(clauses)}"
+        return self._read_frame(sql, params, "reports", arrow)
 
+    @_memoized
+    def search_reports(self, query="", object_type=None, report_type=None, user_email=None,
+                       is_admin=False, limit=SEARCH_LIMIT, include_id=None):
+        """Search reports by ID prefix or title/description/object substring."""
+        clauses, params = [], []
+        if object_type:
+            clauses.append("object_type = ?")
+            params.append(self.normalize_object_type(object_type))
+        if report_type:
+            clauses.append("report_type = ?")
+            params.append(report_type)
+        if user_email and not is_admin:
+            clauses.append("user_email = ?")
+            params.append(user_email)
+        return self._search("reports", "report_id", ("title", "description", "object_id"), query,
+                            clauses, params, limit, include_id)
+
+    @_invalidates
     def add_report(self, object_id, object_type, report_type, title,
                    description="", completion_date=None, notes="",
-                   actual_meter_reading=None, meter_unit=None, user_email=None):
-        """Add a new report."""
+                   actual_meter_reading=None, meter_unit=None, user_email=None,
+                   service_id=None):
+        """Add a new report.
+
+        When *service_id* is given the report completes that service, whose
+        last/next service dates are rolled forward in the same transaction.
+        """
         object_type = self.normalize_object_type(object_type)
+        completion_date = self.to_iso_date(completion_date)
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         with self._get_conn() as conn:
             row = conn.execute(
@@ -481,13 +1695,17 @@ class DataHandler:
             ).fetchone()
             report_id = f"REP-{(row[0] or 0) + 1:05d}"
             conn.execute(
-                "INSERT INTO reports VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
+                "INSERT INTO reports VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)",
                 (report_id, object_id, object_type, report_type, title, description,
                  completion_date or datetime.now().strftime("%Y-%m-%d"),
-                 notes, now, actual_meter_reading, meter_unit, user_email),
+                 notes, now, actual_meter_reading, meter_unit, user_email,
+                 service_id or None),
             )
+            if service_id:
+                self._reschedule(conn, [service_id])
         return report_id
 
+    @_invalidates
     def update_report(self, report_id, **kwargs):
         """Update a report."""
         valid = _TABLE_COLUMNS["reports"]
@@ -497,28 +1715,55 @@ class DataHandler:
                 continue
             if key == "object_type":
                 value = self.normalize_object_type(value)
+            elif key in _DATE_COLUMNS["reports"]:
+                value = self.to_iso_date(value)
             sets.append(f"{key} = ?")
             params.append(value)
         if not sets:
             return False
         params.append(report_id)
         with self._get_conn() as conn:
+            before = conn.execute(
+                "SELECT service_id, completion_date FROM reports WHERE report_id = ?", (report_id,)
+            ).fetchone()
             cur = conn.execute(
                 f"UPDATE reports SET {', '.join(sets)} WHERE report_id = ?", params
             )
+            after = conn.execute(
+                "SELECT service_id, completion_date FROM reports WHERE report_id = ?", (report_id,)
+            ).fetchone()
+            if before and before[0] and tuple(before) != tuple(after):
+                self._unschedule(conn, before[0], before[1])
+            affected = {row[0] for row in (before, after) if row and row[0]}
+            if affected:
+                self._reschedule(conn, affected)
         return cur.rowcount > 0
 
+    @_invalidates
     def delete_report(self, report_id):
-        """Delete a report."""
+        """Delete a report, rolling back the dates it set on its service."""
         with self._get_conn() as conn:
+            row = conn.execute(
+                "SELECT service_id, completion_date FROM reports WHERE report_id = ?", (report_id,)
+            ).fetchone()
             cur = conn.execute("DELETE FROM reports WHERE report_id = ?", (report_id,))
+            if row and row[0]:
+                self._unschedule(conn, row[0], row[1])
         return cur.rowcount > 0
 
     # ------------------------------------------------------------------
     # Fault reports
     # ------------------------------------------------------------------
 
-    def get_fault_reports(self, object_type=None, object_id=None, user_email=None, is_admin=False):
+    @_memoized
+    def get_fault_reports(self, object_type=None, object_id=None, user_email=None, is_admin=False,
+                          limit=None, columns=None, arrow=False):
+        """Get fault reports, filtered by type, object and user.
+
+        With *limit* only the latest *limit* reports are returned, newest
+        first (walking the created_date indexes).  *columns* may also name
+        ``photos``, the report's number of stored photos.
+        """
         clauses, params = [], []
         if object_type:
             clauses.append("object_type = ?")
@@ -529,15 +1774,34 @@ class DataHandler:
         if user_email and not is_admin:
             clauses.append("user_email = ?")
             params.append(user_email)
-        sql = f"SELECT * FROM fault_reports {self._where(clauses)}"
-        with self._get_conn() as conn:
-            df = pd.read_sql_query(sql, conn, params=params)
-        return self._norm_df(df)
+        photos = {"photos": "(SELECT COUNT(*) FROM fault_photos p "
+                            "WHERE p.fault_id = fault_reports.fault_id) AS photos"}
+        sql = (f"SELECT {_select_list('fault_reports', columns, extra=photos)} FROM fault_reports "
+               f"{self._where(clauses)}")
+        if limit is not None:
+            sql += f" ORDER BY created_date DESC LIMIT {int(limit)}"
+        return self._read_frame(sql, params, "fault_reports", arrow)
 
+    @_memoized
+    def search_fault_reports(self, query="", object_type=None, user_email=None,
+                             is_admin=False, limit=SEARCH_LIMIT, include_id=None):
+        """Search fault reports by ID prefix or description/object substring."""
+        clauses, params = [], []
+        if object_type:
+            clauses.append("object_type = ?")
+            params.append(self.normalize_object_type(object_type))
+        if user_email and not is_admin:
+            clauses.append("user_email = ?")
+            params.append(user_email)
+        return self._search("fault_reports", "fault_id", ("description", "object_id"), query,
+                            clauses, params, limit, include_id)
+
+    @_invalidates
     def add_fault_report(self, object_id, object_type, observation_date,
                          actual_meter_reading, meter_unit, description,
                          photo_paths=None, user_email=None):
         object_type = self.normalize_object_type(object_type)
+        observation_date = self.to_iso_date(observation_date)
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         with self._get_conn() as conn:
             row = conn.execute(
@@ -553,6 +1817,7 @@ class DataHandler:
             )
         return fault_id
 
+    @_invalidates
     def update_fault_report(self, fault_id, **kwargs):
         """Update a fault report by fault_id. kwargs keys must match column names."""
         valid = _TABLE_COLUMNS["fault_reports"]
@@ -562,6 +1827,8 @@ class DataHandler:
                 continue
             if key == "object_type":
                 value = self.normalize_object_type(value)
+            elif key in _DATE_COLUMNS["fault_reports"]:
+                value = self.to_iso_date(value)
             sets.append(f"{key} = ?")
             params.append(value)
         if not sets:
@@ -573,6 +1840,7 @@ class DataHandler:
             )
         return cur.rowcount > 0
 
+    @_invalidates
     def delete_fault_report(self, fault_id):
         """Delete a single fault report and its associated photos."""
         with self._get_conn() as conn:
@@ -586,6 +1854,7 @@ class DataHandler:
     # Fault photos (BLOB storage)
     # ------------------------------------------------------------------
 
+    @_invalidates
     def save_fault_photo(self, fault_id, filename, mime_type, data):
         """Store a photo BLOB for *fault_id*. Returns the new photo_id."""
         with self._get_conn() as conn:
@@ -600,9 +1869,10 @@ class DataHandler:
             )
         return photo_id
 
+    @_memoized
     def get_fault_photos(self, fault_id):
         """Return a list of photo dicts for *fault_id* (photo_id, filename, mime_type, data)."""
-        with self._get_conn() as conn:
+        with self._read_conn() as conn:
             rows = conn.execute(
                 "SELECT photo_id, filename, mime_type, data FROM fault_photos "
                 "WHERE fault_id = ? ORDER BY photo_id",
@@ -613,21 +1883,358 @@ class DataHandler:
             for r in rows
         ]
 
+    @_memoized
+    def get_photo_store_stats(self):
+        """Return {"count": n, "bytes": total size} of the stored fault photos."""
+        with self._read_conn() as conn:
+            # length() of a BLOB is read from the record header, not the data.
+            count, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(length(data)), 0) "
+                                       "FROM fault_photos").fetchone()
+        return {"count": count, "bytes": size}
+
+    @_invalidates
     def delete_fault_photo(self, photo_id):
         """Delete a single fault photo by photo_id."""
         with self._get_conn() as conn:
             cur = conn.execute("DELETE FROM fault_photos WHERE photo_id = ?", (photo_id,))
         return cur.rowcount > 0
 
+    @_invalidates
     def delete_fault_photos(self, fault_id):
         """Delete all photos for a fault report."""
         with self._get_conn() as conn:
             conn.execute("DELETE FROM fault_photos WHERE fault_id = ?", (fault_id,))
 
+    # ------------------------------------------------------------------
+    # Meter readings and usage forecasts
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _backfill_meter_readings(conn):
+        """Copy readings from existing reports and fault reports into meter_readings."""
+        # Table and column names come from _METER_SOURCES, not user input.
+        for source, (table, key, date_col) in _METER_SOURCES.items():
+            conn.execute(
+                "INSERT OR IGNORE INTO meter_readings "
+                "(object_id, reading_date, reading, meter_unit, source, source_id, user_email) "
+                f"SELECT object_id, coalesce({date_col}, date(created_date)), "
+                f"actual_meter_reading, coalesce(meter_unit, ''), ?, {key}, user_email "
+                f"FROM {table} WHERE actual_meter_reading > 0",
+                (source,),
+            )
+
+    @_memoized
+    def get_meter_readings(self, object_id=None, user_email=None, is_admin=False, columns=None,
+                           arrow=False):
+        """Get meter readings, oldest first, filtered by object and user."""
+        clauses, params = [], []
+        if object_id:
+            clauses.append("object_id = ?")
+            params.append(object_id)
+        if user_email and not is_admin:
+            clauses.append("user_email = ?")
+            params.append(user_email)
+        sql = (
+            f"SELECT {_select_list('meter_readings', columns)} FROM meter_readings "
+            f"{self._where(clauses)} "
+            "ORDER BY object_id, reading_date, reading_id"
+        )
+        return self._read_frame(sql, params, "meter_readings", arrow)
+
+    @_invalidates
+    def add_meter_reading(self, object_id, reading, reading_date=None, meter_unit=None,
+                          user_email=None):
+        """Record a manual meter reading. Returns the new reading_id."""
+        reading_date = self.to_iso_date(reading_date) or date.today().isoformat()
+        with self._get_conn() as conn:
+            cur = conn.execute(
+                "INSERT INTO meter_readings "
+                "(object_id, reading_date, reading, meter_unit, source, user_email) "
+                "VALUES (?,?,?,?,'manual',?)",
+                (object_id, reading_date, float(reading), meter_unit or "", user_email),
+            )
+        return cur.lastrowid
+
+    @_invalidates
+    def delete_meter_reading(self, reading_id):
+        """Delete a manual meter reading (report readings follow their report)."""
+        with self._get_conn() as conn:
+            cur = conn.execute(
+                "DELETE FROM meter_readings WHERE reading_id = ? AND source = 'manual'",
+                (int(reading_id),),
+            )
+        return cur.rowcount > 0
+
+    def _usage_is_dirty(self):
+        """Whether any object's readings changed since its usage rate was computed."""
+        with self._read_conn() as conn:
+            return conn.execute("SELECT 1 FROM usage_dirty LIMIT 1").fetchone() is not None
+
+    def _refresh_stale_forecasts(self):
+        """Refresh usage forecasts for the forecast getters, writing only if one is stale.
+
+        Inside a read_snapshot() nothing is refreshed: the forecasts are read
+        as of the snapshot, like everything else in it.
+        """
+        if getattr(self._snapshot, "conn", None) is None and self._usage_is_dirty():
+            self.refresh_usage_forecasts()
+
+    @_invalidates
+    def refresh_usage_forecasts(self):
+        """Recompute usage rates for objects whose readings changed.
+
+        Only objects listed in usage_dirty (filled by triggers on
+        meter_readings) are re-read and re-fitted.  Returns the number of
+        objects recomputed.
+        """
+        with self._get_conn() as conn:
+            if not conn.in_transaction:
+                # IMMEDIATE: readings added while we compute wait for the commit,
+                # so no dirty mark is cleared without being processed.  (A
+                # single-writer job already runs in an IMMEDIATE transaction.)
+                conn.execute("BEGIN IMMEDIATE")
+            dirty = [r[0] for r in conn.execute("SELECT object_id FROM usage_dirty")]
+            if not dirty:
+                return 0
+            df = pd.read_sql_query(
+                "SELECT m.object_id, m.meter_unit, m.reading_date, "
+                "julianday(m.reading_date) AS t, m.reading "
+                "FROM meter_readings m JOIN usage_dirty d ON d.object_id = m.object_id",
+                conn,
+            )
+            codes, keys = pd.MultiIndex.from_frame(df[["object_id", "meter_unit"]]).factorize()
+            fit = forecast.usage_rates(codes, df["t"].to_numpy(), df["reading"].to_numpy(),
+                                       n_groups=len(keys))
+            last = fit["last"]
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            rows = [
+                (object_id, unit, None if np.isnan(rate) else float(rate), int(n),
+                 float(df["reading"].iat[i]), df["reading_date"].iat[i], now)
+                for (object_id, unit), rate, n, i in zip(keys, fit["rate"], fit["n"], last)
+            ]
+            conn.execute(
+                "DELETE FROM usage_forecasts WHERE object_id IN "
+                "(SELECT object_id FROM usage_dirty)"
+            )
+            conn.executemany("INSERT INTO usage_forecasts VALUES (?,?,?,?,?,?,?)", rows)
+            conn.execute("DELETE FROM usage_dirty")
+        return len(dirty)
+
+    @_memoized
+    def get_usage_forecasts(self, object_id=None, user_email=None, is_admin=False):
+        """Return usage rate per object and meter unit (refreshing stale ones first)."""
+        self._refresh_stale_forecasts()
+        clauses, params = [], []
+        if object_id:
+            clauses.append("f.object_id = ?")
+            params.append(object_id)
+        if user_email and not is_admin:
+            clauses.append("o.user_email = ?")
+            params.append(user_email)
+        sql = (
+            "SELECT f.* FROM usage_forecasts f "
+            "LEFT JOIN objects o ON o.object_id = f.object_id "
+            f"{self._where(clauses)} ORDER BY f.object_id, f.meter_unit"
+        )
+        with self._read_conn() as conn:
+            df = pd.read_sql_query(sql, conn, params=params)
+        return self._frame(df, "usage_forecasts")
+
+    @_memoized
+    def get_service_forecasts(self, object_type=None, object_id=None, user_email=None,
+                              is_admin=False, columns=None):
+        """Services with an expected meter reading and when it will be reached.
+
+        Adds rate_per_day, last_reading, last_reading_date and meter_due_date
+        (the projected date of expected_meter_reading at the object's current
+        usage rate; empty when there is no rate yet).
+        """
+        self._refresh_stale_forecasts()
+        clauses, params = ["s.expected_meter_reading > 0"], []
+        if object_type:
+            clauses.append("s.object_type = ?")
+            params.append(self.normalize_object_type(object_type))
+        if object_id:
+            clauses.append("s.object_id = ?")
+            params.append(object_id)
+        if user_email and not is_admin:
+            clauses.append("s.user_email = ?")
+            params.append(user_email)
+        # The projection needs the expected reading, even if not asked for.
+        needed = None if columns is None else [*columns, "expected_meter_reading"]
+        sql = (
+            f"SELECT {_select_list('services', needed, 's')}, "
+            "f.rate_per_day, f.last_reading, f.last_reading_date, "
+            "julianday(f.last_reading_date) AS last_t "
+            "FROM services s LEFT JOIN usage_forecasts f "
+            "ON f.object_id = s.object_id AND f.meter_unit = coalesce(s.meter_unit, '') "
+            f"{self._where(clauses)}"
+        )
+        with self._read_conn() as conn:
+            df = pd.read_sql_query(sql, conn, params=params)
+        due_t = forecast.project_days(
+            df["last_t"].to_numpy(dtype=float), df["last_reading"].to_numpy(dtype=float),
+            df["rate_per_day"].to_numpy(dtype=float),
+            df["expected_meter_reading"].to_numpy(dtype=float),
+        )
+        # julianday() 2440587.5 is 1970-01-01 00:00.
+        df["meter_due_date"] = pd.to_datetime(due_t - 2440587.5, unit="D")
+        drop = ["last_t"]
+        if columns is not None and "expected_meter_reading" not in columns:
+            drop.append("expected_meter_reading")
+        return self._frame(df.drop(columns=drop), "services")
+
+    # ------------------------------------------------------------------
+    # Full-text search
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _index_all(conn):
+        """Index every searchable record; search_docs/search_index must be empty."""
+        # Table, column and SQL fragments come from _SEARCH_SOURCES, not user input.
+        for kind, (table, key, title, body, _watched) in _SEARCH_SOURCES.items():
+            conn.execute(
+                "INSERT INTO search_docs (kind, record_id, object_id, object_type, user_email) "
+                f"SELECT ?, {key}, object_id, object_type, user_email FROM {table}",
+                (kind,),
+            )
+            conn.execute(
+                "INSERT INTO search_index (rowid, title, body) "
+                f"SELECT d.doc_id, {title.format(r='r')}, {body.format(r='r')} "
+                f"FROM {table} r JOIN search_docs d ON d.kind = ? AND d.record_id = r.{key}",
+                (kind,),
+            )
+
+    @_invalidates
+    def rebuild_search_index(self):
+        """Drop and rebuild the full-text index from the source tables."""
+        with self._get_conn() as conn:
+            conn.execute("DELETE FROM search_index")
+            conn.execute("DELETE FROM search_docs")
+            self._index_all(conn)
+            conn.execute("INSERT INTO search_index (search_index) VALUES ('optimize')")
+
+    @staticmethod
+    def _fts_query(text):
+        """Turn free text into an FTS5 query: every word must match, the last as a prefix."""
+        words = [w.replace('"', "") for w in str(text or "").split()]
+        words = [w for w in words if w]
+        if not words:
+            return None
+        terms = [f'"{w}"' for w in words]
+        terms[-1] += "*"
+        return " ".join(terms)
+
+    def _text_clauses(self, match, kinds, user_email, is_admin):
+        clauses, params = ["search_index MATCH ?"], [match]
+        if kinds:
+            clauses.append(f"d.kind IN ({', '.join('?' * len(kinds))})")
+            params.extend(kinds)
+        if user_email and not is_admin:
+            clauses.append("d.user_email = ?")
+            params.append(user_email)
+        return clauses, params
+
+    @_memoized
+    def search_text(self, query, kinds=None, user_email=None, is_admin=False,
+                    limit=SEARCH_PAGE_SIZE, offset=0):
+        """Full-text search over faults, reports, services and reminders.
+
+        Args:
+            query: Free text; every word must match (the last one as a prefix).
+            kinds: Optional tuple of "fault", "report", "service", "reminder".
+
+        Returns a DataFrame ordered by relevance (bm25, titles weighted
+        higher) with kind, record_id, object_id, object_type, object_name,
+        title and a highlighted snippet.
+        """
+        columns = ["kind", "record_id", "object_id", "object_type", "object_name",
+                   "title", "snippet", "rank"]
+        match = self._fts_query(query)
+        if match is None:
+            return pd.DataFrame(columns=columns)
+        clauses, params = self._text_clauses(match, kinds, user_email, is_admin)
+        sql = (
+            "SELECT d.kind, d.record_id, d.object_id, d.object_type, o.name AS object_name, "
+            "search_index.title, "
+            "snippet(search_index, 1, '**', '**', ' … ', 16) AS snippet, "
+            "bm25(search_index, 5.0, 1.0) AS rank "
+            "FROM search_index JOIN search_docs d ON d.doc_id = search_index.rowid "
+            "LEFT JOIN objects o ON o.object_id = d.object_id "
+            f"{self._where(clauses)} ORDER BY rank LIMIT ? OFFSET ?"
+        )
+        with self._read_conn() as conn:
+            df = pd.read_sql_query(sql, conn, params=params + [int(limit), int(offset)])
+        return self._norm_df(df)
+
+    @_memoized
+    def count_search_matches(self, query, kinds=None, user_email=None, is_admin=False):
+        """Return the total number of search_text matches (for pagination)."""
+        match = self._fts_query(query)
+        if match is None:
+            return 0
+        clauses, params = self._text_clauses(match, kinds, user_email, is_admin)
+        sql = (
+            "SELECT COUNT(*) FROM search_index "
+            "JOIN search_docs d ON d.doc_id = search_index.rowid "
+            f"{self._where(clauses)}"
+        )
+        with self._read_conn() as conn:
+            return conn.execute(sql, params).fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Export (streamed from SQLite, never materialised as a whole)
+    # ------------------------------------------------------------------
+
+    def iter_csv(self, table, user_email=None, is_admin=False, chunksize=EXPORT_CHUNK_ROWS):
+        """Yield *table* as CSV text, *chunksize* rows at a time.
+
+        Only the first chunk carries the header.  Values are written as
+        stored (ISO dates, 0/1 flags), scoped to *user_email* unless admin.
+        """
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"Unknown export table: {table!r}")
+        clauses, params = [], []
+        if user_email and not is_admin:
+            clauses.append("user_email = ?")
+            params.append(user_email)
+        # Table name is validated against EXPORT_TABLES above.
+        sql = f"SELECT * FROM {table} {self._where(clauses)}"
+        conn = self._read_conn()
+        try:
+            header = True
+            for chunk in pd.read_sql_query(sql, conn, params=params, chunksize=chunksize):
+                yield self._norm_df(chunk).to_csv(index=False, header=header)
+                header = False
+            if header:
+                # Empty table: still emit the header row.
+                cols = [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+                yield pd.DataFrame(columns=cols).to_csv(index=False)
+        finally:
+            conn.close()
+
+    def iter_fault_photos(self, user_email=None, is_admin=False):
+        """Yield (photo_id, fault_id, filename, mime_type, data) one photo at a time."""
+        sql = (
+            "SELECT p.photo_id, p.fault_id, p.filename, p.mime_type, p.data "
+            "FROM fault_photos p JOIN fault_reports f ON f.fault_id = p.fault_id"
+        )
+        params = []
+        if user_email and not is_admin:
+            sql += " WHERE f.user_email = ?"
+            params.append(user_email)
+        sql += " ORDER BY p.photo_id"
+        conn = self._read_conn()
+        try:
+            yield from conn.execute(sql, params)
+        finally:
+            conn.close()
+
     # ------------------------------------------------------------------
     # Admin: delete all records for a user
     # ------------------------------------------------------------------
 
+    @_invalidates
     def delete_user_data(self, user_email):
         """Delete all records belonging to *user_email* across every table."""
         # Table names are hardcoded string literals, not user input – safe to interpolate.
@@ -638,5 +2245,6 @@ class DataHandler:
                 "(SELECT fault_id FROM fault_reports WHERE user_email = ?)",
                 (user_email,),
             )
-            for table in ("objects", "services", "reminders", "reports", "fault_reports"):
+            for table in ("objects", "services", "reminders", "reports", "fault_reports",
+                          "meter_readings"):
                 conn.execute(f"DELETE FROM {table} WHERE user_email = ?", (user_email,))
@@ -8,6 +8,8 @@ import yaml
 from datetime import datetime, date
 import os
 
+from utils import metrics
+
 class EmailNotifier:
     def __init__(self):
         self.config_file = "email_config.yaml"
@@ -72,10 +74,12 @@ class EmailNotifier:
                 server.send_message(msg)
             
             print(f"Email sent successfully to {to_email}")
+            metrics.EMAILS.inc(result="sent")
             return True
             
         except Exception as e:
             print(f"Error sending email: {e}")
+            metrics.EMAILS.inc(result="failed")
             return False
     
     def check_and_send_pending_reminders(self, reminders_df, users_config, data_handler=None):
@@ -130,7 +134,7 @@ class EmailNotifier:
                         'object_name': reminder.get('object_id', 'N/A'),
                         'object_type': reminder.get('object_type', 'N/A'),
                         'service_name': reminder.get('service_id', 'N/A'),
-                        'reminder_date': reminder.get('reminder_date', 'N/A'),
+                        'reminder_date': reminder_date.isoformat(),
                         'notes': reminder.get('notes', 'No additional notes')
                     }
                     
@@ -0,0 +1,89 @@
+"""On-demand data export: per-table CSV files and a full-database zip bundle.
+
+Everything here is lazy.  The Dashboard hands these functions to
+st.download_button as callables, so nothing is queried or serialised until
+the user actually clicks a download, and the data is streamed from SQLite
+in chunks (DataHandler.iter_csv / iter_fault_photos) rather than loaded into
+DataFrames first.
+
+Streamlit keeps a finished download in memory as bytes (it accepts only
+str, bytes and a few file types from the callable, and reads files whole),
+so a click costs about twice the size of the file for a moment: the
+collected chunks plus the joined result.  Only the generators themselves
+are bounded by one chunk or photo.
+"""
+
+import posixpath
+import zipfile
+
+from utils.data_handler import EXPORT_TABLES
+
+
+class _ChunkSink:
+    """Write-only, unseekable file object collecting bytes until drained.
+
+    zipfile falls back to streaming mode (data descriptors, no seeking) when
+    its target has no tell(), so the archive can be emitted piece by piece.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _photo_name(photo_id, fault_id, filename):
+    # Keep only the base name so stored filenames cannot escape photos/.
+    base = posixpath.basename((filename or "").replace("\\", "/")) or "photo"
+    return f"photos/{fault_id}/{photo_id}_{base}"
+
+
+def iter_bundle(handler, user_email=None, is_admin=False):
+    """Yield a zip archive of every table (as CSV) plus fault photos, in pieces.
+
+    The generator holds one CSV chunk or one photo at a time, however large
+    the database is.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for table in EXPORT_TABLES:
+            with zf.open(f"{table}.csv", "w") as f:
+                for text in handler.iter_csv(table, user_email=user_email, is_admin=is_admin):
+                    f.write(text.encode("utf-8"))
+                    yield sink.drain()
+        for photo_id, fault_id, filename, _mime, data in handler.iter_fault_photos(
+            user_email=user_email, is_admin=is_admin
+        ):
+            # Images are already compressed; store them as-is.
+            info = zipfile.ZipInfo(_photo_name(photo_id, fault_id, filename))
+            info.compress_type = zipfile.ZIP_STORED
+            with zf.open(info, "w") as f:
+                f.write(data)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def collect(chunks):
+    """Join an iterable of str/bytes chunks into the bytes of one download."""
+    return b"".join(chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+                    for chunk in chunks)
+
+
+def table_csv(handler, table, user_email=None, is_admin=False):
+    """Return a zero-argument callable producing *table* as a CSV download."""
+    return lambda: collect(handler.iter_csv(table, user_email=user_email, is_admin=is_admin))
+
+
+def bundle_zip(handler, user_email=None, is_admin=False):
+    """Return a zero-argument callable producing the full zip bundle download."""
+    return lambda: collect(iter_bundle(handler, user_email=user_email, is_admin=is_admin))
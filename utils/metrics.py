@@ -0,0 +1,302 @@
+"""Process metrics in the Prometheus text exposition format.
+
+A small in-process registry of counters, gauges and histograms, fed by
+DataHandler (SQL statements via utils.query_profiler, read-memo hits and
+misses, cold start), utils.write_queue (write queue depth and waits),
+EmailNotifier (emails sent and failed) and utils.auth_session (logins,
+session restores, logouts, active sessions).
+Gauges that describe the database – email queue depth, DB/WAL file size,
+photo store size – are computed when scraped.
+
+The registry is served by a small side HTTP listener, separate from the
+Streamlit server, started once per process when MYMAINTLOG_METRICS_PORT
+is set (see start_server_from_env)::
+
+    curl http://localhost:9091/metrics
+
+Counters start from zero in every process, so a scrape after a cold start
+shows them reset; mymaintlog_process_start_time_seconds and
+mymaintlog_cold_start_seconds describe the start itself.
+"""
+
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+DEFAULT_ADDR = "0.0.0.0"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; SQL statements are mostly sub-millisecond.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+_registry = []
+_server_lock = threading.Lock()
+_server = None
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value):
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+        _registry.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """Yield (suffix, label values, extra labels, value)."""
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield "", key, (), value
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, key, extra, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_labels(self.labelnames, key, extra)} {_number(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        if not self.labelnames:
+            self._values[()] = 0
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Current value, either set directly or computed by a function at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._function = None
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, function):
+        """Compute the value when scraped.
+
+        *function* returns a number, or for a labelled gauge a dict of label
+        value tuples to numbers.  If it raises, the gauge is left out.
+        """
+        self._function = function
+
+    def samples(self):
+        if self._function is None:
+            yield from super().samples()
+            return
+        try:
+            value = self._function()
+        except Exception as e:
+            print(f"Metric {self.name} could not be computed: {e}")
+            return
+        items = value.items() if isinstance(value, dict) else [((), value)]
+        for key, v in items:
+            yield "", key, (), v
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        with self._lock:
+            items = [(key, (list(counts), total)) for key, (counts, total) in self._values.items()]
+        for key, (counts, total) in items:
+            for bound, count in zip(self.buckets, counts):
+                yield "_bucket", key, (("le", _number(bound)),), count
+            yield "_sum", key, (), total
+            yield "_count", key, (), counts[-1]
+
+
+def exposition():
+    """All registered metrics in the text exposition format."""
+    return "\n".join(metric.expose() for metric in _registry) + "\n"
+
+
+# ----------------------------------------------------------------------
+# Metrics
+# ----------------------------------------------------------------------
+
+def _process_start_time():
+    """Process start from /proc (Linux); falls back to this module's import time."""
+    try:
+        fields = Path("/proc/self/stat").read_text().rsplit(")", 1)[1].split()
+        with open("/proc/stat") as f:
+            boot = next(float(line.split()[1]) for line in f if line.startswith("btime"))
+        return boot + int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, StopIteration):
+        return time.time()
+
+
+PROCESS_START_TIME = _process_start_time()
+_ready = False
+
+PROCESS_START = Gauge("mymaintlog_process_start_time_seconds",
+                      "Start time of the app process since the Unix epoch.")
+PROCESS_START.set(PROCESS_START_TIME)
+COLD_START = Gauge("mymaintlog_cold_start_seconds",
+                   "Seconds from process start until the first DataHandler had its database ready.")
+
+ACTIVE_SESSIONS = Gauge("mymaintlog_active_sessions",
+                        "Logged-in sessions active within the inactivity timeout.")
+LOGINS = Counter("mymaintlog_logins_total", "Login attempts on the Home page by result.", ["result"])
+SESSION_RESTORES = Counter("mymaintlog_session_restores_total",
+                           "Sessions restored from the browser cookie.")
+LOGOUTS = Counter("mymaintlog_logouts_total", "Logouts by reason.", ["reason"])
+
+SQL_STATEMENTS = Histogram("mymaintlog_sql_statement_seconds",
+                           "Duration of DataHandler SQL statements, fetches included, by verb.",
+                           ["verb"])
+CACHE_REQUESTS = Counter("mymaintlog_datahandler_cache_requests_total",
+                         "DataHandler read-memo lookups by result (hit or miss).", ["result"])
+
+WRITE_QUEUE_DEPTH = Gauge("mymaintlog_write_queue_depth",
+                          "Writes waiting for the single writer thread (see utils.write_queue).")
+WRITE_QUEUE_WAIT = Histogram("mymaintlog_write_queue_wait_seconds",
+                             "Time a write spent queued before the writer started its batch.")
+WRITE_LOCK_WAIT = Histogram("mymaintlog_write_lock_wait_seconds",
+                            "Time the single writer waited for SQLite's write lock (BEGIN IMMEDIATE).")
+WRITE_COMMIT = Histogram("mymaintlog_write_commit_seconds", "Duration of the single writer's group commits.")
+WRITE_BATCH_SIZE = Histogram("mymaintlog_write_batch_size", "Writes per group commit.",
+                             buckets=(1, 2, 4, 8, 16, 32, 64, 128))
+
+EMAILS = Counter("mymaintlog_emails_total", "Reminder emails by result (sent or failed).", ["result"])
+EMAIL_QUEUE = Gauge("mymaintlog_email_queue_depth",
+                    "Pending reminders due today or earlier whose notification email is unsent.")
+
+DB_FILE_BYTES = Gauge("mymaintlog_db_file_bytes", "Size of the SQLite database files.", ["file"])
+PHOTO_BYTES = Gauge("mymaintlog_photo_store_bytes", "Total size of the stored fault photos.")
+PHOTOS = Gauge("mymaintlog_photos", "Number of stored fault photos.")
+
+
+def mark_ready():
+    """Record the cold start duration when the first DataHandler is ready."""
+    global _ready
+    if not _ready:
+        _ready = True
+        COLD_START.set(time.time() - PROCESS_START_TIME)
+
+
+def _database_gauges():
+    """Hook the scrape-time database gauges up to a DataHandler of this process."""
+    from utils.data_handler import DataHandler
+
+    handler = DataHandler(memoize=False)
+    db_path = Path(handler._db_path)
+
+    def file_sizes():
+        return {
+            (name,): path.stat().st_size if path.exists() else 0
+            for name, path in [("db", db_path), ("wal", Path(f"{db_path}-wal"))]
+        }
+
+    DB_FILE_BYTES.set_function(file_sizes)
+    PHOTOS.set_function(lambda: handler.get_photo_store_stats()["count"])
+    PHOTO_BYTES.set_function(lambda: handler.get_photo_store_stats()["bytes"])
+    EMAIL_QUEUE.set_function(handler.count_email_queue)
+
+
+# ----------------------------------------------------------------------
+# HTTP listener
+# ----------------------------------------------------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = exposition().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the app log.
+        pass
+
+
+def start_server(port, addr=DEFAULT_ADDR):
+    """Serve /metrics on *addr*:*port* from a daemon thread (once per process)."""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+        _database_gauges()
+        _server = ThreadingHTTPServer((addr, port), _Handler)
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="mymaintlog-metrics", daemon=True).start()
+        return _server
+
+
+def start_server_from_env():
+    """Start the listener if MYMAINTLOG_METRICS_PORT is set.
+
+    MYMAINTLOG_METRICS_ADDR overrides the listen address.  Safe to call on
+    every rerun; a port that is already taken (e.g. by another app process)
+    is reported once and skipped.
+    """
+    port = os.environ.get("MYMAINTLOG_METRICS_PORT")
+    if not port or _server is not None:
+        return _server
+    try:
+        return start_server(int(port), os.environ.get("MYMAINTLOG_METRICS_ADDR", DEFAULT_ADDR))
+    except OSError as e:
+        print(f"Metrics listener not started on port {port}: {e}")
+        os.environ.pop("MYMAINTLOG_METRICS_PORT", None)
+        return None
@@ -0,0 +1,140 @@
+"""Per-page section timing and rerun counts.
+
+Every page calls start() right after StateManager.init_and_enforce.  That
+counts the script run for the page (per session and process-wide) and
+returns a PageTimer whose ``section(name)`` context manager and
+``timed(name)`` decorator time named parts of the run – data loading,
+pandas post-processing, ``st.dataframe``/``st.image`` calls, whole tab
+fragments.  A decorated fragment is timed on its own reruns too, so a
+section's calls exceed its page's runs by the fragment reruns.
+
+Timings are aggregated process-wide (the last SAMPLE_SIZE per section for
+the percentiles) together with the SQL time spent inside each section,
+taken from utils.query_profiler, so the remainder is Python and rendering.
+summary() and page_runs() feed the Admin Panel's Page Timing section.
+
+Setting MYMAINTLOG_PAGE_TRACE to a file path also appends every timed
+section to it as a JSON line (page, section, session, run, ms, sql_ms) for
+offline analysis.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils import query_profiler
+
+SAMPLE_SIZE = 1000
+TRACE_FILE = os.environ.get("MYMAINTLOG_PAGE_TRACE")
+
+_lock = threading.Lock()
+# page -> {"runs": n, "sessions": n}
+_runs = {}
+# (page, section) -> {"calls": n, "ms": deque, "sql_ms": deque}
+_sections = {}
+
+_SESSION_KEY = "_page_timing"
+
+
+class PageTimer:
+    """Times named sections of one page's script run (see start())."""
+
+    def __init__(self, page, session, run):
+        self.page, self.session, self.run = page, session, run
+
+    @contextmanager
+    def section(self, name):
+        """Time the enclosed block as section *name* (also on st.stop/st.rerun)."""
+        started, sql_started = time.perf_counter(), query_profiler.thread_sql_seconds()
+        try:
+            yield
+        finally:
+            _record(self, name, (time.perf_counter() - started) * 1000,
+                    (query_profiler.thread_sql_seconds() - sql_started) * 1000)
+
+    def timed(self, name):
+        """Decorator timing every call of a function, e.g. a tab fragment."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.section(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+def start(page_file):
+    """Count a script run of the page *page_file* (its ``__file__``) and return its PageTimer."""
+    page = Path(page_file).stem
+    state = st.session_state.setdefault(_SESSION_KEY, {"session": uuid.uuid4().hex[:8], "runs": {}})
+    run = state["runs"].get(page, 0) + 1
+    state["runs"][page] = run
+    with _lock:
+        counts = _runs.setdefault(page, {"runs": 0, "sessions": 0})
+        counts["runs"] += 1
+        counts["sessions"] += run == 1
+    return PageTimer(page, state["session"], run)
+
+
+def _record(timer, name, ms, sql_ms):
+    with _lock:
+        stats = _sections.setdefault((timer.page, name), {
+            "calls": 0, "ms": deque(maxlen=SAMPLE_SIZE), "sql_ms": deque(maxlen=SAMPLE_SIZE),
+        })
+        stats["calls"] += 1
+        stats["ms"].append(ms)
+        stats["sql_ms"].append(sql_ms)
+    if TRACE_FILE:
+        entry = {
+            "at": datetime.now().isoformat(timespec="milliseconds"), "page": timer.page,
+            "section": name, "session": timer.session, "run": timer.run,
+            "ms": round(ms, 2), "sql_ms": round(sql_ms, 2),
+        }
+        try:
+            with _lock, open(TRACE_FILE, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"Could not write the page timing trace: {e}")
+
+
+def page_runs():
+    """Script runs, sessions and runs per session for each page."""
+    with _lock:
+        rows = [(page, c["runs"], c["sessions"]) for page, c in sorted(_runs.items())]
+    df = pd.DataFrame(rows, columns=["page", "runs", "sessions"])
+    df["runs_per_session"] = (df["runs"] / df["sessions"].where(df["sessions"] > 0)).round(1)
+    return df
+
+
+def summary():
+    """Per page and section: calls, mean/p50/p95/max ms and the mean SQL share."""
+    with _lock:
+        samples = [(page, name, s["calls"], np.array(s["ms"]), np.array(s["sql_ms"]))
+                   for (page, name), s in _sections.items()]
+    rows = [
+        (page, name, calls, ms.mean(), np.percentile(ms, 50), np.percentile(ms, 95), ms.max(),
+         sql_ms.mean())
+        for page, name, calls, ms, sql_ms in samples
+    ]
+    df = pd.DataFrame(rows, columns=["page", "section", "calls", "mean_ms", "p50_ms", "p95_ms",
+                                     "max_ms", "sql_ms"])
+    df[df.columns[3:]] = df[df.columns[3:]].round(1)
+    return df.sort_values(["page", "section"], ignore_index=True)
+
+
+def clear():
+    """Reset the process-wide counts and timings."""
+    with _lock:
+        _runs.clear()
+        _sections.clear()
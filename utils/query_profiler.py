@@ -0,0 +1,334 @@
+"""SQL profiler and slow-query log for DataHandler.
+
+DataHandler._get_conn() opens its connections with ProfiledConnection,
+whose cursors time every statement – execution plus the fetches that
+stream its rows – and count the rows returned (or changed, for writes).
+Each statement is recorded with its normalized text (whitespace collapsed,
+literals and IN lists replaced by placeholders, so calls that differ only
+in their values group together), duration, rows and the page that issued
+it, in a process-wide ring buffer of the most recent RING_SIZE statements.
+
+Statements taking at least SLOW_QUERY_MS are also appended to
+SLOW_QUERY_LOG as JSON lines, together with the original SQL and its
+parameters (BLOBs as their size) so they can be replayed with
+``EXPLAIN QUERY PLAN``.  A trace callback would give the statement with
+its parameters bound, but SQLite then expands every bound BLOB (photo
+uploads) into a hex literal on every statement.  summary() and slow_queries() feed the Admin
+Panel's Query Performance section.
+
+Configured with environment variables: MYMAINTLOG_SQL_PROFILE=0 turns the
+profiler off, MYMAINTLOG_SLOW_QUERY_MS sets the threshold,
+MYMAINTLOG_SLOW_QUERY_LOG the log file and MYMAINTLOG_SQL_PROFILE_SIZE the
+ring buffer length.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from utils import metrics
+
+_ROOT = Path(__file__).resolve().parent.parent
+
+ENABLED = os.environ.get("MYMAINTLOG_SQL_PROFILE", "1").lower() not in ("0", "false", "no")
+SLOW_QUERY_MS = float(os.environ.get("MYMAINTLOG_SLOW_QUERY_MS", 250))
+SLOW_QUERY_LOG = Path(os.environ.get("MYMAINTLOG_SLOW_QUERY_LOG") or _ROOT / "data" / "slow_queries.log")
+RING_SIZE = int(os.environ.get("MYMAINTLOG_SQL_PROFILE_SIZE", 5000))
+
+_records = deque(maxlen=RING_SIZE)
+_log_lock = threading.Lock()
+# Per thread: its _Clock and, on a worker, the page it works for (see run_for()).
+_thread = threading.local()
+
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+_VERBS = {"SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH", "PRAGMA"}
+
+# co_filename -> page name (or None), see _calling_page.
+_pages = {}
+
+
+def normalize(sql):
+    """Collapse whitespace and replace literals and IN lists with placeholders."""
+    sql = _LITERAL.sub("?", " ".join(sql.split()))
+    return _IN_LIST.sub("(?, ...)", sql)
+
+
+def _page_of(filename):
+    if filename not in _pages:
+        path = Path(filename)
+        is_page = path.suffix == ".py" and (
+            path.resolve().parent == _ROOT / "pages" or path.resolve() == _ROOT / "Home.py")
+        _pages[filename] = path.stem if is_page else None
+    return _pages[filename]
+
+
+def _calling_page():
+    """The Streamlit page script on the stack, else the page the thread works
+    for (see run_for()), else the current thread's name."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        page = _page_of(frame.f_code.co_filename)
+        if page:
+            return page
+        frame = frame.f_back
+    return getattr(_thread, "page", None) or threading.current_thread().name
+
+
+class _Clock:
+    """Running total of statement time, one per thread unless lent (see run_for())."""
+
+    __slots__ = ("seconds", "_lock")
+
+    def __init__(self):
+        self.seconds, self._lock = 0.0, threading.Lock()
+
+    def add(self, seconds):
+        # Worker threads add to the clock of the thread they work for.
+        with self._lock:
+            self.seconds += seconds
+
+
+def _clock():
+    clock = getattr(_thread, "clock", None)
+    if clock is None:
+        clock = _thread.clock = _Clock()
+    return clock
+
+
+class _Record:
+    __slots__ = ("sql", "statement", "params", "duration", "rows", "page", "at", "logged")
+
+    def __init__(self, statement, params, page):
+        self.sql, self.statement, self.params, self.page = normalize(statement), statement, params, page
+        self.duration, self.rows, self.at, self.logged = 0.0, 0, time.time(), False
+
+    def finish(self):
+        """Log the statement if it was slow; called once its rows are consumed."""
+        verb = self.sql.split(" ", 1)[0].upper()
+        metrics.SQL_STATEMENTS.observe(self.duration, verb=verb if verb in _VERBS else "OTHER")
+        if not self.logged and self.duration * 1000 >= SLOW_QUERY_MS:
+            self.logged = True
+            _log_slow(self)
+
+
+def _describe(params):
+    """JSON-friendly parameters: BLOBs as their size, long strings cut short."""
+    if isinstance(params, dict):
+        return {k: _describe(v) for k, v in params.items()}
+    if isinstance(params, (list, tuple)):
+        return [_describe(v) for v in params]
+    if isinstance(params, (bytes, bytearray, memoryview)):
+        return f"<{len(params)} bytes>"
+    if isinstance(params, str) and len(params) > 200:
+        return params[:200] + "…"
+    if params is None or isinstance(params, (int, float, str)):
+        return params
+    # executemany() parameter iterators (already consumed) and the like.
+    return f"<{type(params).__name__}>"
+
+
+def _log_slow(record):
+    entry = {
+        "at": datetime.fromtimestamp(record.at).isoformat(timespec="seconds"),
+        "ms": round(record.duration * 1000, 1), "rows": record.rows, "page": record.page,
+        "sql": record.sql, "statement": record.statement, "params": _describe(record.params),
+    }
+    try:
+        with _log_lock, open(SLOW_QUERY_LOG, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError as e:
+        print(f"Could not write the slow-query log: {e}")
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor timing execute*() and the fetches of each statement's rows.
+
+    A statement is finished – and checked against SLOW_QUERY_MS – when its
+    rows are exhausted, the cursor runs the next one or is closed, or right
+    away if it returns no rows.
+    """
+
+    _record = None
+
+    def _timed(self, method, sql, parameters):
+        self._finish()
+        started = time.perf_counter()
+        try:
+            return method(sql, parameters)
+        finally:
+            record = _Record(sql, parameters, _calling_page())
+            record.duration = time.perf_counter() - started
+            _clock().add(record.duration)
+            # Writes report their changes; reads count rows as they are fetched.
+            record.rows = max(self.rowcount, 0)
+            _records.append(record)
+            self._record = record
+            if self.description is None:
+                self._finish()
+
+    def _finish(self):
+        if self._record is not None:
+            self._record.finish()
+            self._record = None
+
+    def execute(self, sql, parameters=()):
+        return self._timed(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._timed(super().executemany, sql, seq_of_parameters)
+
+    def _fetched(self, started, rows, done):
+        if self._record is not None:
+            elapsed = time.perf_counter() - started
+            self._record.duration += elapsed
+            _clock().add(elapsed)
+            self._record.rows += rows
+            if done:
+                self._finish()
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(started, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(started, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(started, len(rows), True)
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(started, 0, True)
+            raise
+        self._fetched(started, 1, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # Cursors abandoned after fetchone() (e.g. conn.execute(...).fetchone()).
+        self._finish()
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """Connection whose cursors are ProfiledCursors.
+
+    executescript() (schema set-up) is not timed.
+    """
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def connection_factory():
+    """The sqlite3.connect() factory for DataHandler connections."""
+    return ProfiledConnection if ENABLED else sqlite3.Connection
+
+
+def thread_sql_seconds():
+    """Total time the current thread has spent in profiled statements.
+
+    Includes the statements of worker threads run for it with run_for().
+    """
+    return _clock().seconds
+
+
+def caller():
+    """The calling page and the current thread's clock, to hand to run_for()."""
+    return _calling_page(), _clock()
+
+
+def run_for(caller, fn):
+    """Run ``fn()`` on a worker thread on behalf of *caller* (from caller()).
+
+    Its statements are recorded under the caller's page and their time is
+    added to the caller's thread_sql_seconds(), so page_timing sections
+    include work handed to a thread pool.
+    """
+    saved = getattr(_thread, "page", None), getattr(_thread, "clock", None)
+    _thread.page, _thread.clock = caller
+    try:
+        return fn()
+    finally:
+        _thread.page, _thread.clock = saved
+
+
+def records():
+    """Recorded statements, oldest first, as a DataFrame."""
+    rows = [(r.at, r.page, r.sql, r.duration * 1000, r.rows) for r in list(_records)]
+    df = pd.DataFrame(rows, columns=["at", "page", "sql", "ms", "rows"])
+    df["at"] = pd.to_datetime(df["at"], unit="s")
+    return df
+
+
+def summary():
+    """Per normalized statement: calls, total/mean/p95/max ms, rows and pages."""
+    df = records()
+    if df.empty:
+        return pd.DataFrame(columns=["sql", "calls", "total_ms", "mean_ms", "p95_ms", "max_ms",
+                                     "rows", "pages"])
+    grouped = df.groupby("sql")
+    out = pd.DataFrame({
+        "calls": grouped.size(),
+        "total_ms": grouped["ms"].sum(),
+        "mean_ms": grouped["ms"].mean(),
+        "p95_ms": grouped["ms"].quantile(0.95),
+        "max_ms": grouped["ms"].max(),
+        "rows": grouped["rows"].sum(),
+        "pages": grouped["page"].agg(lambda p: ", ".join(sorted(set(p)))),
+    })
+    out[["total_ms", "mean_ms", "p95_ms", "max_ms"]] = out[
+        ["total_ms", "mean_ms", "p95_ms", "max_ms"]].round(2)
+    return out.reset_index().sort_values("total_ms", ascending=False, ignore_index=True)
+
+
+def slow_queries(limit=100):
+    """The last *limit* entries of the slow-query log, newest first.
+
+    params is given as its JSON text: the logged parameters are lists, dicts
+    or scalars, which a single Arrow column cannot hold.
+    """
+    columns = ["at", "ms", "rows", "page", "sql", "statement", "params"]
+    entries = []
+    if SLOW_QUERY_LOG.exists():
+        with open(SLOW_QUERY_LOG) as f:
+            entries = [json.loads(line) for line in deque(f, maxlen=limit) if line.strip()]
+    for entry in entries:
+        entry["params"] = json.dumps(entry.get("params"))
+    return pd.DataFrame(entries[::-1], columns=columns)
+
+
+def clear():
+    """Empty the ring buffer (the slow-query log is kept)."""
+    _records.clear()
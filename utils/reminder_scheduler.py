@@ -0,0 +1,73 @@
+"""Periodic reminder generation from service schedules.
+
+DataHandler.generate_reminders() materialises one reminder per service
+coming due and is idempotent per service and due date, so running it on a
+timer is safe: each run only adds reminders for services that were newly
+scheduled or rescheduled since the last one.
+
+The job is opt-in via environment variables (see start_scheduler_from_env)
+and runs in one daemon thread per process, like the backup scheduler.
+``scripts/generate_reminders.py`` runs a single pass from the command line.
+"""
+
+import os
+import threading
+import time
+
+from utils.data_handler import DataHandler
+
+# Defaults for the generated reminders: dated this many days before the
+# service, for services due within the horizon.
+DEFAULT_LEAD_DAYS = 7
+DEFAULT_WITHIN_DAYS = 30
+
+_scheduler_lock = threading.Lock()
+_scheduler_thread = None
+
+
+def run_once(lead_days=DEFAULT_LEAD_DAYS, within_days=DEFAULT_WITHIN_DAYS,
+             email_notification=False, db_path=None):
+    """Generate reminders for the whole fleet.  Returns the number created."""
+    return DataHandler(db_path, memoize=False).generate_reminders(
+        lead_days=lead_days, within_days=within_days,
+        email_notification=email_notification, is_admin=True,
+    )
+
+
+def start_scheduler(interval_hours, lead_days=DEFAULT_LEAD_DAYS, within_days=DEFAULT_WITHIN_DAYS,
+                    email_notification=False, db_path=None):
+    """Start a daemon thread running run_once() every *interval_hours* (once per process)."""
+    global _scheduler_thread
+    with _scheduler_lock:
+        if _scheduler_thread is not None and _scheduler_thread.is_alive():
+            return _scheduler_thread
+
+        def loop():
+            while True:
+                try:
+                    run_once(lead_days, within_days, email_notification, db_path)
+                except Exception as e:
+                    print(f"Scheduled reminder generation failed: {e}")
+                time.sleep(interval_hours * 3600)
+
+        _scheduler_thread = threading.Thread(target=loop, name="mymaintlog-reminders", daemon=True)
+        _scheduler_thread.start()
+        return _scheduler_thread
+
+
+def start_scheduler_from_env():
+    """Start the scheduler if MYMAINTLOG_REMINDER_INTERVAL_HOURS is set.
+
+    MYMAINTLOG_REMINDER_LEAD_DAYS and MYMAINTLOG_REMINDER_WITHIN_DAYS
+    override the defaults; MYMAINTLOG_REMINDER_EMAIL=1 flags the generated
+    reminders for email notification.  Safe to call on every rerun.
+    """
+    interval = os.environ.get("MYMAINTLOG_REMINDER_INTERVAL_HOURS")
+    if not interval:
+        return None
+    return start_scheduler(
+        float(interval),
+        lead_days=int(os.environ.get("MYMAINTLOG_REMINDER_LEAD_DAYS", DEFAULT_LEAD_DAYS)),
+        within_days=int(os.environ.get("MYMAINTLOG_REMINDER_WITHIN_DAYS", DEFAULT_WITHIN_DAYS)),
+        email_notification=os.environ.get("MYMAINTLOG_REMINDER_EMAIL", "").lower() in ("1", "true", "yes"),
+    )
@@ -0,0 +1,50 @@
+"""Search-as-you-type selectbox backed by DataHandler.search_* methods.
+
+Plain selectboxes ship every ID to the browser on each rerun, which stops
+being usable with a few thousand records.  search_select renders a search
+box and a selectbox holding only the top matches returned by SQL (scoped by
+object type / user inside the search method itself).
+"""
+
+import streamlit as st
+
+from utils import selectbox_formatter
+from utils.data_handler import SEARCH_LIMIT
+
+
+def search_select(label, search, id_col, name_col=None, desc_col=None, key=None,
+                  limit=SEARCH_LIMIT, empty_message="No records found.", **filters):
+    """Render a search box plus a selectbox of matching records.
+
+    Args:
+        label: Selectbox label, e.g. "Select Equipment".
+        search: A DataHandler.search_* bound method.
+        id_col, name_col, desc_col: Columns used for option labels.
+        key: Widget key of the selectbox; the search box uses ``{key}_query``.
+            Setting ``st.session_state[key]`` beforehand preselects that ID.
+        limit: Maximum number of matches rendered.
+        empty_message: Shown when there is nothing to select at all.
+        **filters: Passed through to *search* (object_type, user_email, ...).
+
+    Returns:
+        (selected_id, row) – row is the selected record as a Series, or
+        (None, None) when nothing matches.
+    """
+    query = st.text_input(
+        "🔍 Search",
+        key=f"{key}_query",
+        placeholder="Type an ID, name or description",
+    )
+    results = search(query, limit=limit, include_id=st.session_state.get(key), **filters)
+    if results.empty:
+        st.info(empty_message if not query else "No matches found.")
+        return None, None
+    selected_id = st.selectbox(
+        label,
+        results[id_col].tolist(),
+        format_func=selectbox_formatter(results, id_col, name_col, desc_col),
+        key=key,
+    )
+    if len(results) >= limit:
+        st.caption(f"Showing the first {limit} matches – refine the search to narrow them down.")
+    return selected_id, results[results[id_col] == selected_id].iloc[0]
@@ -22,6 +22,16 @@ class StateManager:
         for key, default_value in defaults.items():
             if key not in st.session_state:
                 st.session_state[key] = default_value
+
+        # Scheduled database backups (opt-in via environment, one thread per process).
+        from utils.backup import start_scheduler_from_env
+        start_scheduler_from_env()
+        # Periodic reminder generation from service schedules (likewise opt-in).
+        from utils import reminder_scheduler
+        reminder_scheduler.start_scheduler_from_env()
+        # Prometheus metrics listener (opt-in via MYMAINTLOG_METRICS_PORT).
+        from utils import metrics
+        metrics.start_server_from_env()
     
     @staticmethod
     def set_object_type(object_type):
@@ -86,7 +96,7 @@ class StateManager:
         """
         import time
         from utils.auth_session import (
-            try_restore_session, do_logout,
+            try_restore_session, do_logout, mark_active,
             refresh_cookie_if_needed, INACTIVITY_TIMEOUT,
         )
 
@@ -109,12 +119,13 @@ class StateManager:
         now = time.time()
         last = st.session_state.get("last_activity", now)
         if now - last > INACTIVITY_TIMEOUT:
-            do_logout(cm)
+            do_logout(cm, reason="timeout")
             st.session_state["_session_expired"] = True
             st.warning("⏰ Session expired due to inactivity. Please log in again.")
             st.stop()
 
         st.session_state["last_activity"] = now
+        mark_active()
         refresh_cookie_if_needed(cm)
 
     @staticmethod
@@ -0,0 +1,161 @@
+"""Single-writer queue with group commit for DataHandler mutations.
+
+By default every DataHandler write opens its own connection and competes
+for SQLite's write lock with the other sessions, each waiting up to the
+30 s busy timeout without anyone seeing the queue.  With the single
+writer enabled (MYMAINTLOG_SINGLE_WRITER=1, or DataHandler(single_writer=True))
+the write methods are instead submitted as jobs to one writer thread per
+database, which owns the only writing connection of the process:
+
+* jobs queued while the previous batch was committing are run together,
+  up to MAX_BATCH, in one ``BEGIN IMMEDIATE`` transaction – one commit
+  (and one WAL sync) for the whole group instead of one per write;
+* every job runs inside its own SAVEPOINT, so a failing job is rolled back
+  and gets its exception while the rest of the batch still commits;
+* results come back through concurrent.futures.Future: the write methods
+  wait on theirs, DataHandler.submit_write() hands it to the caller.
+
+Inside a job DataHandler._get_conn() returns the writer's connection,
+whose commit(), close() and context manager exit are no-ops – the writer
+decides when the transaction ends.  Queue depth, time spent queued, time
+spent waiting for the SQLite write lock (held by other processes such as
+scripts or a second app instance), batch sizes and commit times are
+exported through utils.metrics.
+
+Configured with MYMAINTLOG_SINGLE_WRITER and MYMAINTLOG_WRITE_BATCH (the
+largest group commit, default 64).
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from utils import metrics
+
+ENABLED = os.environ.get("MYMAINTLOG_SINGLE_WRITER", "").lower() in ("1", "true", "yes")
+MAX_BATCH = int(os.environ.get("MYMAINTLOG_WRITE_BATCH", 64))
+
+_writers_lock = threading.Lock()
+# db_path -> Writer
+_writers = {}
+# The Writer whose thread this is, see current_connection().
+_local = threading.local()
+
+
+class Writer:
+    """One writer thread running queued jobs in group commits (see module docstring)."""
+
+    def __init__(self, db_path, connect):
+        self.db_path = db_path
+        self._connect = connect
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="mymaintlog-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn):
+        """Queue ``fn()`` to run on the writer thread; returns its Future."""
+        future = Future()
+        self._queue.put((fn, future, time.perf_counter()))
+        return future
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def close(self):
+        """Run what is queued, then stop the thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        conn = self._connect(isolation_level=None)
+        _local.writer, _local.conn = self, conn
+        try:
+            while True:
+                batch, stop = [self._queue.get()], False
+                while len(batch) < MAX_BATCH:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if None in batch:
+                    batch, stop = [job for job in batch if job is not None], True
+                if batch:
+                    self._run_batch(conn, batch)
+                if stop:
+                    return
+        finally:
+            conn.release()
+
+    def _run_batch(self, conn, batch):
+        started = time.perf_counter()
+        for _fn, _future, queued in batch:
+            metrics.WRITE_QUEUE_WAIT.observe(started - queued)
+        batch = [job for job in batch if job[1].set_running_or_notify_cancel()]
+        metrics.WRITE_BATCH_SIZE.observe(len(batch))
+        outcomes = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            metrics.WRITE_LOCK_WAIT.observe(time.perf_counter() - started)
+            for fn, future, _queued in batch:
+                conn.execute("SAVEPOINT job")
+                try:
+                    outcomes.append((future, fn(), None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO job")
+                    outcomes.append((future, None, e))
+                conn.execute("RELEASE job")
+            committing = time.perf_counter()
+            conn.execute("COMMIT")
+            metrics.WRITE_COMMIT.observe(time.perf_counter() - committing)
+        except Exception as e:
+            # Lock timeout, failed commit or a job that ended the transaction:
+            # nothing of the batch was written.
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _fn, future, _queued in batch:
+                future.set_exception(e)
+            return
+        for future, value, error in outcomes:
+            if error is None:
+                future.set_result(value)
+            else:
+                future.set_exception(error)
+
+
+def writer_for(db_path, connect):
+    """The process's Writer for *db_path*, started on first use.
+
+    *connect(**kwargs)* opens the writer's connection (with
+    ``isolation_level=None``); its commit() and close() must be no-ops and
+    release() must close it, see data_handler._held.
+    """
+    with _writers_lock:
+        writer = _writers.get(db_path)
+        if writer is None:
+            writer = _writers[db_path] = Writer(db_path, connect)
+        return writer
+
+
+def on_writer_thread():
+    return getattr(_local, "writer", None) is not None
+
+
+def current_connection(db_path):
+    """The writer's connection when called from a job for *db_path*, else None."""
+    writer = getattr(_local, "writer", None)
+    return _local.conn if writer is not None and writer.db_path == db_path else None
+
+
+@atexit.register
+def _drain():
+    # Futures from submit_write() may still be queued at interpreter exit.
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.close()
+
+
+metrics.WRITE_QUEUE_DEPTH.set_function(lambda: sum(w.depth() for w in list(_writers.values())))